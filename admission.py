@@ -0,0 +1,170 @@
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple, Optional
+
+import psutil
+
+from consts import ADMISSION_DIR
+from processes import TrackedProcess, browser_trees
+
+logger = logging.getLogger("onadaily.admission")
+
+DEFAULT_BROWSER_MB = 400  # 실행 중인 크롬이 없을 때 브라우저 하나의 예상 메모리
+POLL_SECONDS = 1.0
+MAX_WAIT_SECONDS = 600  # 이 시간이 지나면 여유가 없어도 실행
+
+
+class HostLoad(NamedTuple):
+    available_mb: float
+    load_per_cpu: float
+    browsers: int
+    browser_rss_mb: float  # onadaily가 띄운 크롬, 크롬 드라이버 전체
+
+    @property
+    def browser_mb(self) -> float:
+        if self.browsers == 0:
+            return DEFAULT_BROWSER_MB
+        return max(DEFAULT_BROWSER_MB / 2, self.browser_rss_mb / self.browsers)
+
+
+def measure() -> HostLoad:
+    browsers = 0
+    rss = 0
+    for tree in browser_trees():
+        try:
+            if "driver" not in tree[0].name().lower():
+                browsers += 1
+        except psutil.Error:
+            pass
+        for proc in tree:
+            try:
+                rss += proc.memory_info().rss
+            except psutil.Error:
+                pass
+
+    return HostLoad(
+        available_mb=psutil.virtual_memory().available / 1024 / 1024,
+        load_per_cpu=psutil.getloadavg()[0] / (psutil.cpu_count() or 1),
+        browsers=browsers,
+        browser_rss_mb=rss / 1024 / 1024,
+    )
+
+
+def queue_depth() -> int:
+    return len(_live_tickets())
+
+
+def _live_tickets() -> list[str]:
+    # 브라우저 실행을 기다리는 프로세스의 번호표, 먼저 온 순서
+    if not os.path.isdir(ADMISSION_DIR):
+        return []
+
+    tickets = []
+    for filename in sorted(os.listdir(ADMISSION_DIR)):
+        if not filename.endswith(".json"):
+            continue
+        filepath = os.path.join(ADMISSION_DIR, filename)
+        try:
+            with open(filepath, "r", encoding="utf-8") as f:
+                owner = TrackedProcess(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            continue
+
+        if owner.process() is None:  # 비정상 종료된 프로세스의 번호표
+            try:
+                os.remove(filepath)
+            except OSError:
+                pass
+            continue
+        tickets.append(filename)
+    return tickets
+
+
+class AdmissionScheduler(object):
+    # 여러 onadaily 프로세스가 동시에 크롬을 띄우지 않도록, 여유 메모리와 CPU 부하를 보고 순서대로 실행
+    _instance: Optional["AdmissionScheduler"] = None
+    _initialized: bool
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super(AdmissionScheduler, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, min_free_mb: float = 512, max_load: float = 1.5) -> None:
+        self.min_free_mb = min_free_mb
+        self.max_load = max_load
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+        self._initialized = True
+
+        self._owner = TrackedProcess.from_pid(os.getpid())
+        self.waiting = 0
+        self.admitted = 0
+        self.total_wait = 0.0
+        self.last_wait = 0.0
+
+    def has_room(self, load: HostLoad) -> bool:
+        return load.available_mb - load.browser_mb >= self.min_free_mb and load.load_per_cpu <= self.max_load
+
+    @contextmanager
+    def admit(self) -> Iterator[HostLoad]:
+        # 차례가 오고 자원에 여유가 있을 때까지 대기, 브라우저 실행이 끝날 때까지 번호표를 유지
+        ticket = self._take_ticket()
+        started = time.monotonic()
+        self.waiting += 1
+        waiting = True
+        try:
+            notified = False
+            while True:
+                load = measure()
+                tickets = _live_tickets()
+                mine = os.path.basename(ticket) if ticket is not None else None
+                first = ticket is None or len(tickets) == 0 or tickets[0] == mine
+                if first and self.has_room(load):
+                    break
+                if load.browsers == 0 and all(other == mine for other in tickets):
+                    # 다른 onadaily 크롬, 대기 중인 프로세스가 없으면 기다려도 여유가 생기지 않으므로 바로 실행
+                    break
+
+                waited = time.monotonic() - started
+                if waited > MAX_WAIT_SECONDS:
+                    logger.warning(f"{waited:.0f}초 동안 자원 여유가 없어 그대로 브라우저 실행 : {load}")
+                    break
+                if not notified:
+                    print(f"브라우저 실행 대기 중 (대기열 {len(tickets)}, 사용 가능 메모리 {load.available_mb:.0f}MB)")
+                    notified = True
+                logger.debug(f"브라우저 실행 대기 : {load}, 대기열 {len(tickets)}")
+                time.sleep(POLL_SECONDS)
+
+            self.waiting -= 1
+            waiting = False
+            self.admitted += 1
+            self.last_wait = time.monotonic() - started
+            self.total_wait += self.last_wait
+            logger.debug(f"브라우저 실행 허가 ({self.last_wait:.1f}초 대기) : {load}")
+            yield load
+        finally:
+            if waiting:  # 대기 중 예외
+                self.waiting -= 1
+            if ticket is not None:
+                try:
+                    os.remove(ticket)
+                except OSError:
+                    pass
+
+    def _take_ticket(self) -> str | None:
+        if self._owner is None:
+            return None
+        try:
+            os.makedirs(ADMISSION_DIR, exist_ok=True)
+            ticket = os.path.join(ADMISSION_DIR, f"{time.time_ns()}_{os.getpid()}.json")
+            with open(ticket + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(self._owner.to_dict(), f)
+            os.replace(ticket + ".tmp", ticket)
+        except OSError as ex:
+            logger.debug(f"번호표 만들기 실패 : {ex}")
+            return None
+        return ticket
@@ -0,0 +1,186 @@
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Optional
+
+from consts import LOG_DIR, LOG_MAX_BYTES, LOG_RETENTION_DAYS
+
+if TYPE_CHECKING:
+    from config import Site
+    from webdriverwrapper import WebDriverWrapper
+
+logger = logging.getLogger("onadaily.artifacts")
+
+# 보관 기간/용량 정리 대상 (jsonl 로그는 자체적으로 로테이션)
+RETENTION_PREFIXES = ("error_", "failure_", "profile_", "trace_", "worker_", "jsonlog_")
+
+
+class _WriteJob(object):
+    def __init__(self, path: str, data: bytes, compress: bool) -> None:
+        self.path = path
+        self.data = data
+        self.compress = compress
+
+
+class ArtifactWriter(object):
+    _instance: Optional["ArtifactWriter"] = None
+    _initialized: bool
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super(ArtifactWriter, cls).__new__(cls, *args, **kwargs)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+        self._initialized = True
+
+        self._queue: queue.Queue[_WriteJob | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, relpath: str, data: bytes, compress: bool = False) -> str:
+        path = os.path.join(LOG_DIR, relpath)
+        if compress:
+            path += ".gz"
+
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="artifact-writer", daemon=True)
+                self._thread.start()
+
+        self._queue.put(_WriteJob(path, data, compress))
+        return path
+
+    def close(self, timeout: float = 10) -> None:
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+
+        if thread is None:
+            return
+
+        self._queue.put(None)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.debug("로그 저장이 끝나지 않음")
+
+    def _worker(self) -> None:
+        prune_logs()
+
+        while (job := self._queue.get()) is not None:
+            try:
+                self._write(job)
+            except Exception as ex:
+                logger.debug(f"로그 저장 실패 : {job.path} / {ex}")
+
+        prune_logs()
+
+    def _write(self, job: _WriteJob) -> None:
+        os.makedirs(os.path.dirname(job.path), exist_ok=True)
+
+        data = gzip.compress(job.data) if job.compress else job.data
+        tmpfile = job.path + ".tmp"
+        with open(tmpfile, "wb") as f:
+            f.write(data)
+        os.replace(tmpfile, job.path)
+
+
+def _entry_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _remove_entry(path: str) -> None:
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        os.remove(path)
+
+
+def prune_logs(max_bytes: int = LOG_MAX_BYTES, max_age_days: int = LOG_RETENTION_DAYS) -> int:
+    if not os.path.isdir(LOG_DIR):
+        return 0
+
+    entries = []
+    for name in os.listdir(LOG_DIR):
+        if not name.startswith(RETENTION_PREFIXES):
+            continue
+        path = os.path.join(LOG_DIR, name)
+        try:
+            entries.append((os.path.getmtime(path), _entry_size(path), path))
+        except OSError:
+            continue
+
+    entries.sort()  # 오래된 순
+    total = sum(size for _, size, _ in entries)
+    expire = time.time() - max_age_days * 24 * 60 * 60
+    removed = 0
+
+    for mtime, size, path in entries:
+        if mtime >= expire and total <= max_bytes:
+            break
+        try:
+            _remove_entry(path)
+        except OSError as ex:
+            logger.debug(f"오래된 로그 삭제 실패 : {path} / {ex}")
+            continue
+        total -= size
+        removed += 1
+
+    if removed > 0:
+        logger.debug(f"오래된 로그 {removed}개 삭제")
+    return removed
+
+
+def capture_failure(driver: "WebDriverWrapper", site: "Site", exception: Exception) -> str | None:
+    # 드라이버 조작은 실패한 순간 이 스레드에서, 파일 저장은 ArtifactWriter 에서
+    if driver.quited:
+        return None
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    dirname = f"failure_{site.name}_{timestamp}"
+    writer = ArtifactWriter()
+
+    info: dict[str, Any] = {
+        "time": timestamp,
+        "site": site.name,
+        "login": site.login,
+        "exception": f"{type(exception).__name__}: {exception}",
+    }
+
+    for key, getter in (("url", lambda: driver.current_url), ("window_handles", lambda: driver.window_handles)):
+        try:
+            info[key] = getter()
+        except Exception as ex:
+            info[key] = f"N/A ({type(ex).__name__})"
+
+    try:
+        writer.submit(os.path.join(dirname, "screenshot.png"), driver.get_screenshot_as_png())
+    except Exception as ex:
+        logger.debug(f"스크린샷 실패 : {ex}")
+
+    try:
+        writer.submit(os.path.join(dirname, "dom.html"), driver.page_source.encode("utf-8"), compress=True)
+    except Exception as ex:
+        logger.debug(f"페이지 소스 저장 실패 : {ex}")
+
+    writer.submit(os.path.join(dirname, "info.json"), json.dumps(info, ensure_ascii=False, indent=1).encode("utf-8"))
+
+    return os.path.join(LOG_DIR, dirname)
@@ -1,26 +1,39 @@
 import logging
-import logging.handlers
+import re
 import traceback
+from collections import deque
 from datetime import datetime
 from logging import Logger, LogRecord
-from typing import Iterable, Literal, Self
+from typing import TYPE_CHECKING, Any, Iterable, Literal, Self
 
 from prettytable import PrettyTable
 
+import consts
 from config import Site
-from consts import DEBUG_MODE
-from webdriverwrapper import WebDriverWrapper
+
+if TYPE_CHECKING:
+    from keyword_matcher import KeywordMatcher
+    from webdriverwrapper import WebDriverWrapper
 
 logger = logging.getLogger("onadaily.classes")
 
 
+def parse_price(price: str) -> int | None:
+    digits = re.sub(r"[^0-9]", "", price)
+    if digits == "":
+        return None
+    return int(digits)
+
+
 class HotdealInfo(object):
     name: str
     price: str
     dc_price: str
+    price_value: int | None
+    dc_price_value: int | None
 
     def __init__(self, name: str, price: str, dc_price: str) -> None:
-        self.name = name.strip()
+        self.name = " ".join(name.split())
         price = price.strip()
         dc_price = dc_price.strip()
         if price != "" and price[-1] != "원":
@@ -30,6 +43,15 @@ class HotdealInfo(object):
         self.price = price
         self.dc_price = dc_price
 
+        self.price_value = parse_price(price)
+        self.dc_price_value = parse_price(dc_price)
+
+    @property
+    def discount_rate(self) -> float | None:
+        if self.price_value is None or self.dc_price_value is None or self.price_value <= 0:
+            return None
+        return round((self.price_value - self.dc_price_value) / self.price_value * 100, 1)
+
     def to_row(self) -> list[str]:
         return [self.name, self.price, self.dc_price]
 
@@ -41,28 +63,61 @@ class StampResult(object):
         self.iserror = False
         self.message = ""
 
+        self.attempt = 0
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.error_class: str | None = None
+        self.outcome: str | None = None  # success, already_stamped, login_failed, stamp_failed ...
+        self.recording: str | None = None  # --record 로 실행한 경우 기록 ID
+        self.commands = 0  # 이 사이트에서 보낸 WebDriver 명령 수
+
     def __bool__(self) -> bool:
         return self.passed
 
+    @property
+    def duration(self) -> float | None:
+        if self.started is None or self.finished is None:
+            return None
+        return round(self.finished - self.started, 3)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "site": self.site.name,
+            "passed": self.passed,
+            "iserror": self.iserror,
+            "message": self.message,
+            "attempt": self.attempt,
+            "started": self.started,
+            "finished": self.finished,
+            "duration": self.duration,
+            "error_class": self.error_class,
+            "outcome": self.outcome,
+            "recording": self.recording,
+            "commands": self.commands,
+        }
+
 
 class SaleTable(PrettyTable):
     def __init__(self, site: Site) -> None:
         self.site = site
+        self.products: list[HotdealInfo] = []
         super().__init__()
         self.field_names = ["품명", "정상가", "할인가"]
 
-    def keywordcheck(self, keywords) -> list:
+    def keywordcheck(self, matcher: "KeywordMatcher") -> list[list[str]]:
         result = []
-        for x in self.rows:
-            for keyword in keywords:
-                if keyword in x[0]:
-                    result.append([self.site.name] + x)
+        for product in self.products:
+            if len(matched := matcher.find(product.name)) > 0:
+                result.append([self.site.name] + product.to_row() + [", ".join(matched)])
         return result
 
     def add_product(self, product: HotdealInfo) -> None:
+        self.products.append(product)
         self.add_row(product.to_row())
 
     def add_products(self, products: Iterable[HotdealInfo]) -> None:
+        products = list(products)
+        self.products.extend(products)
         self.add_rows([product.to_row() for product in products])
 
     def __len__(self) -> int:
@@ -74,13 +129,13 @@ class LoggingInfo:
         self,
         exception: Exception,
         site: Site | None = None,
-        driver: WebDriverWrapper | None = None,
-        debuglog: str | None = None,
+        driver: "WebDriverWrapper | None" = None,
+        log_capture: "LogCaptureContext | None" = None,
     ) -> None:
         self.now = datetime.now()
         self.stacktrace = traceback.format_exc()
 
-        if DEBUG_MODE:
+        if consts.DEBUG_MODE:
             print(self.stacktrace)
 
         self.message = str(exception)
@@ -100,10 +155,15 @@ class LoggingInfo:
         else:
             self.version = "Chrome version : N/A"
 
-        if debuglog is not None:
-            self.debuglog = debuglog
-        else:
-            self.debuglog = "N/A"
+        self.log_capture = log_capture
+        self.artifact_dir: str | None = None
+        self.recording: str | None = None
+
+    @property
+    def debuglog(self) -> str:
+        if self.log_capture is None:
+            return "N/A"
+        return self.log_capture.captured_logs_string
 
     def __str__(self) -> str:
         return (
@@ -115,39 +175,46 @@ class LoggingInfo:
             f"====== DEBUG LOG ======\n"
             f"{self.debuglog}\n"
             f"=======================\n\n"
-            f"{self.version}"
+            f"{self.version}\n"
+            f"artifacts : {self.artifact_dir if self.artifact_dir is not None else 'N/A'}\n"
+            f"recording : {self.recording if self.recording is not None else 'N/A'}"
         )
 
 
+class RingBufferHandler(logging.Handler):
+    def __init__(self, capacity: int) -> None:
+        super().__init__()
+        self.buffer: deque[LogRecord] = deque(maxlen=capacity)  # 가득 차면 오래된 기록부터 버림
+
+    def emit(self, record: LogRecord) -> None:
+        self.buffer.append(record)
+
+
 class LogCaptureContext:
-    def __init__(self, logger: Logger) -> None:
+    def __init__(self, logger: Logger, capacity: int = 2000) -> None:
         self.logger = logger
-        self.shared_memory_handler: logging.handlers.MemoryHandler
-
-        self.captured_logs_records: list[LogRecord] = []
-        self.captured_logs_string = ""
+        self.ring_buffer_handler = RingBufferHandler(capacity)
 
         self.formatter = logging.Formatter("%(asctime)s - %(module)s - %(message)s")
 
+    @property
+    def captured_logs_records(self) -> list[LogRecord]:
+        return list(self.ring_buffer_handler.buffer)
+
+    @property
+    def captured_logs_string(self) -> str:
+        # 실패해서 로그를 저장할 때만 문자열로 변환
+        return "\n".join(self.formatter.format(record) for record in self.captured_logs_records)
+
     def __enter__(self) -> Self:
         logger.debug("로그 캡처 시작")
-        self.shared_memory_handler = logging.handlers.MemoryHandler(
-            capacity=10000, flushLevel=logging.CRITICAL + 1, target=None, flushOnClose=False
-        )
-
-        self.logger.addHandler(self.shared_memory_handler)
+        self.logger.addHandler(self.ring_buffer_handler)
 
         return self
 
     def __exit__(self, exc_type, exc_value, traceback) -> Literal[False]:
         logger.debug("로그 캡처 종료")
-        self.logger.removeHandler(self.shared_memory_handler)
-
-        self.captured_logs_records = self.shared_memory_handler.buffer
-        self.shared_memory_handler.close()
-
-        logs = [self.formatter.format(record) for record in self.captured_logs_records]
-
-        self.captured_logs_string = "\n".join(logs)
+        self.logger.removeHandler(self.ring_buffer_handler)
+        self.ring_buffer_handler.close()
 
         return False
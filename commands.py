@@ -0,0 +1,82 @@
+# 브라우저 없이 동작하는 명령어 : selenium 등 무거운 모듈을 불러오지 않음
+import os
+from typing import Any
+
+import consts
+from admission import measure, queue_depth
+from config import Options
+from history import load_runs
+from hotdeal_store import HotdealStore
+
+
+def _print_run(run: dict[str, Any]) -> None:
+    print(f"== {run['time']} ==")
+    for result in run["results"]:
+        print(f"사이트 : {result['site']} / {result['message']}")
+
+
+def status() -> int:
+    options = Options()
+    common = options.common
+
+    print(f"설정 파일 : {consts.CONFIG_FILE_NAME}")
+    print(f"headless : {common.headless} / waittime : {common.waittime}초 / 재시도 : {common.retrytime}회")
+    print(f"순서 : {', '.join(site.name for site in common.order)}")
+    for site in common.order:
+        state = f"사용 ({site.login})" if site.enable else "사용 안함"
+        print(f"  {site.name:<10}{state}")
+
+    load = measure()
+    print(
+        f"실행 중인 크롬 : {load.browsers}개 ({load.browser_rss_mb:.0f}MB) / 실행 대기 : {queue_depth()}"
+        f" / 사용 가능 메모리 : {load.available_mb:.0f}MB / CPU 부하 : {load.load_per_cpu:.2f}"
+    )
+
+    runs = load_runs()
+    print("======마지막 실행======")
+    if len(runs) == 0:
+        print("실행 기록 없음")
+        return 0
+
+    _print_run(runs[-1])
+    return 0
+
+
+def validate_config() -> int:
+    options = Options()  # 불러오면서 검사함, 오류 시 ConfigError
+    print(f"✅ 설정 파일 정상 : {consts.CONFIG_FILE_NAME}")
+    if options.session_required() and not os.path.isfile(consts.SESSION_FILE_NAME):
+        print("⚠️ headless 모드에서 소셜 로그인을 사용하려면 먼저 `onadaily enroll` 로 로그인하세요.")
+    return 0
+
+
+def show_results(count: int) -> int:
+    runs = load_runs()
+    if len(runs) == 0:
+        print("실행 기록 없음")
+        return 0
+
+    for run in runs[-count:]:
+        _print_run(run)
+    return 0
+
+
+def show_deals(lowest: bool) -> int:
+    with HotdealStore() as store:
+        if lowest:
+            print("======최저가======")
+            records = store.lowest_prices()
+        else:
+            print("======오늘의 새 핫딜======")
+            records = store.new_deals()
+
+    if len(records) == 0:
+        print("기록 없음")
+        return 0
+
+    for record in records:
+        price = f"{record.price:,}원 → " if record.price is not None else ""
+        dc_price = f"{record.dc_price:,}원" if record.dc_price is not None else "가격 정보 없음"
+        rate = f" ({record.discount_rate}%)" if record.discount_rate is not None else ""
+        print(f"[{record.site}] {record.name} : {price}{dc_price}{rate}")
+    return 0
@@ -7,8 +7,9 @@ from typing import Any, Dict, Optional, get_type_hints
 import yaml
 
 import consts
-from credential_manager import get_credential, set_credential
 from errors import ConfigError
+from profiling import phase
+from sites import SITE_NAMES, get_spec
 
 logger = logging.getLogger("onadaily")
 
@@ -33,9 +34,14 @@ class Options(object):
         self._settings: Dict[str, Dict[str, Any]] = {}
         self.load_settings()
 
-        self.sites = [Site(site_name, self) for site_name in consts.SITE_NAMES]
+        self.sites = [Site(site_name, self) for site_name in SITE_NAMES]
         self.common = _Common(self)  # common에서 self.sites를 참조하기 때문에 self.sites를 먼저 초기화해야 함
 
+    @classmethod
+    def reset(cls) -> None:
+        # 다른 계정 폴더의 설정을 다시 불러올 때 사용
+        cls._instance = None
+
     def _getoption(self, section: str, option: str) -> Any:
         if section not in self._settings:
             raise ValueError("잘못된 옵션 접근")
@@ -72,6 +78,10 @@ class Options(object):
                 checklist.append(sitesettings["login"] != "default")
         return any(checklist)
 
+    def session_required(self) -> bool:
+        # headless 모드의 소셜 로그인은 enroll 로 저장한 로그인 정보가 필요
+        return self.datadir_required() and self._settings["common"]["headless"]
+
     def _check_yaml_valid(self) -> None:
         default_section = {"enable": False, "login": "default", "id": None, "password": None}
 
@@ -86,6 +96,17 @@ class Options(object):
             "keywordnoti": [],
             "credential_storage": "keyring",
             "namespace": "Onadaily",
+            "sitetimeout": 300,
+            "jsonlog": False,
+            "notify": [],
+            "adaptivewait": False,
+            "minwaittime": 3,
+            "prefetch": True,
+            "minfreememory": 512,
+            "maxcpuload": 1.5,
+            "metricsport": 0,
+            "pagetrace": False,
+            "ratelimit": {"rate": 1.0, "burst": 5, "jitter": 0.0, "sites": {}},
         }
 
         common_type_hint = get_type_hints(_Common)
@@ -100,15 +121,11 @@ class Options(object):
             if k not in self._settings["common"]:
                 self._settings["common"][k] = v
 
-        for sitename in consts.SITE_NAMES:
+        for sitename in SITE_NAMES:
             if sitename not in self._settings:  # 사이트 섹션이 없으면 추가
                 self._settings[sitename] = default_section.copy()  # 얕은 복사
                 self._settings["common"]["order"].append(sitename)  # 사이트 섹션 추가 시 order에 추가
 
-        if self.datadir_required():
-            if self._settings["common"]["headless"]:
-                raise ConfigError("소셜 로그인과 headless 모드를 같이 사용할 수 없습니다.")
-
         if self._settings["common"]["credential_storage"] not in ["keyring", "lagacy"]:
             print("잘못된 credential_storage 설정, 기본값 keyring으로 설정합니다.")
             self._settings["common"]["credential_storage"] = "keyring"
@@ -119,16 +136,16 @@ class Options(object):
 
             if sitesettings["enable"] is True:
                 login = sitesettings["login"]
-                if consts.LOGIN[login][sitename] is None:
+                if login not in get_spec(sitename).login_buttons:
                     raise ConfigError(f"{sitename}의 {login} 로그인은 지원하지 않습니다.")
 
         order = self._settings["common"]["order"]
 
-        if len(set(order)) != len(consts.SITE_NAMES):
+        if len(set(order)) != len(SITE_NAMES):
             raise ConfigError("설정 파일의 order 항목에 중복되거나 누락된 사이트가 있습니다.")
 
         for s in order:
-            if s not in consts.SITE_NAMES:
+            if s not in SITE_NAMES:
                 raise ConfigError("설정 파일의 order 항목에 사이트 철자가 틀렸습니다.")
 
         self.save_yaml()
@@ -148,6 +165,17 @@ class _Common(object):
     keywordnoti: list[str]
     credential_storage: str
     namespace: str
+    sitetimeout: int
+    jsonlog: bool
+    notify: list[dict[str, Any]]
+    adaptivewait: bool
+    minwaittime: int
+    prefetch: bool
+    minfreememory: int
+    maxcpuload: float
+    metricsport: int
+    pagetrace: bool
+    ratelimit: dict[str, Any]
 
     def __init__(self, options: Options) -> None:
         self._order: list["Site"] = []
@@ -188,21 +216,28 @@ class Site(object):
         self._options = options
 
         self.name = sitename
-        self.main_url = consts.URLS[self.name]
-        self.stamp_url = consts.STAMP_URLS[self.name]
-        self.login_url = consts.LOGIN_URLS[self.name]
-
-        self.input_id = consts.INPUT_ID[self.name]
-        self.input_pwd = consts.INPUT_PWD[self.name]
-        self.login_check_xpath = consts.CHK_LOGIN[self.name]
-
-        self.btn_stamp = consts.BTN_STAMP[self.name]
-        self.hotdeal_table = consts.HOTDEAL_TABLE[self.name]
-        self.stamp_calendar = consts.STAMP_CALENDAR[self.name]
+        self.spec = spec = get_spec(sitename)
+        self.main_url = spec.main_url
+        self.stamp_url = spec.stamp_url
+        self.login_url = spec.login_url
+
+        self.input_id = spec.input_id
+        self.input_pwd = spec.input_pwd
+        self.login_check_xpath = spec.login_check
+        self.login_window = spec.login_window
+
+        self.btn_stamp = spec.btn_stamp
+        self.hotdeal_table = spec.hotdeal_table
+        self.stamp_calendar = spec.stamp_calendar
+        self.stamped_mark = spec.stamped_mark
+        self.stamp_delay = spec.stamp_delay
+        self.stamp_fail_messages = spec.stamp_fail_messages
+        self.stamp_request = spec.stamp_request
+        self.real_input = spec.real_input
 
     @property
     def btn_login(self) -> str | None:
-        return consts.LOGIN[self.login][self.name]
+        return self.spec.login_buttons.get(self.login)
 
     def __getattr__(self, __name: str) -> Any:
         if __name in ["id", "password"]:
@@ -212,12 +247,15 @@ class Site(object):
             if self._options.common.credential_storage == "lagacy":
                 return self._options._getoption(self.name, __name)
             else:
-                if self._options._getoption(self.name, __name) != "saved":  # 저장되지 않은 경우
-                    credential = set_credential(__name, self.name, self._options.common.namespace)
-                    self.save_credential_status(__name)
+                with phase("keyring"):
+                    from credential_manager import get_credential, set_credential  # keyring은 필요할 때만 불러옴
+
+                    if self._options._getoption(self.name, __name) != "saved":  # 저장되지 않은 경우
+                        credential = set_credential(__name, self.name, self._options.common.namespace)
+                        self.save_credential_status(__name)
 
-                else:
-                    credential = get_credential(__name, self.name, self._options.common.namespace)
+                    else:
+                        credential = get_credential(__name, self.name, self._options.common.namespace)
 
                 return credential
         else:
@@ -4,7 +4,7 @@ import keyring
 import keyring.errors
 import pwinput  # type: ignore[import-untyped]
 
-from consts import SHOW_CREDENTIALS
+import consts
 
 ID = "id"
 PASSWORD = "password"
@@ -22,7 +22,7 @@ def get_credential(type: str, site_name: str, namespace: str) -> str:
 
     credential = keyring.get_password(f"{_get_namespace(site_name, namespace)}", type)
     logger.debug(f"{type} 불러오기 성공, namesapce: {_get_namespace(site_name, namespace)}")
-    if SHOW_CREDENTIALS:
+    if consts.SHOW_CREDENTIALS:
         logger.debug(f"불러온 {type}: {credential}")
 
     if credential is None:
@@ -42,7 +42,7 @@ def set_credential(type: str, site_name: str, namespace: str) -> str:
     while True:
         credential = input_method(f"{site_name}의 {type} 입력(한영키 주의) : ")
         logger.debug(f"{type} 입력받음")
-        if SHOW_CREDENTIALS:
+        if consts.SHOW_CREDENTIALS:
             logger.debug(f"입력한 {type}: {credential}")
 
         if not credential.isascii():
@@ -55,7 +55,7 @@ def set_credential(type: str, site_name: str, namespace: str) -> str:
 
         credential2 = input_method("다시 입력 : ")
         logger.debug(f"{type} 재입력받음")
-        if SHOW_CREDENTIALS:
+        if consts.SHOW_CREDENTIALS:
             logger.debug(f"재입력한 {type}: {credential2}")
 
         if credential == credential2:
@@ -82,5 +82,5 @@ def _save_credential(type: str, site_name: str, namespace: str, credential: str)
 
     keyring.set_password(f"{_get_namespace(site_name, namespace)}", type, credential)
     logger.debug(f"{site_name} {type} 저장 완료, namesapce: {_get_namespace(site_name, namespace)}")
-    if SHOW_CREDENTIALS:
+    if consts.SHOW_CREDENTIALS:
         logger.debug(f"저장된 {type}: {credential}")
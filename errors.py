@@ -22,5 +22,18 @@ class HotDealDataNotFoundError(Exception):
     pass
 
 
+class HotDealTableNotFoundError(HotDealDataNotFoundError):
+    # 핫딜 테이블 자체가 없음 (로그인, 차단, 점검 페이지 등), 빈 테이블과 달리 기록하지 않음
+    pass
+
+
 class HotDealTableParseError(Exception):
     pass
+
+
+class SelectorBrokenError(Exception):
+    # 사이트 구조가 바뀌어 선택자를 찾지 못함, 재시도하지 않음
+    def __init__(self, page: str, missing: list[str]) -> None:
+        super().__init__(f"{page} 에서 찾지 못한 선택자 : {', '.join(missing)}")
+        self.page = page
+        self.missing = missing
@@ -0,0 +1,41 @@
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any
+
+from consts import HISTORY_FILE
+
+logger = logging.getLogger("onadaily.history")
+
+MAX_HISTORY = 30
+
+
+def load_runs() -> list[dict[str, Any]]:
+    if not os.path.isfile(HISTORY_FILE):
+        return []
+
+    try:
+        with open(HISTORY_FILE, "r", encoding="utf-8") as f:
+            runs = json.load(f)
+    except (OSError, ValueError) as ex:
+        logger.debug(f"실행 기록 불러오기 실패 : {ex}")
+        return []
+
+    if not isinstance(runs, list):
+        return []
+    return runs
+
+
+def save_run(results: list[dict[str, Any]]) -> None:
+    runs = load_runs()
+    runs.append({"time": datetime.now().isoformat(timespec="seconds"), "results": results})
+    runs = runs[-MAX_HISTORY:]
+
+    tmpfile = HISTORY_FILE + ".tmp"
+    try:
+        with open(tmpfile, "w", encoding="utf-8") as f:
+            json.dump(runs, f, ensure_ascii=False, indent=1)
+        os.replace(tmpfile, HISTORY_FILE)
+    except OSError as ex:
+        logger.debug(f"실행 기록 저장 실패 : {ex}")
@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import NamedTuple, Self
+
+import httpx
+
+from classes import SaleTable
+from config import Options, Site
+from consts import CACHE_DIR, USER_AGENT
+from errors import HotDealDataNotFoundError, HotDealTableNotFoundError
+from hotdeal_parser import get_hotdeal_strategy
+from hotdeal_report import HotdealReporter
+from outbox import Outbox
+from ratelimit import RateLimiter
+
+logger = logging.getLogger("onadaily.hotdeal_fetcher")
+
+HOTDEAL_CACHE_DIR = os.path.join(CACHE_DIR, "hotdeal")
+
+
+class CachedPage(NamedTuple):
+    url: str
+    body: str
+    etag: str | None
+    last_modified: str | None
+
+
+class ResponseCache(object):
+    def __init__(self, cachedir: str = HOTDEAL_CACHE_DIR) -> None:
+        self.cachedir = cachedir
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cachedir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url: str) -> CachedPage | None:
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                return CachedPage(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def put(self, page: CachedPage) -> None:
+        os.makedirs(self.cachedir, exist_ok=True)
+        path = self._path(page.url)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(page._asdict(), f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+
+class HotdealFetcher(object):
+    def __init__(
+        self,
+        sites: list[Site],
+        waittime: int,
+        urls: dict[str, str] | None = None,
+        ratelimiter: RateLimiter | None = None,
+    ) -> None:
+        self.sites = [site for site in sites if site.hotdeal_table is not None]
+        self.waittime = waittime
+        self.urls = urls if urls is not None else {}
+        self.ratelimiter = ratelimiter
+        self.cache = ResponseCache()
+        self.client: httpx.AsyncClient
+
+    async def __aenter__(self) -> Self:
+        # 연결은 모든 사이트, 모든 반복에서 재사용
+        limits = httpx.Limits(max_connections=max(1, len(self.sites)), keepalive_expiry=600)
+        self.client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT}, timeout=self.waittime, limits=limits, follow_redirects=True
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.client.aclose()
+
+    def url_of(self, site: Site) -> str:
+        return self.urls.get(site.name, site.main_url)
+
+    async def fetch(self, site: Site) -> str | None:
+        # 바뀌지 않았으면 None
+        url = self.url_of(site)
+        cached = self.cache.get(url)
+
+        headers = {}
+        if cached is not None:
+            if cached.etag is not None:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified is not None:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        if self.ratelimiter is not None:  # 출석 체크 중인 다른 프로세스와 요청 간격을 같이 맞춤
+            await asyncio.sleep(await asyncio.to_thread(self.ratelimiter.reserve, url))  # sqlite 잠금 대기가 있음
+        response = await self.client.get(url, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            logger.debug(f"{site.name} 핫딜 페이지 변경 없음")
+            return None
+
+        response.raise_for_status()
+        page = CachedPage(url, response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        self.cache.put(page)
+        return page.body
+
+    async def scan(self) -> dict[Site, SaleTable | None | BaseException]:
+        results = await asyncio.gather(*[self._scan_site(site) for site in self.sites], return_exceptions=True)
+        return {site: result for site, result in zip(self.sites, results)}
+
+    async def _scan_site(self, site: Site) -> SaleTable | None:
+        body = await self.fetch(site)
+        if body is None:
+            return None
+        return await asyncio.to_thread(get_hotdeal_strategy(site).get_hotdeal_info, body, site)  # 파싱은 스레드에서
+
+
+async def _poll_hotdeals(fetcher: HotdealFetcher, reporter: HotdealReporter, interval: float | None) -> int:
+    async with fetcher:
+        while True:
+            started = time.monotonic()
+            exitcode = 0
+
+            for site, result in (await fetcher.scan()).items():
+                print(f"== {site.name} ==")
+                if result is None:
+                    print("변경 없음")
+                elif isinstance(result, HotDealTableNotFoundError):
+                    logger.debug(f"핫딜 테이블 파싱 실패 : {result}")
+                    print("핫딜 테이블을 찾지 못했습니다.")
+                elif isinstance(result, HotDealDataNotFoundError):
+                    logger.debug(f"핫딜 테이블 파싱 실패 : {result}")
+                    print("핫딜 테이블에 상품이 없습니다.")
+                    reporter.record_empty(site)
+                elif isinstance(result, BaseException):
+                    print(f"❌ 핫딜 페이지 불러오기 실패 : {result!r}")
+                    exitcode = 1
+                else:
+                    reporter.report(result)
+
+            reporter.print_keywordnoti()
+            reporter.save()
+
+            if interval is None:
+                return exitcode
+
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+def run_hotdeals(options: Options, interval: float | None = None, urls: dict[str, str] | None = None) -> int:
+    fetcher = HotdealFetcher(options.sites, options.common.waittime, urls, RateLimiter.from_options(options))
+    outbox = Outbox(options.common.notify, options.common.namespace)
+    reporter = HotdealReporter(options, outbox)
+    try:
+        return asyncio.run(_poll_hotdeals(fetcher, reporter, interval))
+    finally:
+        outbox.close()
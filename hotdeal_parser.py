@@ -0,0 +1,83 @@
+import abc
+import logging
+from typing import Iterable
+
+from bs4 import BeautifulSoup, Tag
+
+from classes import HotdealInfo, SaleTable
+from config import Site
+from errors import HotDealDataNotFoundError, HotDealTableNotFoundError, HotDealTableParseError
+from profiling import phase
+
+# 핫딜 테이블 파싱만 담당, 브라우저 없이 받은 페이지도 파싱하므로 selenium을 불러오지 않음
+logger = logging.getLogger("onadaily")
+
+
+class BaseHotDealStrategy(abc.ABC):
+    def get_hotdeal_info(self, page_source: str, site: Site) -> SaleTable:
+        soup = self._get_soup(page_source)
+
+        table = self._get_hotdeal_table(soup, site)
+
+        products = self._get_product_list(table)
+
+        hotdeallist = self._foreach_products(products)
+
+        resulttable = SaleTable(site)
+        resulttable.add_products(hotdeallist)
+        return resulttable
+
+    def _get_soup(self, page_source: str) -> BeautifulSoup:
+        with phase("parse"):
+            return BeautifulSoup(page_source, "html.parser")
+
+    def _get_hotdeal_table(self, soup: BeautifulSoup, site: Site) -> Tag:
+        if site.hotdeal_table is None:
+            raise HotDealTableParseError("잘못된 사이트 설정")
+        table = soup.select_one(site.hotdeal_table)
+
+        if table is None:
+            raise HotDealTableNotFoundError("핫딜 테이블 찾을 수 없음")
+
+        return table
+
+    def _get_product_list(self, table: Tag) -> Iterable[Tag]:
+        if (div := table.select_one("div")) is None:
+            raise HotDealDataNotFoundError("핫딜 테이블에 상품이 없음")
+
+        products = div.find_all("div", recursive=False)
+
+        if len(products) == 0:
+            raise HotDealDataNotFoundError("핫딜 테이블에 상품이 없음")
+
+        slides = [x for x in products if "swiper-slide-duplicate" not in x.get("class", [])]
+
+        # swiper 스크립트가 실행되기 전(브라우저 없이 받은 페이지)에는 slide-index가 없음
+        if any(x.has_attr("data-swiper-slide-index") for x in slides):
+            slides = [x for x in slides if x.has_attr("data-swiper-slide-index")]
+
+        result = [list(x.children)[1] for x in slides]
+        return result
+
+    def _foreach_products(self, products: Iterable[Tag]) -> list[HotdealInfo]:
+        hotdealinfolist = []
+        for product in products:
+            try:
+                info = self._get_product_info(product)
+            except HotDealDataNotFoundError:
+                logger.debug("핫딜 파싱 중 상품이 없음")
+                continue
+
+            hotdealinfolist.append(info)
+
+        return hotdealinfolist
+
+    @abc.abstractmethod
+    def _get_product_info(self, product: Tag) -> HotdealInfo:
+        pass
+
+
+def get_hotdeal_strategy(site: Site) -> BaseHotDealStrategy:
+    if site.spec.hotdeal_strategy is None:
+        raise HotDealTableParseError(f"{site.name} 핫딜 테이블 파싱 지원 안됨")
+    return site.spec.hotdeal_strategy()
@@ -0,0 +1,101 @@
+import logging
+import sqlite3
+
+from prettytable import PrettyTable
+
+from classes import SaleTable
+from config import Options, Site
+from hotdeal_store import HotdealStore
+from keyword_matcher import KeywordMatcher
+from metrics import HOTDEAL_ROWS
+from notify_index import NotifiedIndex
+from outbox import Outbox
+
+logger = logging.getLogger("onadaily")
+
+
+class HotdealReporter(object):
+    def __init__(self, options: Options, outbox: Outbox | None = None) -> None:
+        self.options = options
+        self.outbox = outbox
+
+        self.keywordnoti = PrettyTable()
+        self.keywordnoti.field_names = ["사이트", "품명", "정상가", "할인가", "키워드"]
+        self.keywordmatcher = KeywordMatcher(options.common.keywordnoti)
+        self.notified = NotifiedIndex()
+        self._unprinted: set[tuple[str, ...]] = set()  # 표에만 있고 아직 출력하지 않은 알림 (출력한 뒤 알린 것으로 기록)
+
+    def report(self, table: SaleTable) -> list[list[str]]:
+        if len(table) == 0:
+            self._record(table)  # 끝난 핫딜을 종료로 기록
+            return []
+
+        print(table)
+        HOTDEAL_ROWS.inc(len(table.products), site=table.site.name)
+        self._record(table)
+
+        if len(self.keywordmatcher) == 0:  # 키워드 알람 설정 안됨
+            return []
+
+        keywordproducts = []
+        for row in table.keywordcheck(self.keywordmatcher):  # 이미 알린 (사이트, 상품, 가격)은 제외
+            key = self._key(row)
+            if key in self._unprinted:
+                continue
+            if self.notified.seen(*key):
+                self.notified.add(*key)  # 아직 올라와 있는 상품은 만료를 연장해서 다시 알리지 않음
+                continue
+            keywordproducts.append(row)
+        if len(keywordproducts) > 0:
+            self.keywordnoti.add_rows(keywordproducts, divider=True)
+            self._unprinted.update(self._key(row) for row in keywordproducts)
+
+        if self.outbox is not None:
+            for row in keywordproducts:
+                sitename, name, price, dc_price, keywords = row
+                self.outbox.put(
+                    "keyword",
+                    f"{sitename} : {name} {price} → {dc_price} ({keywords})",
+                    site=sitename,
+                    name=name,
+                    price=price,
+                    dc_price=dc_price,
+                    keywords=keywords,
+                )
+                self.notified.add(*self._key(row))  # 보낼 목록에 넣었으면 알린 것으로 기록
+        return keywordproducts
+
+    def _key(self, row: list[str]) -> tuple[str, ...]:
+        return (self.options.common.namespace, row[0], row[1], row[3])
+
+    def record_empty(self, site: Site) -> None:
+        # 핫딜 테이블이 없어진 경우에도 지난번 핫딜을 종료로 기록
+        self._record(SaleTable(site))
+
+    def _record(self, table: SaleTable) -> None:
+        try:
+            with HotdealStore() as store:
+                diff = store.record(table.site.name, table.products, self.options.common.namespace)
+        except sqlite3.Error as e:
+            logger.debug(f"핫딜 기록 실패 : {e}")
+            return
+
+        if len(diff) > 0:
+            print(f"새 핫딜 {len(diff.added)}개 / 가격 변동 {len(diff.changed)}개 / 종료 {len(diff.removed)}개")
+
+    def print_keywordnoti(self) -> None:
+        if len(self.keywordmatcher) == 0:
+            return
+
+        print("======키워드 알림======")
+        if len(self.keywordnoti.rows) > 0:
+            print(self.keywordnoti)
+            self.keywordnoti.clear_rows()
+            for key in self._unprinted:
+                self.notified.add(*key)
+            self._unprinted.clear()
+        else:
+            print("새 키워드 알림 없음")
+
+    def save(self) -> None:
+        self.notified.save()
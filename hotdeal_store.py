@@ -0,0 +1,192 @@
+import logging
+import sqlite3
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Self
+
+from consts import HOTDEAL_DB_FILE
+
+if TYPE_CHECKING:
+    from classes import HotdealInfo
+
+logger = logging.getLogger("onadaily.hotdeal_store")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    site TEXT NOT NULL,
+    name TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    lowest_price INTEGER,
+    UNIQUE (site, name)
+);
+CREATE TABLE IF NOT EXISTS listings (
+    product_id INTEGER PRIMARY KEY REFERENCES products (id),
+    price INTEGER,
+    dc_price INTEGER,
+    discount_rate REAL,
+    since REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    product_id INTEGER NOT NULL REFERENCES products (id),
+    kind TEXT NOT NULL,
+    price INTEGER,
+    dc_price INTEGER,
+    discount_rate REAL,
+    account TEXT,
+    time REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_kind_time ON events (kind, time);
+CREATE INDEX IF NOT EXISTS events_product_time ON events (product_id, time);
+CREATE INDEX IF NOT EXISTS products_lowest ON products (site, lowest_price);
+"""
+
+NEW = "new"
+PRICE = "price"
+REMOVED = "removed"
+
+
+class HotdealRecord(NamedTuple):
+    site: str
+    name: str
+    price: int | None
+    dc_price: int | None
+    discount_rate: float | None
+    time: float
+
+
+class HotdealDiff(NamedTuple):
+    added: list[str]
+    changed: list[str]
+    removed: list[str]
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.changed) + len(self.removed)
+
+
+class HotdealStore(object):
+    def __init__(self, path: str = HOTDEAL_DB_FILE) -> None:
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def record(self, site: str, products: Iterable["HotdealInfo"], account: str = "") -> HotdealDiff:
+        # 지난번 상태와 비교해서 바뀐 것만 기록
+        now = time.time()
+        diff = HotdealDiff([], [], [])
+
+        with self.conn:
+            listed = {
+                row[0]: row[1:]
+                for row in self.conn.execute(
+                    "SELECT l.product_id, l.price, l.dc_price FROM listings l "
+                    "JOIN products p ON p.id = l.product_id WHERE p.site = ?",
+                    (site,),
+                )
+            }
+
+            product_ids = {
+                name: product_id
+                for product_id, name in self.conn.execute("SELECT id, name FROM products WHERE site = ?", (site,))
+            }
+
+            seen = set()
+            for product in products:
+                current = (product.price_value, product.dc_price_value)
+                product_id = product_ids.get(product.name)
+                if product_id is not None and product_id in listed and listed[product_id] == current:
+                    # 변동 없는 상품은 products 테이블도 건드리지 않음
+                    seen.add(product_id)
+                    continue
+
+                product_id = self._upsert_product(site, product, now)
+                product_ids[product.name] = product_id
+                if product_id in seen:
+                    continue
+                seen.add(product_id)
+
+                if product_id not in listed:
+                    kind = NEW
+                    diff.added.append(product.name)
+                elif listed[product_id] != current:
+                    kind = PRICE
+                    diff.changed.append(product.name)
+                else:
+                    continue
+
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO listings (product_id, price, dc_price, discount_rate, since) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (product_id, *current, product.discount_rate, now),
+                )
+                self._add_event(product_id, kind, *current, product.discount_rate, account, now)
+
+            for product_id in listed.keys() - seen:
+                name = self.conn.execute("SELECT name FROM products WHERE id = ?", (product_id,)).fetchone()[0]
+                diff.removed.append(name)
+                self.conn.execute("DELETE FROM listings WHERE product_id = ?", (product_id,))
+                self._add_event(product_id, REMOVED, None, None, None, account, now)
+
+        logger.debug(f"{site} 핫딜 기록 : 새 상품 {len(diff.added)}, 가격 변동 {len(diff.changed)}, 내려감 {len(diff.removed)}")
+        return diff
+
+    def _upsert_product(self, site: str, product: "HotdealInfo", now: float) -> int:
+        self.conn.execute(
+            "INSERT INTO products (site, name, first_seen, last_seen, lowest_price) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (site, name) DO UPDATE SET last_seen = excluded.last_seen, "
+            "lowest_price = CASE WHEN lowest_price IS NULL OR excluded.lowest_price < lowest_price "
+            "THEN COALESCE(excluded.lowest_price, lowest_price) ELSE lowest_price END",
+            (site, product.name, now, now, product.dc_price_value),
+        )
+        return self.conn.execute(
+            "SELECT id FROM products WHERE site = ? AND name = ?", (site, product.name)
+        ).fetchone()[0]
+
+    def _add_event(
+        self,
+        product_id: int,
+        kind: str,
+        price: int | None,
+        dc_price: int | None,
+        discount_rate: float | None,
+        account: str,
+        now: float,
+    ) -> None:
+        self.conn.execute(
+            "INSERT INTO events (product_id, kind, price, dc_price, discount_rate, account, time) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (product_id, kind, price, dc_price, discount_rate, account, now),
+        )
+
+    def lowest_prices(self, site: str | None = None, limit: int = 50) -> list[HotdealRecord]:
+        query = "SELECT site, name, NULL, lowest_price, NULL, last_seen FROM products WHERE lowest_price IS NOT NULL"
+        params: tuple = ()
+        if site is not None:
+            query += " AND site = ?"
+            params = (site,)
+        query += " ORDER BY last_seen DESC LIMIT ?"
+        return [HotdealRecord(*row) for row in self.conn.execute(query, (*params, limit))]
+
+    def new_deals(self, since: datetime | None = None) -> list[HotdealRecord]:
+        if since is None:  # 오늘
+            since = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        return [
+            HotdealRecord(*row)
+            for row in self.conn.execute(
+                "SELECT p.site, p.name, e.price, e.dc_price, e.discount_rate, e.time FROM events e "
+                "JOIN products p ON p.id = e.product_id WHERE e.kind = ? AND e.time >= ? ORDER BY e.time",
+                (NEW, since.timestamp()),
+            )
+        ]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,200 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+from typing import Any, NamedTuple, Self
+
+from consts import JOB_QUEUE_FILE
+
+logger = logging.getLogger("onadaily.job_queue")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    batch TEXT NOT NULL,
+    account TEXT NOT NULL,
+    site TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker TEXT,
+    lease_until REAL,
+    result TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    started REAL NOT NULL,
+    heartbeat REAL NOT NULL,
+    job_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id);
+CREATE INDEX IF NOT EXISTS jobs_batch ON jobs (batch, state);
+"""
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+LOST = "lost"  # 임대가 끝나 다른 작업자에게 넘어간 작업
+
+LEASE_SECONDS = 60.0  # 이 시간 동안 heartbeat가 없으면 작업자가 죽은 것으로 보고 다시 대기열로
+
+
+class Job(NamedTuple):
+    id: int
+    batch: str
+    account: str  # 계정 폴더 (설정 파일, userdata가 있는 곳)
+    site: str
+    attempts: int
+    max_attempts: int
+
+
+class JobQueue(object):
+    def __init__(self, path: str = JOB_QUEUE_FILE) -> None:
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def _transaction(self) -> "_Immediate":
+        return _Immediate(self.conn)
+
+    def enqueue(self, batch: str, account: str, site: str, max_attempts: int) -> int:
+        now = time.time()
+        with self._transaction():
+            cursor = self.conn.execute(
+                "INSERT INTO jobs (batch, account, site, state, max_attempts, created, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (batch, account, site, QUEUED, max_attempts, now, now),
+            )
+        return int(cursor.lastrowid or 0)
+
+    def register_worker(self, worker: str) -> None:
+        now = time.time()
+        with self._transaction():
+            self.conn.execute(
+                "INSERT OR REPLACE INTO workers (id, host, pid, started, heartbeat) VALUES (?, ?, ?, ?, ?)",
+                (worker, socket.gethostname(), os.getpid(), now, now),
+            )
+
+    def lease(self, worker: str, prefer_account: str | None = None) -> Job | None:
+        # 같은 계정의 작업은 동시에 하나만 (크롬 프로필, 쿠키 공유), 직전 계정의 작업을 먼저 가져옴
+        now = time.time()
+        with self._transaction():
+            self._requeue_expired(now)
+            row = self.conn.execute(
+                "SELECT id, batch, account, site, attempts, max_attempts FROM jobs j WHERE state = ? "
+                "AND NOT EXISTS (SELECT 1 FROM jobs l WHERE l.state = ? AND l.account = j.account) "
+                "ORDER BY account = ? DESC, id LIMIT 1",
+                (QUEUED, LEASED, prefer_account),
+            ).fetchone()
+            if row is None:
+                return None
+
+            job = Job(*row)._replace(attempts=row[4] + 1)
+            self.conn.execute(
+                "UPDATE jobs SET state = ?, worker = ?, attempts = ?, lease_until = ?, updated = ? WHERE id = ?",
+                (LEASED, worker, job.attempts, now + LEASE_SECONDS, now, job.id),
+            )
+            self.conn.execute("UPDATE workers SET heartbeat = ?, job_id = ? WHERE id = ?", (now, job.id, worker))
+        logger.debug(f"{worker} 작업 가져옴 : {job}")
+        return job
+
+    def heartbeat(self, worker: str, job_id: int | None = None) -> bool:
+        # 작업 임대 연장, 이미 다른 작업자에게 넘어갔으면 False
+        now = time.time()
+        with self._transaction():
+            self.conn.execute("UPDATE workers SET heartbeat = ? WHERE id = ?", (now, worker))
+            if job_id is None:
+                return True
+            cursor = self.conn.execute(
+                "UPDATE jobs SET lease_until = ?, updated = ? WHERE id = ? AND worker = ? AND state = ?",
+                (now + LEASE_SECONDS, now, job_id, worker, LEASED),
+            )
+        return cursor.rowcount > 0
+
+    def complete(self, job: Job, worker: str, result: dict[str, Any], retry: bool) -> str:
+        # retry가 True이고 시도 횟수가 남았으면 다시 대기열로, 바뀐 상태 반환
+        now = time.time()
+        if result.get("passed"):
+            state = DONE
+        elif retry and job.attempts < job.max_attempts:
+            state = QUEUED
+        else:
+            state = FAILED
+
+        with self._transaction():
+            cursor = self.conn.execute(
+                "UPDATE jobs SET state = ?, result = ?, lease_until = NULL, updated = ? "
+                "WHERE id = ? AND worker = ? AND state = ?",
+                (state, json.dumps(result, ensure_ascii=False), now, job.id, worker, LEASED),
+            )
+            self.conn.execute("UPDATE workers SET heartbeat = ?, job_id = NULL WHERE id = ?", (now, worker))
+        return state if cursor.rowcount > 0 else LOST
+
+    def requeue_expired(self) -> int:
+        with self._transaction():
+            return self._requeue_expired(time.time())
+
+    def _requeue_expired(self, now: float) -> int:
+        # 작업자가 죽어서 임대가 끝난 작업은 다시 대기열로, 시도 횟수를 다 썼으면 실패
+        expired = self.conn.execute(
+            "SELECT id, worker, site, attempts, max_attempts FROM jobs WHERE state = ? AND lease_until < ?",
+            (LEASED, now),
+        ).fetchall()
+        for job_id, worker, site, attempts, max_attempts in expired:
+            logger.debug(f"작업 {job_id}({site}) 임대 만료, 작업자 : {worker}")
+            if attempts < max_attempts:
+                self.conn.execute("UPDATE jobs SET state = ?, updated = ? WHERE id = ?", (QUEUED, now, job_id))
+            else:
+                result = {"site": site, "passed": False, "iserror": True, "message": "❌ 작업자 응답 없음"}
+                result["attempt"] = attempts
+                result["error_class"] = "WorkerLost"
+                result["outcome"] = "worker_lost"
+                self.conn.execute(
+                    "UPDATE jobs SET state = ?, result = ?, updated = ? WHERE id = ?",
+                    (FAILED, json.dumps(result, ensure_ascii=False), now, job_id),
+                )
+        return len(expired)
+
+    def unfinished(self, batch: str | None = None) -> int:
+        query = "SELECT COUNT(*) FROM jobs WHERE state IN (?, ?)"
+        params: tuple[str, ...] = (QUEUED, LEASED)
+        if batch is not None:
+            query += " AND batch = ?"
+            params += (batch,)
+        return int(self.conn.execute(query, params).fetchone()[0])
+
+    def finished(self, batch: str) -> list[tuple[Job, str, dict[str, Any]]]:
+        rows = self.conn.execute(
+            "SELECT id, batch, account, site, attempts, max_attempts, state, result FROM jobs "
+            "WHERE batch = ? AND state IN (?, ?) ORDER BY updated",
+            (batch, DONE, FAILED),
+        ).fetchall()
+        return [(Job(*row[:6]), row[6], json.loads(row[7] or "{}")) for row in rows]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class _Immediate(object):
+    # 여러 프로세스가 같은 작업을 가져가지 않도록 쓰기 잠금을 먼저 잡음
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+
+    def __enter__(self) -> None:
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
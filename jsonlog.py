@@ -0,0 +1,65 @@
+import contextlib
+import json
+import logging
+import logging.handlers
+import os
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Iterator
+
+from consts import LOG_DIR
+
+_context: ContextVar[dict[str, Any]] = ContextVar("onadaily_log_context", default={})
+
+
+@contextlib.contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.context = _context.get()
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        data.update(getattr(record, "context", {}))
+
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(data, ensure_ascii=False)
+
+
+def json_log_file() -> str:
+    # 프로세스마다 따로 저장 (여러 프로세스가 한 파일을 돌려 쓰면 로그가 섞이거나 사라짐)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(LOG_DIR, f"jsonlog_{timestamp}_{os.getpid()}.jsonl")
+
+
+def setup_json_log(logger: logging.Logger, **fields: Any) -> logging.Handler:
+    os.makedirs(LOG_DIR, exist_ok=True)
+
+    handler = logging.handlers.RotatingFileHandler(
+        json_log_file(), maxBytes=10 * 1024 * 1024, backupCount=3, encoding="utf-8", delay=True
+    )
+    handler.setFormatter(JsonLinesFormatter())
+    handler.addFilter(ContextFilter())
+    logger.addHandler(handler)
+
+    _context.set({**_context.get(), **fields})  # 실행 전체에 적용되는 항목 (계정 등)
+
+    return handler
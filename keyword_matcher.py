@@ -0,0 +1,70 @@
+import unicodedata
+from collections import deque
+from typing import Iterable
+
+
+def normalize(text: str) -> str:
+    # 전각 → 반각, 대소문자 무시, 공백 무시 ("메이드 복" == "메이드복")
+    return "".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+# 아호-코라식 오토마톤 : 키워드 수와 상관없이 상품명을 한 번만 훑음
+class KeywordMatcher(object):
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords: list[str] = []
+
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[tuple[int, ...]] = [()]
+
+        seen = set()
+        for keyword in keywords:
+            normalized = normalize(keyword)
+            if normalized == "" or normalized in seen:
+                continue
+            seen.add(normalized)
+            self._add(normalized, len(self.keywords))
+            self.keywords.append(keyword)
+
+        self._build()
+
+    def _add(self, word: str, index: int) -> None:
+        state = 0
+        for char in word:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._output[state] += (index,)
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nextstate in self._goto[state].items():
+                queue.append(nextstate)
+
+                fail = self._fail[state]
+                while fail != 0 and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nextstate] = self._goto[fail].get(char, 0)
+                self._output[nextstate] += self._output[self._fail[nextstate]]
+
+    def find(self, text: str) -> list[str]:
+        matched: set[int] = set()
+        state = 0
+        goto, fail, output = self._goto, self._fail, self._output
+
+        for char in normalize(text):
+            while state != 0 and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                matched.update(output[state])
+
+        return [self.keywords[i] for i in sorted(matched)]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
@@ -0,0 +1,118 @@
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from consts import LATENCY_FILE
+
+logger = logging.getLogger("onadaily.latency")
+
+MAX_SAMPLES = 50  # 단계별로 최근 기록만 보관
+MIN_SAMPLES = 5  # 이보다 적으면 waittime 사용
+PERCENTILE = 0.95
+SAFETY_FACTOR = 2.0
+LOCK_TIMEOUT = 10.0  # 이보다 오래된 잠금 파일은 비정상 종료로 남은 것으로 봄
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    # 여러 프로세스(작업자, 계정)가 같은 파일을 읽고 고쳐 쓰는 동안 다른 프로세스를 기다리게 함
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while True:
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > LOCK_TIMEOUT:
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"잠금 파일 대기 시간 초과 : {path}")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    index = max(0, math.ceil(q * len(ordered)) - 1)
+    return ordered[index]
+
+
+class LatencyHistory(object):
+    # 사이트, 단계별 대기 시간 기록으로 WebDriverWait 시간을 정함
+    def __init__(self, path: str = LATENCY_FILE) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._samples: dict[str, dict[str, list[float]]] = self._load()
+        self._expanded: set[tuple[str, str]] = set()
+        self._new: dict[str, dict[str, list[float]]] = {}  # 불러온 뒤 새로 기록한 시간 (저장할 때 파일에 합침)
+
+    def _load(self) -> dict[str, dict[str, list[float]]]:
+        if not os.path.isfile(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return dict(json.load(f))
+        except (OSError, ValueError, TypeError) as ex:
+            logger.debug(f"대기 시간 기록 불러오기 실패 : {ex}")
+            return {}
+
+    def record(self, site: str, step: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(site, {}).setdefault(step, [])
+            samples.append(round(seconds, 3))
+            del samples[:-MAX_SAMPLES]
+            self._new.setdefault(site, {}).setdefault(step, []).append(round(seconds, 3))
+
+    def expand(self, site: str, step: str) -> None:
+        # 줄인 시간 안에 실패하면 이번 실행에서는 waittime 으로 다시 시도
+        self._expanded.add((site, step))
+
+    def timeout(self, site: str, step: str, ceiling: float, floor: float) -> float:
+        if (site, step) in self._expanded:
+            return ceiling
+
+        samples = self._samples.get(site, {}).get(step, [])
+        if len(samples) < MIN_SAMPLES:
+            return ceiling
+
+        return min(ceiling, max(floor, percentile(samples, PERCENTILE) * SAFETY_FACTOR))
+
+    def save(self) -> None:
+        with self._lock:
+            new, self._new = self._new, {}
+        if len(new) == 0:
+            return
+
+        tmpfile = self.path + ".tmp"
+        try:
+            with _file_lock(self.path + ".lock"):
+                merged = self._load()  # 다른 프로세스가 그 사이 저장한 기록에 새 기록만 더함
+                for site, steps in new.items():
+                    for step, values in steps.items():
+                        samples = merged.setdefault(site, {}).setdefault(step, [])
+                        samples.extend(values)
+                        del samples[:-MAX_SAMPLES]
+
+                with open(tmpfile, "w", encoding="utf-8") as f:
+                    json.dump(merged, f, ensure_ascii=False)
+                os.replace(tmpfile, self.path)
+        except (OSError, TimeoutError) as ex:
+            logger.debug(f"대기 시간 기록 저장 실패 : {ex}")
+            return
+
+        with self._lock:
+            self._samples = merged
@@ -1,28 +1,194 @@
+import argparse
+import contextlib
 import logging
+import os
+import sys
 
 from yaml import YAMLError
 
+import consts
 from config import Options
-from consts import DEBUG_MODE
 from errors import ConfigError
-from onadaily import Onadaily
+from profiling import Profiler, phase
+from result_stream import NdjsonWriter
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="onadaily")
+    parser.add_argument(
+        "--output",
+        choices=["text", "ndjson"],
+        default="text",
+        help="ndjson : 사이트별 결과와 최종 결과를 한 줄씩 JSON으로 출력 (나머지 출력은 stderr)",
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="단계별 프로파일(pstats, flamegraph용 접힌 스택)을 logs 폴더에 저장"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    run_parser = subparsers.add_parser("run", help="출석 체크 실행 (기본값)")
+    run_parser.add_argument("--record", action="store_true", help="사이트별 응답, 얼럿, 명령 순서를 recordings 폴더에 기록")
+    subparsers.add_parser("test", help="디버그 모드로 출석 체크 실행")
+    subparsers.add_parser("status", help="설정과 마지막 실행 결과 출력")
+    subparsers.add_parser("validate-config", help="설정 파일 검사")
+    show_results = subparsers.add_parser("show-results", help="지난 실행 결과 출력")
+    show_results.add_argument("-n", "--count", type=int, default=1, help="출력할 실행 횟수")
+    deals = subparsers.add_parser("deals", help="저장된 핫딜 기록 출력 (기본값: 오늘의 새 핫딜)")
+    deals.add_argument("--lowest", action="store_true", help="상품별 최저가 출력")
+    subparsers.add_parser("probe", help="로그인 없이 사이트 선택자가 그대로인지 확인")
+    coordinator = subparsers.add_parser("coordinator", help="여러 계정의 출석 체크를 작업자 프로세스에 나눠서 실행")
+    coordinator.add_argument("accounts", nargs="+", metavar="ACCOUNT_DIR", help="설정 파일(onadaily.yaml)이 있는 계정 폴더")
+    coordinator.add_argument("-w", "--workers", type=int, default=2, help="작업자 프로세스 수")
+    coordinator.add_argument("--queue", default=None, help="작업 대기열 파일 (기본값: jobs.sqlite3)")
+    coordinator.add_argument("--metrics-port", type=int, default=0, help="Prometheus 지표 포트 (0 이면 사용 안함)")
+    enroll = subparsers.add_parser("enroll", help="창을 띄워 소셜 로그인을 한 번 하고 로그인 정보 저장 (headless 실행용)")
+    enroll.add_argument("sites", nargs="*", metavar="SITE", help="로그인할 사이트 (기본값: 소셜 로그인을 사용하는 모든 사이트)")
+    replay = subparsers.add_parser("replay", help="기록된 응답만으로 출석 체크를 다시 실행 (오프라인)")
+    replay.add_argument("recording", metavar="RECORDING_ID", help="recordings 폴더의 기록 ID 또는 경로")
+    replay.add_argument("-n", "--repeat", type=int, default=1, help="반복 횟수")
+    scenarios = subparsers.add_parser("scenarios", help="기록을 재현하며 지연, 오류 응답 등 장애를 넣어 재시도, 대기 시간 측정")
+    scenarios.add_argument("file", metavar="SCENARIO_FILE", help="시나리오 파일 (yaml)")
+    worker = subparsers.add_parser("worker", help="작업 대기열의 출석 체크 작업 실행")
+    worker.add_argument("--queue", default=None, help="작업 대기열 파일 (기본값: jobs.sqlite3)")
+    hotdeals = subparsers.add_parser("hotdeals", help="크롬 없이 핫딜 목록만 불러옴")
+    hotdeals.add_argument("--interval", type=float, default=None, help="반복 간격(분), 없으면 한 번만 실행")
+    hotdeals.add_argument(
+        "--url", action="append", default=[], metavar="SITE=URL", help="사이트의 핫딜 페이지 주소 변경 (테스트용)"
+    )
+
+    args = parser.parse_args()
+    if args.command is None:
+        args.command = "run"
+    return args
+
+
+def run(options: Options, resultstream: NdjsonWriter | None, record: bool = False) -> int:
+    # 무거운 모듈(selenium, undetected_chromedriver 등)은 실행할 때만 불러옴
+    with phase("import"):
+        from artifacts import ArtifactWriter
+        from onadaily import Onadaily
+        from processes import reap_orphans
+
+    if options.common.jsonlog:
+        from jsonlog import setup_json_log
+
+        setup_json_log(logging.getLogger("onadaily"), account=os.path.basename(os.getcwd()))  # 계정 폴더 이름
+
+    if options.common.metricsport > 0:
+        from metrics import start_server
+
+        start_server(options.common.metricsport)
+
+    reap_orphans()
+
+    if options.session_required():  # headless 소셜 로그인은 저장된 로그인 정보가 있어야 함
+        from session import enrolled, prompt_enroll, social_sites
+
+        if not enrolled() and not prompt_enroll(options, social_sites(options)):
+            return 1
+
+    main = Onadaily(resultstream, record)
+    try:
+        passed = main.run()
+    finally:
+        main.outbox.close()  # 못 보낸 알림은 outbox 폴더에 남음
+        ArtifactWriter().close()  # 남은 로그 파일 저장
+
+    return 0 if passed else 1
+
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "test":  # 하위 명령이 test 일 때만 (다른 명령의 인자가 test 인 경우는 제외)
+        consts.DEBUG_MODE = consts.SHOW_CREDENTIALS = True
+    if args.profile:
+        Profiler().start()
     options = None
+    exitcode = 1
     try:
         logger = logging.getLogger("onadaily")
         logger.setLevel(logging.DEBUG)
 
-        if DEBUG_MODE:
+        if consts.DEBUG_MODE:
             handler = logging.StreamHandler()
             formatter = logging.Formatter("%(asctime)s - %(module)s - %(message)s")
             handler.setFormatter(formatter)
             logger.addHandler(handler)
 
-        options = Options()
+        match args.command:
+            case "status":
+                from commands import status
+
+                exitcode = status()
+            case "validate-config":
+                from commands import validate_config
+
+                exitcode = validate_config()
+            case "show-results":
+                from commands import show_results
+
+                exitcode = show_results(args.count)
+            case "deals":
+                from commands import show_deals
+
+                exitcode = show_deals(args.lowest)
+            case "probe":
+                from selector_probe import run_probe
+
+                resultstream = NdjsonWriter(sys.stdout) if args.output == "ndjson" else None
+                with contextlib.redirect_stdout(sys.stderr) if resultstream is not None else contextlib.nullcontext():
+                    exitcode = run_probe(Options(), resultstream)
+            case "coordinator":
+                from consts import JOB_QUEUE_FILE
+                from workers import run_coordinator
+
+                resultstream = NdjsonWriter(sys.stdout) if args.output == "ndjson" else None
+                with contextlib.redirect_stdout(sys.stderr) if resultstream is not None else contextlib.nullcontext():
+                    queue_path = os.path.abspath(args.queue or JOB_QUEUE_FILE)
+                    if args.metrics_port > 0:
+                        from metrics import start_server
 
-        main = Onadaily()
-        main.run()
+                        start_server(args.metrics_port)
+                    exitcode = run_coordinator(args.accounts, args.workers, queue_path, resultstream)
+            case "enroll":
+                from processes import reap_orphans
+                from session import enroll
+
+                reap_orphans()
+                exitcode = enroll(Options(), args.sites)
+            case "replay":
+                from replay import run_replay
+
+                exitcode = run_replay(Options(), args.recording, args.repeat)
+            case "scenarios":
+                from scenarios import run_scenarios
+
+                resultstream = NdjsonWriter(sys.stdout) if args.output == "ndjson" else None
+                with contextlib.redirect_stdout(sys.stderr) if resultstream is not None else contextlib.nullcontext():
+                    exitcode = run_scenarios(Options(), args.file, resultstream)
+            case "worker":
+                from consts import JOB_QUEUE_FILE
+                from workers import run_worker
+
+                exitcode = run_worker(os.path.abspath(args.queue or JOB_QUEUE_FILE))
+            case "hotdeals":
+                from hotdeal_fetcher import run_hotdeals
+
+                urls = dict(url.split("=", 1) for url in args.url)
+                interval = args.interval * 60 if args.interval is not None else None
+                options = Options()
+                if options.common.metricsport > 0:
+                    from metrics import start_server
+
+                    start_server(options.common.metricsport)
+                exitcode = run_hotdeals(options, interval, urls)
+            case _:
+                # ndjson : stdout에는 결과만, 나머지 출력은 stderr로
+                resultstream = NdjsonWriter(sys.stdout) if args.output == "ndjson" else None
+                with contextlib.redirect_stdout(sys.stderr) if resultstream is not None else contextlib.nullcontext():
+                    with phase("options"):
+                        options = Options()
+                    exitcode = run(options, resultstream, getattr(args, "record", False))
     except ConfigError as e:
         logger.exception(f"설정 파일 오류 : {e}\n")
     except YAMLError as e:
@@ -31,5 +197,12 @@ if __name__ == "__main__":
         logger.exception(f"예상치 못한 오류 발생 : {e}\n")
 
     finally:
-        if options is None or options.common.entertoquit:
+        Profiler().finish()
+        if (
+            args.command in ["run", "test"]
+            and args.output == "text"
+            and (options is None or options.common.entertoquit)
+        ):
             input("종료하려면 Enter를 누르세요...")
+
+    sys.exit(exitcode)
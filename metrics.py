@@ -0,0 +1,194 @@
+# Prometheus 텍스트 형식으로 내보내는 간단한 지표. 값 갱신은 지표마다 잠금 하나만 사용
+import abc
+import bisect
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+logger = logging.getLogger("onadaily.metrics")
+
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric(abc.ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    @abc.abstractmethod
+    def _samples(self) -> list[str]:
+        pass
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {} if labelnames else {(): 0}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def total(self) -> float:
+        with self._lock:
+            return sum(self._values.values())
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in values]
+
+
+class Gauge(_Metric):
+    # 값은 지표를 가져갈 때 함수로 계산 (크롬 수, 메모리 등)
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, function: Callable[[], float]) -> None:
+        super().__init__(name, documentation)
+        self._function = function
+
+    def _samples(self) -> list[str]:
+        try:
+            return [f"{self.name} {self._function()}"]
+        except Exception as ex:
+            logger.debug(f"{self.name} 계산 실패 : {ex}")
+            return []
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        self._values: dict[LabelValues, list[float]] = {}  # 구간별 개수..., +Inf 개수, 합계
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            if (counts := self._values.get(key)) is None:
+                counts = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = [(key, list(counts)) for key, counts in self._values.items()]
+
+        lines = []
+        for key, counts in values:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {counts[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+REGISTRY: list[_Metric] = []
+
+
+def render() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+def _browser_count() -> float:
+    from admission import measure
+
+    return measure().browsers
+
+
+def _browser_rss() -> float:
+    from admission import measure
+
+    return measure().browser_rss_mb * 1024 * 1024
+
+
+def _admission_waiting() -> float:
+    from admission import queue_depth
+
+    return queue_depth()
+
+
+RUNS = Counter("onadaily_runs_total", "출석 체크 실행 횟수")
+RETRIES = Counter("onadaily_retries_total", "재시도 횟수")
+STAMP_RESULTS = Counter("onadaily_stamp_results_total", "사이트별 출석 체크 결과", ("site", "outcome"))
+WASTED_WAIT_SECONDS = Counter("onadaily_wasted_wait_seconds_total", "시간 초과로 끝난 대기 시간", ("site", "step"))
+WAIT_SECONDS = Histogram("onadaily_wait_seconds", "단계별 대기 시간", ("site", "step"))
+BROWSER_LAUNCH_SECONDS = Histogram("onadaily_browser_launch_seconds", "크롬 실행에 걸린 시간")
+ADMISSION_WAIT_SECONDS = Histogram("onadaily_admission_wait_seconds", "크롬 실행 전 자원 여유를 기다린 시간")
+WEBDRIVER_COMMANDS = Counter("onadaily_webdriver_commands_total", "사이트별 WebDriver 명령 수", ("site",))
+HOTDEAL_ROWS = Counter("onadaily_hotdeal_rows_total", "가져온 핫딜 상품 수", ("site",))
+Gauge("onadaily_browsers", "실행 중인 크롬 수", _browser_count)
+Gauge("onadaily_browser_rss_bytes", "실행 중인 크롬, 크롬 드라이버 메모리", _browser_rss)
+Gauge("onadaily_admission_queue", "크롬 실행을 기다리는 프로세스 수", _admission_waiting)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(f"metrics : {format % args}")
+
+
+def start_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer | None:
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as ex:
+        print(f"⚠️ 지표 서버를 열지 못했습니다 ({host}:{port}) : {ex}")
+        return None
+
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logger.debug(f"지표 서버 시작 : http://{host}:{port}/metrics")
+    return server
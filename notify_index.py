@@ -0,0 +1,85 @@
+import hashlib
+import logging
+import os
+import struct
+import time
+
+from consts import NOTIFIED_EXPIRE_DAYS, NOTIFIED_INDEX_FILE
+from keyword_matcher import normalize
+
+logger = logging.getLogger("onadaily.notify_index")
+
+# 지문(8바이트) + 만료 시각(초) : 항목당 12바이트
+RECORD = struct.Struct("<QI")
+
+
+def fingerprint(*fields: str) -> int:
+    digest = hashlib.blake2b("\0".join(normalize(field) for field in fields).encode("utf-8"), digest_size=8)
+    return int.from_bytes(digest.digest(), "little")
+
+
+class NotifiedIndex(object):
+    def __init__(self, path: str = NOTIFIED_INDEX_FILE, expire_days: int = NOTIFIED_EXPIRE_DAYS) -> None:
+        self.path = path
+        self.expire_seconds = expire_days * 24 * 60 * 60
+        self._entries = self._load()
+        self._changed = False
+
+    def _load(self) -> dict[int, int]:
+        entries: dict[int, int] = {}
+        if not os.path.isfile(self.path):
+            return entries
+
+        now = int(time.time())
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError as ex:
+            logger.debug(f"알림 기록 불러오기 실패 : {ex}")
+            return entries
+
+        usable = len(data) - len(data) % RECORD.size
+        for key, expire in RECORD.iter_unpack(data[:usable]):
+            if expire > now and expire > entries.get(key, 0):
+                entries[key] = expire
+        return entries
+
+    def seen(self, *fields: str) -> bool:
+        # 이미 알렸고 아직 만료되지 않은 항목이면 True (기록은 바꾸지 않음)
+        return self._entries.get(fingerprint(*fields), 0) > int(time.time())
+
+    def add(self, *fields: str) -> bool:
+        # 처음 보거나 만료된 항목이면 True, 이미 알린 항목이면 만료 시각만 연장하고 False
+        key = fingerprint(*fields)
+        now = int(time.time())
+        isnew = self._entries.get(key, 0) <= now
+
+        self._entries[key] = now + self.expire_seconds
+        self._changed = True
+        return isnew
+
+    def save(self) -> None:
+        if not self._changed:
+            return
+
+        # 다른 프로세스가 그 사이 기록한 항목과 합침
+        for key, expire in self._load().items():
+            if expire > self._entries.get(key, 0):
+                self._entries[key] = expire
+
+        now = int(time.time())
+        data = b"".join(RECORD.pack(key, expire) for key, expire in self._entries.items() if expire > now)
+
+        tmpfile = self.path + ".tmp"
+        try:
+            with open(tmpfile, "wb") as f:
+                f.write(data)
+            os.replace(tmpfile, self.path)
+        except OSError as ex:
+            logger.debug(f"알림 기록 저장 실패 : {ex}")
+            return
+
+        self._changed = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,11 +1,42 @@
 import logging
+import time
 
-from prettytable import PrettyTable
+from selenium.common.exceptions import WebDriverException
 
+from admission import AdmissionScheduler
+from artifacts import capture_failure
 from classes import LogCaptureContext, StampResult
 from config import Options, Site
-from errors import AlreadyStamped, HotDealDataNotFoundError, LoginFailedError, StampFailedError
-from strategies import get_hotdeal_strategy, get_login_strategy, get_stamp_strategy
+from errors import (
+    AlreadyStamped,
+    HotDealDataNotFoundError,
+    HotDealTableNotFoundError,
+    LoginFailedError,
+    SelectorBrokenError,
+    StampFailedError,
+)
+from history import save_run
+from hotdeal_parser import get_hotdeal_strategy
+from hotdeal_report import HotdealReporter
+from jsonlog import log_context
+from latency import LatencyHistory
+from metrics import (
+    ADMISSION_WAIT_SECONDS,
+    BROWSER_LAUNCH_SECONDS,
+    RETRIES,
+    RUNS,
+    STAMP_RESULTS,
+    WEBDRIVER_COMMANDS,
+)
+from outbox import Outbox
+from pagetrace import PageTracer
+from processes import Watchdog
+from profiling import phase
+from ratelimit import RateLimiter
+from recorder import Recorder
+from result_stream import NdjsonWriter
+from session import import_session, prompt_enroll
+from strategies import BaseLoginStrategy, get_login_strategy, get_stamp_strategy
 from utils import LoggingInfo, get_chrome_options, save_log_error
 from webdriverwrapper import WebDriverWrapper
 
@@ -13,47 +44,97 @@ logger = logging.getLogger("onadaily")
 
 
 class Onadaily(object):
-    def __init__(self) -> None:
+    def __init__(self, resultstream: NdjsonWriter | None = None, record: bool = False) -> None:
         self.passed: dict[Site, StampResult] = {}
         self.options = Options()
+        self.resultstream = resultstream
 
         for site in self.options.sites:
             self.passed[site] = StampResult(site)
-        self.keywordnoti = PrettyTable()
-        self.keywordnoti.field_names = ["사이트", "품명", "정상가", "할인가"]
+        self.outbox = Outbox(self.options.common.notify, self.options.common.namespace)
+        self.hotdeal_reporter = HotdealReporter(self.options, self.outbox)
+        self.latency = LatencyHistory() if self.options.common.adaptivewait else None
+        self.ratelimiter = RateLimiter.from_options(self.options)
 
         self.last_exceptions: dict[Site, LoggingInfo] = {}
+        self.broken: set[Site] = set()  # 사이트 구조가 바뀐 사이트는 재시도하지 않음
+        self.expired: set[Site] = set()  # headless 소셜 로그인 세션이 만료된 사이트도 재시도하지 않음
+        self.record = record  # 사이트마다 응답, 얼럿, 명령 순서를 recordings 폴더에 기록
+        self.chrome_arguments: list[str] = []
 
     def initdriver(self) -> WebDriverWrapper:
-        driver = WebDriverWrapper(
-            get_chrome_options(self.options.common.headless),
-            self.options.common.waittime,
-            self.options.datadir_required(),
-        )
+        scheduler = AdmissionScheduler(self.options.common.minfreememory, self.options.common.maxcpuload)
+        with scheduler.admit(), phase("browser"):  # 메모리, CPU 여유가 있을 때 한 번에 하나씩 실행
+            ADMISSION_WAIT_SECONDS.observe(scheduler.last_wait)
+            started = time.monotonic()
+            driver = WebDriverWrapper(
+                get_chrome_options(
+                    self.options.common.headless,
+                    self.chrome_arguments,
+                    performance_log=self.record or self.options.common.pagetrace,
+                ),
+                self.options.common.waittime,
+                self.options.datadir_required(),
+                self.latency,
+                self.options.common.minwaittime,
+            )
+            BROWSER_LAUNCH_SECONDS.observe(time.monotonic() - started)
+
+        driver.ratelimiter = self.ratelimiter
+
+        if self.options.datadir_required():  # enroll 로 저장한 로그인 정보 중 프로필에 없는 것만 넣음
+            import_session(driver)
+
+        if self.options.common.prefetch:  # 사용할 사이트 연결을 미리 맺어둠
+            enabled = [site for site in self.options.common.order if site.enable]
+            driver.preconnect([url for site in enabled for url in (site.login_url, site.stamp_url)])
 
         return driver
 
+    def _next_site(self, site: Site) -> Site | None:
+        order = self.options.common.order
+        start = order.index(site) + 1
+        for nextsite in order[start:]:
+            if nextsite.enable and not self.passed[nextsite] and self.retryable(nextsite):
+                return nextsite
+        return None
+
     def showhotdeal(self, driver: WebDriverWrapper, site: Site) -> None:
         if self.options.common.showhotdeal and site.hotdeal_table is not None:  # 핫딜 테이블 불러오기
             try:
                 hotdeal_strategy = get_hotdeal_strategy(site)
                 table = hotdeal_strategy.get_hotdeal_info(driver.page_source, site)
-            except HotDealDataNotFoundError as e:
+            except HotDealTableNotFoundError as e:
+                # 로그인, 점검 페이지 등에서는 지난 상태를 그대로 둠
                 logger.debug(f"핫딜 테이블 파싱 실패 : {e}")
                 print("핫딜 테이블을 찾지 못했습니다.")
                 return
+            except HotDealDataNotFoundError as e:
+                logger.debug(f"핫딜 테이블 파싱 실패 : {e}")
+                print("핫딜 테이블에 상품이 없습니다.")
+                self.hotdeal_reporter.record_empty(site)
+                return
 
-            if len(table) > 0:
-                print(table)
+            self.hotdeal_reporter.report(table)
 
-                if len(self.options.common.keywordnoti) > 0:  # 키워드 알람 설정됨
-                    keywordproducts = table.keywordcheck(self.options.common.keywordnoti)
-                    if len(keywordproducts) > 0:
-                        self.keywordnoti.add_rows(keywordproducts, divider=True)
+    def _save_failure(
+        self, e: Exception, site: Site, driver: WebDriverWrapper, log_capture: LogCaptureContext | None
+    ) -> None:
+        logginginfo = LoggingInfo(e, site, driver, log_capture)
+        logginginfo.artifact_dir = capture_failure(driver, site, e)
+        if driver.recorder is not None:
+            logginginfo.recording = driver.recorder.id
+        self.last_exceptions[site] = logginginfo
 
     def check(self, driver: WebDriverWrapper, site: Site) -> StampResult:
         result = StampResult(site)
-        log_capture: LogCaptureContext
+        result.started = time.time()
+        commands = driver.command_count
+        log_capture: LogCaptureContext | None = None
+        watchdog: Watchdog | None = None
+        recorder: Recorder | None = None
+        tracer: PageTracer | None = None
+        login_strategy: BaseLoginStrategy | None = None
         try:
             print(f"== {site.name} ==")
 
@@ -61,71 +142,172 @@ class Onadaily(object):
                 print("skip")
                 result.message = "스킵"
                 result.passed = True
+                result.outcome = "skipped"
                 return result
 
-            with LogCaptureContext(logger) as capturer:
+            watchdog = Watchdog(self.options.common.sitetimeout, driver.kill)
+            with watchdog, log_context(site=site.name), LogCaptureContext(logger) as capturer:
                 logger.debug(f"=== {site.name} 출석 체크 시작 ===")
+                driver.current_site = site.name
                 log_capture = capturer
+                if self.record:
+                    recorder = Recorder(site)
+                    recorder.attach(driver)
+                    result.recording = recorder.id
+                if self.options.common.pagetrace:
+                    tracer = PageTracer(site)
+                    tracer.attach(driver)
                 login_strategy = get_login_strategy(site)
-                login_strategy.login(driver, site)
+                with phase(f"{site.name}/login"):
+                    login_strategy.login(driver, site)
                 print("로그인 성공")
 
-                self.showhotdeal(driver, site)
+                prefetch = self.options.common.prefetch and recorder is None  # 기록에 다른 사이트 응답이 섞이지 않도록
+                if prefetch and (nextsite := self._next_site(site)) is not None:
+                    driver.prefetch(nextsite.login_url)  # 출석 체크 얼럿을 기다리는 동안 다음 사이트를 불러옴
+
+                with phase(f"{site.name}/hotdeal"):
+                    self.showhotdeal(driver, site)
 
                 stamp_strategy = get_stamp_strategy(site)
-                stamp_strategy.stamp(driver, site)
+                with phase(f"{site.name}/stamp"):
+                    stamp_strategy.stamp(driver, site)
 
                 result.message = "✅ 출석 체크 성공"
                 result.passed = True
+                result.outcome = "success"
 
         except AlreadyStamped:
             result.message = "ℹ️ 이미 출첵함"
             result.passed = True
+            result.outcome = "already_stamped"
+        except SelectorBrokenError as e:
+            result.message = f"❌ 사이트 구조 변경 감지\n\t-{e}"
+            result.iserror = True
+            result.outcome = "selector_broken"
+            result.error_class = type(e).__name__
+            self.broken.add(site)
+            self._save_failure(e, site, driver, log_capture)
         except LoginFailedError as e:
-            captured_logs = log_capture.captured_logs_string if log_capture is not None else None
             result.message = f"❌ 로그인 중 실패\n\t-{e}"
             result.iserror = True
-            self.last_exceptions[site] = LoggingInfo(e, site, driver, captured_logs)
+            result.outcome = "login_failed"
+            result.error_class = type(e).__name__
+            if self._session_expired(driver, site, login_strategy):  # 창이 없어서 다시 로그인할 수 없음
+                result.message = f"❌ 소셜 로그인 세션 만료, `onadaily enroll` 로 다시 로그인하세요\n\t-{e}"
+                result.outcome = "session_expired"
+                self.expired.add(site)
+            self._save_failure(e, site, driver, log_capture)
         except StampFailedError as e:
-            captured_logs = log_capture.captured_logs_string if log_capture is not None else None
             result.message = f"❌ 출석체크 중 실패\n\t-{e}"
             result.iserror = True
-            self.last_exceptions[site] = LoggingInfo(e, site, driver, captured_logs)
+            result.outcome = "stamp_failed"
+            result.error_class = type(e).__name__
+            self._save_failure(e, site, driver, log_capture)
         except Exception as e:
-            captured_logs = log_capture.captured_logs_string if log_capture is not None else None
             result.message = f"❌ 알 수 없는 오류\n\t-{e}"
             result.iserror = True
-            self.last_exceptions[site] = LoggingInfo(e, site, driver, captured_logs)
+            result.outcome = "unknown"
+            result.error_class = type(e).__name__
+            self._save_failure(e, site, driver, log_capture)
         finally:
+            if recorder is not None:
+                try:
+                    recorder.detach(driver)
+                except Exception as ex:
+                    logger.debug(f"기록 저장 실패 : {ex}")
+            if tracer is not None:
+                try:
+                    if (report := tracer.detach(driver)) is not None:
+                        print(f"페이지 추적 보고서 : {report}")
+                except Exception as ex:
+                    logger.debug(f"페이지 추적 보고서 저장 실패 : {ex}")
+            if watchdog is not None and watchdog.expired:
+                result.message = f"❌ 제한 시간({watchdog.timeout}초) 초과"
+                result.iserror = True
+                result.error_class = "SiteTimeout"
+                result.outcome = "timeout"
             if result.iserror:
                 result.passed = False
+            result.finished = time.time()
+            result.commands = driver.command_count - commands
+            if site.enable:
+                STAMP_RESULTS.inc(site=site.name, outcome=str(result.outcome))
+                WEBDRIVER_COMMANDS.inc(result.commands, site=site.name)
+                logger.debug(f"{site.name} WebDriver 명령 {result.commands}개")
 
         print(result.message)
         return result
 
-    def run(self) -> None:
+    def _session_expired(self, driver: WebDriverWrapper, site: Site, strategy: BaseLoginStrategy | None) -> bool:
+        # headless 소셜 로그인에서 로그인 버튼을 누른 뒤 페이지를 다 불러왔는데도 로그인이 확인되지 않는 경우만 세션 만료
+        # 페이지를 불러오지 못하거나 버튼을 찾지 못한 경우는 재시도할 수 있는 login_failed
+        if not self.options.common.headless or site.login == "default":
+            return False
+        if strategy is None or not strategy.submitted:
+            return False
+        try:
+            return driver.execute_script("return document.readyState") == "complete" and not driver.check_logined(site)
+        except WebDriverException:
+            return False
+
+    def retryable(self, site: Site) -> bool:
+        return site not in self.broken and site not in self.expired
+
+    def save(self) -> None:
+        with phase("save"):
+            self.hotdeal_reporter.save()
+            if self.latency is not None:
+                self.latency.save()
+
+    def stamp_all(self, sites: list[Site] | None = None) -> int:
+        # 모든 사이트가 성공하거나 재시도 횟수를 다 쓸 때까지 반복, 시도 횟수 반환
         retry_count = 0
         max_retries = self.options.common.retrytime if self.options.common.autoretry else 1
-
-        while retry_count < max_retries and not all(self.passed.values()):
+        targets = list(self.passed) if sites is None else sites
+        while retry_count < max_retries and not all(self.passed[site] or not self.retryable(site) for site in targets):
             retry_count += 1
-            order = self.options.common.order
+            if retry_count > 1:
+                RETRIES.inc()
+            order = [site for site in self.options.common.order if site in targets]
 
-            with self.initdriver() as driver:
+            driver = self.initdriver()
+            try:
                 for site in order:
                     self._currentsite = site
-                    if self.passed[site]:
+                    if self.passed[site] or not self.retryable(site):
                         continue
 
-                    self.passed[site] = self.check(driver, site)
+                    if driver.quited:  # 제한 시간 초과로 종료된 경우 새로 시작
+                        driver = self.initdriver()
+                    else:
+                        driver.close_prefetch()
+
+                    result = self.passed[site] = self.check(driver, site)
+                    result.attempt = retry_count
+                    if site.enable:  # 결과는 바로 내보내고 알림 대기열로, 전송은 백그라운드에서
+                        if self.resultstream is not None:
+                            self.resultstream.write({"type": "result", **result.to_dict()})
+                        self.outbox.put("result", f"{site.name} : {result.message}", **result.to_dict())
+            finally:
+                driver.quit()
+        return retry_count
+
+    def run(self) -> bool:
+        started = time.time()
+        max_retries = self.options.common.retrytime if self.options.common.autoretry else 1
+
+        RUNS.inc()
+        retry_count = self.stamp_all()
+        if len(self.expired) > 0 and prompt_enroll(self.options, list(self.expired)):
+            expired, self.expired = list(self.expired), set()
+            retry_count += self.stamp_all(expired)  # 다시 로그인한 사이트만 한 번 더
+
+        self.save()
 
         if all(self.passed.values()):
-            if len(self.options.common.keywordnoti) > 0:
-                print("======키워드 알림======")
-                if len(self.keywordnoti.rows) > 0:
-                    print(self.keywordnoti)
-                else:
-                    print("키워드 알림 없음")
+            self.hotdeal_reporter.print_keywordnoti()
+            self.hotdeal_reporter.save()  # 출력한 키워드 알림을 알린 것으로 저장
         else:
             print("===============")
             print(f"❌ 재시도 {max_retries}번 실패")
@@ -141,3 +323,29 @@ class Onadaily(object):
         print("======결과======")
         for result in self.passed.values():
             print(f"사이트 : {result.site.name} / {result.message}")
+
+        save_run([result.to_dict() for result in self.passed.values()])
+
+        failed = [result.site.name for result in self.passed.values() if not result.passed]
+        self.outbox.put(
+            "summary",
+            f"실패 : {', '.join(failed)}" if len(failed) > 0 else "모든 사이트 출석 체크 완료",
+            passed=len(failed) == 0,
+            failed=failed,
+        )
+
+        if self.resultstream is not None:
+            finished = time.time()
+            self.resultstream.write(
+                {
+                    "type": "summary",
+                    "passed": len(failed) == 0,
+                    "failed": failed,
+                    "attempts": retry_count,
+                    "started": started,
+                    "finished": finished,
+                    "duration": round(finished - started, 3),
+                }
+            )
+
+        return len(failed) == 0
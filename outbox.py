@@ -0,0 +1,267 @@
+import abc
+import hashlib
+import json
+import logging
+import os
+import smtplib
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from email.message import EmailMessage
+from typing import Any
+
+import psutil
+
+from consts import OUTBOX_DIR
+from errors import ConfigError
+
+logger = logging.getLogger("onadaily.outbox")
+
+BATCH_SIZE = 50
+BATCH_SECONDS = 2.0  # 첫 메시지 이후 이 시간 동안 모아서 보냄
+MAX_BACKOFF = 300.0
+SENDING_SUFFIX = ".sending"  # 보내는 중인 파일 : 이름.json.<pid>.sending
+DEAD_LETTER_ATTEMPTS = 3  # 다시 보내도 성공할 수 없는 오류가 이만큼 이어지면 보내지 않고 따로 저장
+
+
+def message_text(message: dict[str, Any]) -> str:
+    return f"[{message.get('account', '')}] {message.get('text', '')}"
+
+
+def is_permanent(ex: Exception) -> bool:
+    # 잘못된 웹훅 주소, 메일 인증 실패 등
+    if isinstance(ex, urllib.error.HTTPError):
+        return 400 <= ex.code < 500 and ex.code not in (408, 429)
+    return isinstance(
+        ex, (smtplib.SMTPAuthenticationError, smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused)
+    )
+
+
+class BaseSink(abc.ABC):
+    def __init__(self, config: dict[str, Any]) -> None:
+        self.config = config
+        self.timeout = float(config.get("timeout", 10))
+
+    @property
+    def name(self) -> str:
+        digest = hashlib.sha1(json.dumps(self.config, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+        return f"{self.config['type']}_{digest}"
+
+    @abc.abstractmethod
+    def send(self, messages: list[dict[str, Any]]) -> None:
+        pass
+
+
+class WebhookSink(BaseSink):
+    def send(self, messages: list[dict[str, Any]]) -> None:
+        body = json.dumps(
+            {"text": "\n".join(message_text(m) for m in messages), "messages": messages}, ensure_ascii=False
+        ).encode("utf-8")
+        request = urllib.request.Request(
+            self.config["url"], data=body, headers={"Content-Type": "application/json; charset=utf-8"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class SmtpSink(BaseSink):
+    def send(self, messages: list[dict[str, Any]]) -> None:
+        mail = EmailMessage()
+        mail["Subject"] = self.config.get("subject", "Onadaily 알림")
+        mail["From"] = self.config["from"]
+        mail["To"] = self.config["to"]
+        mail.set_content("\n".join(message_text(m) for m in messages))
+
+        with smtplib.SMTP(self.config["host"], int(self.config.get("port", 25)), timeout=self.timeout) as smtp:
+            if self.config.get("starttls", False):
+                smtp.starttls()
+            if "user" in self.config:
+                smtp.login(self.config["user"], self.config["password"])
+            smtp.send_message(mail)
+
+
+class FileSink(BaseSink):
+    def send(self, messages: list[dict[str, Any]]) -> None:
+        with open(self.config["path"], "a", encoding="utf-8") as f:
+            for message in messages:
+                f.write(json.dumps(message, ensure_ascii=False) + "\n")
+
+
+class SocketSink(BaseSink):
+    def send(self, messages: list[dict[str, Any]]) -> None:
+        data = "".join(json.dumps(m, ensure_ascii=False) + "\n" for m in messages).encode("utf-8")
+        with socket.create_connection((self.config["host"], int(self.config["port"])), timeout=self.timeout) as sock:
+            sock.sendall(data)
+
+
+SINKS: dict[str, type[BaseSink]] = {
+    "webhook": WebhookSink,
+    "smtp": SmtpSink,
+    "file": FileSink,
+    "socket": SocketSink,
+}
+
+
+def create_sink(config: dict[str, Any]) -> BaseSink:
+    if not isinstance(config, dict) or config.get("type") not in SINKS:
+        raise ConfigError(f"notify 항목의 type은 {', '.join(SINKS)} 중 하나여야 합니다.")
+    return SINKS[config["type"]](config)
+
+
+class _SinkWorker(threading.Thread):
+    # 사이트별 결과는 디스크에 먼저 저장하고, 이 스레드가 모아서 보냄 (실패 시 재시도)
+    def __init__(self, sink: BaseSink) -> None:
+        super().__init__(name=f"outbox-{sink.name}", daemon=True)
+        self.sink = sink
+        self.spooldir = os.path.join(OUTBOX_DIR, sink.name)
+        self.deadletter = os.path.join(OUTBOX_DIR, f"{sink.name}.dead.jsonl")
+        self.wakeup = threading.Event()
+        self.closing = False
+
+    def spool(self, message: dict[str, Any]) -> None:
+        os.makedirs(self.spooldir, exist_ok=True)
+        path = os.path.join(self.spooldir, f"{time.time_ns()}_{uuid.uuid4().hex}.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(message, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+        self.wakeup.set()
+
+    def _claim(self, path: str) -> str | None:
+        # 같은 폴더를 쓰는 다른 프로세스(워커, 다른 계정)와 같은 알림을 두 번 보내지 않도록 이름을 바꿔 가져옴
+        claimed = f"{path}.{os.getpid()}{SENDING_SUFFIX}"
+        try:
+            os.replace(path, claimed)
+        except OSError:  # 다른 프로세스가 먼저 가져감
+            return None
+        return claimed
+
+    def _pending(self) -> list[str]:
+        # 전에 가져왔지만 보내지 못한 파일과 새로 가져온 파일
+        if not os.path.isdir(self.spooldir):
+            return []
+        names = sorted(os.listdir(self.spooldir))
+        mine = f".{os.getpid()}{SENDING_SUFFIX}"
+        paths = [os.path.join(self.spooldir, name) for name in names if name.endswith(mine)][:BATCH_SIZE]
+        for name in names:
+            if len(paths) >= BATCH_SIZE:
+                break
+            if name.endswith(".json") and (claimed := self._claim(os.path.join(self.spooldir, name))) is not None:
+                paths.append(claimed)
+        return paths
+
+    def _recover(self) -> None:
+        # 보내는 중에 종료된 프로세스가 가져간 파일을 되돌림
+        if not os.path.isdir(self.spooldir):
+            return
+        for name in os.listdir(self.spooldir):
+            if not name.endswith(SENDING_SUFFIX):
+                continue
+            original, pid = name.removesuffix(SENDING_SUFFIX).rsplit(".", 1)
+            if not pid.isdigit() or int(pid) == os.getpid() or psutil.pid_exists(int(pid)):
+                continue
+            try:
+                os.replace(os.path.join(self.spooldir, name), os.path.join(self.spooldir, original))
+            except OSError:
+                pass
+
+    def _remove(self, paths: list[str]) -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _dead_letter(self, messages: list[dict[str, Any]], ex: Exception) -> None:
+        logger.warning(f"{self.sink.name} 알림 {len(messages)}개를 보낼 수 없어 {self.deadletter}에 저장 : {ex}")
+        with open(self.deadletter, "a", encoding="utf-8") as f:
+            for message in messages:
+                f.write(json.dumps({**message, "error": repr(ex)}, ensure_ascii=False) + "\n")
+
+    def run(self) -> None:
+        self._recover()
+        backoff = 0.0
+        failures = 0  # 이어서 실패한 횟수 (재시도해도 안되는 오류만)
+        while True:
+            paths = self._pending()
+            if len(paths) == 0:
+                if self.closing:
+                    return
+                self.wakeup.wait()
+                self.wakeup.clear()
+                continue
+
+            if not self.closing and len(paths) < BATCH_SIZE and backoff == 0:
+                time.sleep(BATCH_SECONDS)
+                paths = self._pending()
+
+            messages = []
+            for path in paths:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        messages.append(json.load(f))
+                except (OSError, ValueError) as ex:
+                    logger.debug(f"알림 파일 읽기 실패 : {path} / {ex}")
+                    self._remove([path])
+
+            if len(messages) == 0:  # 읽을 수 있는 알림이 없음
+                continue
+
+            try:
+                self.sink.send(messages)
+            except Exception as ex:
+                failures = failures + 1 if is_permanent(ex) else 0
+                if failures >= DEAD_LETTER_ATTEMPTS:
+                    try:
+                        self._dead_letter(messages, ex)
+                    except OSError as writeex:
+                        logger.debug(f"보내지 못한 알림 저장 실패 : {writeex}")
+                    else:
+                        self._remove(paths)
+                        failures = 0
+                        backoff = 0.0
+                        continue
+
+                backoff = min(max(1.0, backoff * 2), MAX_BACKOFF)
+                logger.debug(f"{self.sink.name} 알림 전송 실패, {backoff}초 후 재시도 : {ex}")
+                if self.closing:  # 종료 중이면 다음 실행 때 다시 보냄
+                    return
+                self.wakeup.wait(backoff)
+                self.wakeup.clear()
+                continue
+
+            backoff = 0.0
+            failures = 0
+            logger.debug(f"{self.sink.name} 알림 {len(messages)}개 전송")
+            self._remove(paths)
+
+
+class Outbox(object):
+    def __init__(self, configs: list[dict[str, Any]], account: str = "") -> None:
+        self.account = account
+        self.workers = [_SinkWorker(create_sink(config)) for config in configs]
+        for worker in self.workers:
+            worker.start()  # 지난 실행에서 못 보낸 알림도 보냄
+
+    def put(self, kind: str, text: str, **fields: Any) -> None:
+        if len(self.workers) == 0:
+            return
+
+        message = {"kind": kind, "account": self.account, "time": time.time(), "text": text, **fields}
+        for worker in self.workers:
+            try:
+                worker.spool(message)
+            except OSError as ex:
+                logger.debug(f"알림 저장 실패 : {ex}")
+
+    def close(self, timeout: float = 10) -> None:
+        deadline = time.monotonic() + timeout
+        for worker in self.workers:
+            worker.closing = True
+            worker.wakeup.set()
+        for worker in self.workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+            if worker.is_alive():
+                print(f"⚠️ {worker.sink.name} 알림을 보내지 못했습니다. 다음 실행 때 다시 보냅니다.")
@@ -0,0 +1,184 @@
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from artifacts import ArtifactWriter
+
+if TYPE_CHECKING:
+    from config import Site
+    from webdriverwrapper import WebDriverWrapper
+
+logger = logging.getLogger("onadaily.pagetrace")
+
+TOP_N = 10
+METRICS = ("TaskDuration", "ScriptDuration", "LayoutDuration", "RecalcStyleDuration", "JSHeapUsedSize")
+CUMULATIVE = ("TaskDuration", "ScriptDuration", "LayoutDuration", "RecalcStyleDuration")  # Performance.enable 이후 누적값
+
+# 현재 페이지의 탐색 시간과 렌더링을 막은 리소스 (Resource Timing의 renderBlockingStatus)
+PAGE_SCRIPT = """
+const nav = performance.getEntriesByType("navigation")[0];
+return {
+    url: location.href,
+    dcl: nav ? nav.domContentLoadedEventEnd : null,
+    load: nav ? nav.loadEventEnd : null,
+    blocking: performance.getEntriesByType("resource")
+        .filter((entry) => entry.renderBlockingStatus === "blocking")
+        .map((entry) => [entry.name, entry.initiatorType, entry.duration]),
+};
+"""
+
+
+def _host(url: str) -> str:
+    return (urlsplit(url).hostname or "").removeprefix("www.")
+
+
+class PageTracer(object):
+    # 사이트를 체크하는 동안 불러온 페이지마다 요청 시간, 크기와 CDP 성능 지표를 모아 보고서로 저장
+    def __init__(self, site: "Site") -> None:
+        self.site = site.name
+        self.domain = _host(site.main_url)
+        self.requests: dict[str, dict[str, Any]] = {}
+        self.pages: list[dict[str, Any]] = []  # 페이지별 탐색 시간, 성능 지표
+        self._last_metrics: dict[str, float] = {}  # 이전 페이지까지의 누적 지표
+
+    def attach(self, driver: "WebDriverWrapper") -> None:
+        driver.tracer = self
+        driver.event_listeners.append(self.handle_event)
+        try:
+            driver.execute_cdp_cmd("Performance.enable", {})
+            driver.performance_events()  # 이전 사이트 이벤트는 버림
+        except WebDriverException as ex:
+            logger.debug(f"페이지 추적 준비 실패 : {ex.msg}")
+
+    def detach(self, driver: "WebDriverWrapper") -> str | None:
+        try:
+            if not driver.quited:
+                self.finish_page(driver)
+        finally:
+            driver.tracer = None
+            if self.handle_event in driver.event_listeners:
+                driver.event_listeners.remove(self.handle_event)
+        return self.save()
+
+    def handle_event(self, event: dict[str, Any]) -> None:
+        params = event.get("params", {})
+        request_id = params.get("requestId", "")
+        match event["method"]:
+            case "Network.requestWillBeSent":
+                self.requests[request_id] = {
+                    "url": params["request"]["url"],
+                    "type": params.get("type", ""),
+                    "start": params["timestamp"],
+                    "end": None,
+                    "bytes": 0,
+                    "status": None,
+                }
+            case "Network.responseReceived" if request_id in self.requests:
+                response = params["response"]
+                self.requests[request_id]["status"] = response["status"]
+                self.requests[request_id]["cached"] = response.get("fromDiskCache", False)
+            case "Network.loadingFinished" if request_id in self.requests:
+                self.requests[request_id]["end"] = params["timestamp"]
+                self.requests[request_id]["bytes"] = params.get("encodedDataLength", 0)
+            case "Network.loadingFailed" if request_id in self.requests:
+                self.requests[request_id]["end"] = params["timestamp"]
+                self.requests[request_id]["error"] = params.get("errorText")
+
+    def finish_page(self, driver: "WebDriverWrapper") -> None:
+        # 다른 페이지로 가기 전에 현재 페이지의 지표를 가져옴
+        try:
+            driver.performance_events()
+            page = driver.execute_script(PAGE_SCRIPT)
+            metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        except WebDriverException as ex:
+            logger.debug(f"페이지 지표 가져오기 실패 : {ex.msg}")
+            return
+
+        current = {metric["name"]: metric["value"] for metric in metrics if metric["name"] in METRICS}
+        page["metrics"] = {  # 누적 지표는 이전 페이지와의 차이 = 이 페이지에서 쓴 시간
+            name: self._delta(name, value) if name in CUMULATIVE else value for name, value in current.items()
+        }
+        self._last_metrics = current
+        self.pages.append(page)
+
+    def _delta(self, name: str, value: float) -> float:
+        previous = self._last_metrics.get(name, 0)
+        return value - previous if value >= previous else value  # 렌더러 프로세스가 바뀌면 누적값이 처음부터 다시 시작
+
+    def report(self) -> dict[str, Any]:
+        finished = [request for request in self.requests.values() if request["end"] is not None]
+        for request in finished:
+            request["ms"] = round((request["end"] - request["start"]) * 1000, 1)
+
+        domains: dict[str, dict[str, float]] = defaultdict(lambda: {"requests": 0, "bytes": 0, "ms": 0.0})
+        for request in finished:
+            host = _host(request["url"])
+            if host == "" or host == self.domain or host.endswith("." + self.domain):  # 같은 사이트, 하위 도메인
+                continue
+            domains[host]["requests"] += 1
+            domains[host]["bytes"] += request["bytes"]
+            domains[host]["ms"] += request["ms"]
+
+        blocking = {url: (kind, round(duration, 1)) for page in self.pages for url, kind, duration in page["blocking"]}
+        return {
+            "site": self.site,
+            "requests": len(self.requests),
+            "failed": sum(1 for request in finished if "error" in request),
+            "bytes": sum(request["bytes"] for request in finished),
+            "third_party_bytes": sum(domain["bytes"] for domain in domains.values()),
+            "pages": self.pages,
+            "slowest": [
+                {key: request.get(key) for key in ("url", "type", "ms", "bytes", "status", "error")}
+                for request in sorted(finished, key=lambda request: request["ms"], reverse=True)[:TOP_N]
+            ],
+            "blocking": [{"url": url, "type": kind, "ms": duration} for url, (kind, duration) in blocking.items()],
+            "third_party": dict(sorted(domains.items(), key=lambda item: item[1]["bytes"], reverse=True)),
+        }
+
+    def save(self) -> str | None:
+        report = self.report()
+        if report["requests"] == 0:
+            return None
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        name = f"trace_{self.site}_{timestamp}"
+        writer = ArtifactWriter()
+        writer.submit(f"{name}.json", json.dumps(report, ensure_ascii=False, indent=1).encode("utf-8"))
+        path = writer.submit(f"{name}.txt", format_report(report).encode("utf-8"))
+        logger.debug(f"페이지 추적 보고서 : {path}")
+        return path
+
+
+def format_report(report: dict[str, Any]) -> str:
+    lines = [
+        f"== {report['site']} ==",
+        f"요청 {report['requests']}개 (실패 {report['failed']}) / 전체 {report['bytes'] / 1024:.0f}KB"
+        f" / 외부 도메인 {report['third_party_bytes'] / 1024:.0f}KB",
+        "",
+        "-- 페이지 --",
+    ]
+    for page in report["pages"]:
+        metrics = page["metrics"]
+        lines.append(
+            f"{page['url']}\n  DOMContentLoaded {page['dcl'] or 0:.0f}ms / load {page['load'] or 0:.0f}ms"
+            f" / 스크립트 {metrics.get('ScriptDuration', 0):.2f}초 / 레이아웃 {metrics.get('LayoutDuration', 0):.2f}초"
+        )
+
+    lines += ["", f"-- 오래 걸린 요청 상위 {TOP_N}개 --"]
+    for request in report["slowest"]:
+        lines.append(f"{request['ms']:8.0f}ms {request['bytes'] / 1024:7.0f}KB  {request['type']:<10} {request['url']}")
+
+    lines += ["", "-- 렌더링을 막은 리소스 --"]
+    for entry in report["blocking"]:
+        lines.append(f"{entry['ms']:8.0f}ms  {entry['type']:<10} {entry['url']}")
+
+    lines += ["", "-- 외부 도메인 --"]
+    for host, domain in report["third_party"].items():
+        lines.append(f"{domain['requests']:4.0f}개 {domain['bytes'] / 1024:7.0f}KB {domain['ms']:8.0f}ms  {host}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,271 @@
+import atexit
+import contextlib
+import json
+import logging
+import os
+import threading
+from typing import Callable, Optional, Self
+
+import psutil
+
+from consts import PID_DIR
+
+logger = logging.getLogger("onadaily.processes")
+
+
+class TrackedProcess(object):
+    def __init__(self, pid: int, create_time: float) -> None:
+        self.pid = pid
+        self.create_time = create_time
+
+    @classmethod
+    def from_pid(cls, pid: int) -> Optional["TrackedProcess"]:
+        try:
+            return cls(pid, psutil.Process(pid).create_time())
+        except psutil.Error:
+            return None
+
+    def process(self) -> psutil.Process | None:
+        # pid 재사용 방지 : 생성 시각이 다르면 다른 프로세스
+        try:
+            proc = psutil.Process(self.pid)
+            if proc.create_time() != self.create_time:
+                return None
+            return proc
+        except psutil.Error:
+            return None
+
+    def to_dict(self) -> dict[str, float]:
+        return {"pid": self.pid, "create_time": self.create_time}
+
+
+def kill_tree(proc: psutil.Process, grace: float = 0, timeout: float = 3) -> int:
+    try:
+        procs = proc.children(recursive=True)
+    except psutil.Error:
+        procs = []
+    procs.append(proc)
+
+    if grace > 0:  # 스스로 종료될 때까지 대기
+        gone, procs = psutil.wait_procs(procs, timeout=grace)
+        if len(procs) == 0:
+            return len(gone)
+
+    return kill_processes(procs, timeout)
+
+
+def kill_processes(procs: list[psutil.Process], timeout: float = 3) -> int:
+    for p in procs:
+        try:
+            p.kill()
+        except psutil.Error:
+            pass
+
+    _, alive = psutil.wait_procs(procs, timeout=timeout)
+    for p in alive:
+        logger.debug(f"프로세스 종료 실패 : {p.pid}")
+
+    return len(procs) - len(alive)
+
+
+class ProcessRegistry(object):
+    _instance: Optional["ProcessRegistry"] = None
+    _initialized: bool
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super(ProcessRegistry, cls).__new__(cls, *args, **kwargs)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+        self._initialized = True
+
+        self._lock = threading.Lock()
+        self._tracked: dict[int, TrackedProcess] = {}
+        self._children: dict[int, dict[int, TrackedProcess]] = {}  # 등록한 pid -> 살아 있을 때 본 자식 프로세스
+        self._owner = TrackedProcess.from_pid(os.getpid())
+        self._file = os.path.join(PID_DIR, f"{os.getpid()}.json")
+
+        atexit.register(self.kill_all)
+
+    def register(self, *pids: int | None) -> None:
+        with self._lock:
+            for pid in pids:
+                if pid is None or pid in self._tracked:
+                    continue
+                if (tracked := TrackedProcess.from_pid(pid)) is None:
+                    continue
+                self._tracked[pid] = tracked
+                logger.debug(f"프로세스 등록 : {pid}")
+                self._track_children(pid)
+            self._save()
+
+    def track_children(self, *pids: int | None) -> None:
+        # 브라우저가 먼저 종료되면 남은 렌더러, crashpad 등은 자식으로 찾을 수 없으므로 살아 있을 때 기록
+        with self._lock:
+            for pid in pids:
+                if pid is not None and pid in self._tracked:
+                    self._track_children(pid)
+            self._save()
+
+    def _track_children(self, pid: int) -> None:
+        if (proc := self._tracked[pid].process()) is None:
+            return
+        try:
+            children = proc.children(recursive=True)
+        except psutil.Error:
+            return
+        known = self._children.setdefault(pid, {})
+        for child in children:
+            if child.pid not in known and (tracked := TrackedProcess.from_pid(child.pid)) is not None:
+                known[child.pid] = tracked
+
+    def kill(self, *pids: int | None, grace: float = 0) -> int:
+        killed = 0
+        with self._lock:
+            for pid in pids:
+                if pid is None or (tracked := self._tracked.pop(pid, None)) is None:
+                    continue
+                children = self._children.pop(pid, {})
+                if (proc := tracked.process()) is not None:
+                    killed += kill_tree(proc, grace)
+                orphans = [child for t in children.values() if (child := t.process()) is not None]
+                if len(orphans) > 0:  # 부모가 먼저 종료되어 남은 자식 프로세스
+                    logger.debug(f"남은 자식 프로세스 정리 : {[child.pid for child in orphans]}")
+                    killed += kill_processes(orphans)
+            self._save()
+        return killed
+
+    def kill_all(self) -> int:
+        return self.kill(*list(self._tracked))
+
+    def live_processes(self) -> list[psutil.Process]:
+        result = []
+        with self._lock:
+            tracked = list(self._tracked.values())
+
+        for t in tracked:
+            if (proc := t.process()) is None:
+                continue
+            result.append(proc)
+            try:
+                result.extend(proc.children(recursive=True))
+            except psutil.Error:
+                pass
+        return result
+
+    def _save(self) -> None:
+        if self._owner is None:
+            return
+
+        if len(self._tracked) == 0:
+            if os.path.exists(self._file):
+                os.remove(self._file)
+            return
+
+        os.makedirs(PID_DIR, exist_ok=True)
+        data = {
+            "owner": self._owner.to_dict(),
+            "processes": [t.to_dict() for t in self._tracked.values()],
+            "children": [t.to_dict() for children in self._children.values() for t in children.values()],
+        }
+        tmpfile = self._file + ".tmp"
+        with open(tmpfile, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmpfile, self._file)
+
+
+def _read_pid_file(filepath: str) -> tuple[TrackedProcess, list[TrackedProcess], list[TrackedProcess]]:
+    with open(filepath, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return (
+        TrackedProcess(**data["owner"]),
+        [TrackedProcess(**p) for p in data["processes"]],
+        [TrackedProcess(**p) for p in data.get("children", [])],
+    )
+
+
+def browser_trees() -> list[list[psutil.Process]]:
+    # 실행 중인 모든 onadaily가 띄운 크롬 (pid 파일 기준), 브라우저마다 프로세스 트리 하나
+    if not os.path.isdir(PID_DIR):
+        return []
+
+    trees = []
+    for filename in os.listdir(PID_DIR):
+        if not filename.endswith(".json"):
+            continue
+        try:
+            _, processes, _ = _read_pid_file(os.path.join(PID_DIR, filename))
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+
+        for tracked in processes:
+            if (proc := tracked.process()) is None:
+                continue
+            try:
+                trees.append([proc] + proc.children(recursive=True))
+            except psutil.Error:
+                trees.append([proc])
+    return trees
+
+
+def reap_orphans() -> int:
+    if not os.path.isdir(PID_DIR):
+        return 0
+
+    killed = 0
+    for filename in os.listdir(PID_DIR):
+        if not filename.endswith(".json"):
+            continue
+
+        filepath = os.path.join(PID_DIR, filename)
+        try:
+            owner, processes, children = _read_pid_file(filepath)
+        except (OSError, ValueError, KeyError, TypeError) as ex:
+            logger.debug(f"pid 파일 읽기 실패 : {filename} / {ex}")
+            with contextlib.suppress(FileNotFoundError):  # 다른 프로세스가 먼저 정리함
+                os.remove(filepath)
+            continue
+
+        if owner.pid == os.getpid() or owner.process() is not None:  # 실행 중인 다른 onadaily 소유
+            continue
+
+        for tracked in processes:
+            if (proc := tracked.process()) is not None:
+                logger.debug(f"남은 프로세스 정리 : {tracked.pid}")
+                killed += kill_tree(proc)
+        orphans = [proc for tracked in children if (proc := tracked.process()) is not None]
+        killed += kill_processes(orphans)
+
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(filepath)
+
+    if killed > 0:
+        logger.info(f"이전 실행에서 남은 크롬 프로세스 {killed}개 정리")
+    return killed
+
+
+class Watchdog(object):
+    def __init__(self, timeout: float, on_expire: Callable[[], None]) -> None:
+        self.timeout = timeout
+        self.expired = False
+        self._on_expire = on_expire
+        self._timer: threading.Timer | None = None
+
+    def _expire(self) -> None:
+        self.expired = True
+        logger.warning(f"제한 시간 {self.timeout}초 초과, 브라우저 강제 종료")
+        self._on_expire()
+
+    def __enter__(self) -> Self:
+        if self.timeout > 0:
+            self._timer = threading.Timer(self.timeout, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
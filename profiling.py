@@ -0,0 +1,152 @@
+# --profile : 실행 단계(모듈 불러오기, 설정, 크롬 실행, 사이트별 로그인/출첵 ...)마다 프로파일을 따로 저장
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from types import FrameType
+from typing import Iterator, Optional
+
+from consts import LOG_DIR
+
+logger = logging.getLogger("onadaily.profiling")
+
+SAMPLE_SECONDS = 0.005
+TOP_N = 15
+
+
+class _Phase(object):
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.profile = cProfile.Profile()
+        self.wall = 0.0
+        self.samples: Counter[str] = Counter()  # 접힌 스택(collapsed stack) -> 샘플 수
+        self._started: float | None = None
+
+    def resume(self) -> None:
+        self._started = time.perf_counter()
+        self.profile.enable()
+
+    def pause(self) -> None:
+        self.profile.disable()
+        if self._started is not None:
+            self.wall += time.perf_counter() - self._started
+            self._started = None
+
+
+def _collapse(frame: FrameType | None) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.splitext(os.path.basename(code.co_filename))[0]}:{code.co_qualname}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class Profiler(object):
+    # 단계는 겹치지 않음 : 안쪽 단계가 시작되면 바깥 단계는 잠시 멈춤 (cProfile은 동시에 하나만 켤 수 있음)
+    _instance: Optional["Profiler"] = None
+    _initialized: bool
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super(Profiler, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+        self._initialized = True
+
+        self.enabled = False
+        self.phases: dict[str, _Phase] = {}
+        self._stack: list[_Phase] = []
+        self._thread_id = 0
+        self._stopped = threading.Event()
+        self._sampler: threading.Thread | None = None
+
+    def start(self) -> None:
+        # 결정적 프로파일(cProfile)은 단계별 pstats로, 샘플링은 flamegraph용 접힌 스택으로
+        self.enabled = True
+        self._thread_id = threading.get_ident()
+        self._sampler = threading.Thread(target=self._sample, name="profiler", daemon=True)
+        self._sampler.start()
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(SAMPLE_SECONDS):
+            if len(self._stack) == 0:
+                continue
+            phase = self._stack[-1]
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                phase.samples[_collapse(frame)] += 1
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not self.enabled or threading.get_ident() != self._thread_id:
+            yield
+            return
+
+        if len(self._stack) > 0:
+            self._stack[-1].pause()
+        current = self.phases.setdefault(name, _Phase(name))
+        self._stack.append(current)
+        current.resume()
+        try:
+            yield
+        finally:
+            current.pause()
+            self._stack.pop()
+            if len(self._stack) > 0:
+                self._stack[-1].resume()
+
+    def finish(self) -> str | None:
+        if not self.enabled:
+            return None
+        self.enabled = False
+        self._stopped.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        while len(self._stack) > 0:
+            self._stack.pop().pause()
+
+        dirname = os.path.join(LOG_DIR, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        os.makedirs(dirname, exist_ok=True)
+        for phase in self.phases.values():
+            filename = os.path.join(dirname, phase.name.replace("/", "_"))
+            phase.profile.dump_stats(filename + ".pstats")
+            with open(filename + ".collapsed", "w", encoding="utf-8") as f:
+                for stack, count in phase.samples.items():
+                    f.write(f"{phase.name};{stack} {count}\n")
+
+        self.print_summary()  # 요약은 stderr로 (--output ndjson 에서 stdout은 결과만)
+        print(f"프로파일 저장됨 : {dirname}", file=sys.stderr)
+        return dirname
+
+    def print_summary(self, top: int = TOP_N) -> None:
+        phases = [phase for phase in self.phases.values() if phase.wall > 0]
+        if len(phases) == 0:
+            return
+
+        print("======단계별 시간======", file=sys.stderr)
+        for phase in sorted(phases, key=lambda phase: phase.wall, reverse=True):
+            print(f"{phase.wall:8.2f}초  {phase.name}", file=sys.stderr)
+
+        stats = pstats.Stats(phases[0].profile)
+        for phase in phases[1:]:
+            stats.add(phase.profile)
+
+        print(f"======자체 시간 상위 {top}개 함수======", file=sys.stderr)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)  # type: ignore[attr-defined]
+        for (filename, line, func), (_, calls, tottime, cumtime, _) in rows[:top]:
+            location = f"{os.path.basename(filename)}:{line}"
+            print(f"{tottime:8.2f}초 (누적 {cumtime:6.2f}초, {calls}회)  {func}  {location}", file=sys.stderr)
+
+
+def phase(name: str):
+    return Profiler().phase(name)
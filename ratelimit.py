@@ -0,0 +1,113 @@
+import logging
+import random
+import sqlite3
+import threading
+import time
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from config import Options
+from consts import RATELIMIT_FILE
+from errors import ConfigError
+
+logger = logging.getLogger("onadaily.ratelimit")
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS buckets (domain TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+
+
+class Limit(NamedTuple):
+    rate: float  # 초당 요청 수, 0 이면 제한 없음
+    burst: float  # 한 번에 몰아서 보낼 수 있는 요청 수
+    jitter: float  # 요청마다 더할 임의 지연(초) 최대값
+
+
+DEFAULT_LIMIT = Limit(rate=1.0, burst=5, jitter=0.0)
+
+
+def _domain(url: str) -> str:
+    return (urlsplit(url).hostname or "").removeprefix("www.")
+
+
+class RateLimiter(object):
+    # 사이트 도메인마다 토큰 버킷 하나, 상태는 sqlite 파일에 두고 여러 프로세스(계정)가 같이 사용
+    _instance: Optional["RateLimiter"] = None
+    _initialized: bool
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super(RateLimiter, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, limits: dict[str, Limit] | None = None, path: str = RATELIMIT_FILE) -> None:
+        if limits is not None:
+            self.limits = limits  # 도메인 -> 제한
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+        self._initialized = True
+
+        self.limits = limits or {}
+        self.path = path
+        self.waited = 0.0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    @classmethod
+    def from_options(cls, options: Options) -> "RateLimiter":
+        # common.ratelimit 의 rate, burst, jitter 를 모든 사이트에, sites 아래 사이트 이름으로 덮어쓰기
+        config = options.common.ratelimit
+        overrides = config.get("sites") or {}
+        limits = {}
+        try:
+            default = DEFAULT_LIMIT._replace(**{key: float(config[key]) for key in Limit._fields if key in config})
+            for site in options.sites:
+                override = overrides.get(site.name) or {}
+                limits[_domain(site.main_url)] = default._replace(**{key: float(override[key]) for key in override})
+        except (TypeError, ValueError) as ex:
+            raise ConfigError(f"ratelimit 설정 오류 : {ex}") from ex
+        return cls(limits)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(SCHEMA)
+        return self._conn
+
+    def reserve(self, url: str) -> float:
+        # 요청 하나를 예약하고 기다려야 할 시간을 반환. 토큰이 없으면 미리 빌려 쓰고(음수) 그만큼 기다림
+        domain = _domain(url)
+        limit = self.limits.get(domain)
+        if limit is None or limit.rate <= 0:
+            return 0.0
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("BEGIN IMMEDIATE")  # 다른 프로세스와 같은 토큰을 쓰지 않도록
+                try:
+                    now = time.time()
+                    row = conn.execute("SELECT tokens, updated FROM buckets WHERE domain = ?", (domain,)).fetchone()
+                    tokens = limit.burst if row is None else min(limit.burst, row[0] + (now - row[1]) * limit.rate)
+                    tokens -= 1
+                    conn.execute(
+                        "INSERT OR REPLACE INTO buckets (domain, tokens, updated) VALUES (?, ?, ?)",
+                        (domain, tokens, now),
+                    )
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as ex:  # 제한 때문에 출석 체크가 실패하지 않도록
+            logger.debug(f"요청 제한 확인 실패 : {ex}")
+            return 0.0
+
+        delay = max(0.0, -tokens / limit.rate) + random.uniform(0, limit.jitter)
+        if delay > 0:
+            logger.debug(f"{domain} 요청 대기 : {delay:.2f}초")
+        return delay
+
+    def wait(self, url: str) -> float:
+        if (delay := self.reserve(url)) > 0:
+            time.sleep(delay)
+            self.waited += delay
+        return delay
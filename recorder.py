@@ -0,0 +1,153 @@
+import base64
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from selenium.common.exceptions import WebDriverException
+
+from consts import RECORDING_DIR
+
+if TYPE_CHECKING:
+    from config import Site
+    from webdriverwrapper import WebDriverWrapper
+
+logger = logging.getLogger("onadaily.recorder")
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+KEPT_HEADERS = ("content-type", "location")  # 재현에 필요한 헤더만 저장 (쿠키 등은 저장하지 않음)
+BUFFER_PARAMS = {"maxTotalBufferSize": 200 * 1024 * 1024, "maxResourceBufferSize": MAX_BODY_BYTES}
+
+
+def _headers(headers: dict[str, Any]) -> dict[str, str]:
+    return {key.lower(): str(value) for key, value in headers.items() if key.lower() in KEPT_HEADERS}
+
+
+class Recorder(object):
+    # 사이트 하나를 체크하는 동안 불러온 응답(문서, 스크립트, 이미지 ...), 얼럿, WebDriver 명령 순서를 기록
+    def __init__(self, site: "Site") -> None:
+        self.started = datetime.now().astimezone()
+        self.id = f"{site.name}_{self.started.strftime('%Y%m%d_%H%M%S')}"
+        self.site = site.name
+        self.login = site.login
+        self.path = os.path.join(RECORDING_DIR, self.id)
+
+        self.entries: list[dict[str, Any]] = []
+        self.alerts: list[dict[str, Any]] = []
+        self.commands: list[dict[str, Any]] = []
+        self._pending: dict[str, dict[str, Any]] = {}  # requestId -> 본문을 아직 가져오지 않은 응답
+        self._bodies: dict[int, bytes] = {}
+        self._flushing = False
+        self._monotonic = time.monotonic()
+
+    def _offset(self) -> float:
+        return round(time.monotonic() - self._monotonic, 3)
+
+    def attach(self, driver: "WebDriverWrapper") -> None:
+        driver.recorder = self
+        driver.event_listeners.append(self.handle_event)
+        try:
+            driver.execute_cdp_cmd("Network.enable", BUFFER_PARAMS)  # 페이지를 옮겨도 본문을 가져올 수 있도록
+            driver.performance_events()  # 이전 사이트 이벤트는 버림
+        except WebDriverException as ex:
+            logger.debug(f"기록 준비 실패 : {ex.msg}")
+
+    def detach(self, driver: "WebDriverWrapper") -> None:
+        try:
+            if not driver.quited:
+                self.flush(driver)
+        finally:
+            driver.recorder = None
+            if self.handle_event in driver.event_listeners:
+                driver.event_listeners.remove(self.handle_event)
+        self.save()
+
+    def command(self, name: str, elapsed: float, error: str | None = None) -> None:
+        # 입력값(비밀번호 등)이 남지 않도록 명령 이름만 기록
+        if self._flushing:
+            return
+        self.commands.append({"offset": self._offset(), "command": name, "elapsed": round(elapsed, 4), "error": error})
+
+    def handle_event(self, event: dict[str, Any]) -> None:
+        method = event["method"]
+        params = event.get("params", {})
+        request_id = params.get("requestId", "")
+        match method:
+            case "Network.requestWillBeSent":
+                if "redirectResponse" in params:  # 같은 requestId로 이어지는 리다이렉트
+                    self._add_entry(params["request"]["method"], params["redirectResponse"], params.get("type", ""))
+                self._pending[request_id] = {"method": params["request"]["method"], "type": params.get("type", "")}
+            case "Network.responseReceived" if request_id in self._pending:
+                request = self._pending[request_id]
+                request["entry"] = self._add_entry(request["method"], params["response"], request["type"])
+            case "Network.loadingFinished" if request_id in self._pending:
+                self._pending[request_id]["finished"] = True
+            case "Network.loadingFailed":
+                self._pending.pop(request_id, None)
+            case "Page.javascriptDialogOpening":
+                self.alerts.append({"offset": self._offset(), "type": params.get("type"), "message": params["message"]})
+
+    def _add_entry(self, method: str, response: dict[str, Any], resource_type: str) -> int | None:
+        if not response["url"].startswith("http"):  # data:, blob: 등
+            return None
+        self.entries.append(
+            {
+                "offset": self._offset(),
+                "method": method,
+                "url": response["url"],
+                "status": response["status"],
+                "type": resource_type,
+                "headers": _headers(response.get("headers", {})),
+                "body": None,
+            }
+        )
+        return len(self.entries) - 1
+
+    def flush(self, driver: "WebDriverWrapper") -> None:
+        # 본문은 얼럿이 없을 때만 가져옴 (얼럿이 떠 있으면 크롬 드라이버가 얼럿을 닫아버림)
+        self._flushing = True
+        try:
+            driver.performance_events()
+            for request_id, request in list(self._pending.items()):
+                if not request.get("finished"):
+                    continue
+                del self._pending[request_id]
+                if (index := request.get("entry")) is None:
+                    continue
+                try:
+                    body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                except WebDriverException as ex:
+                    logger.debug(f"본문 가져오기 실패 ({self.entries[index]['url']}) : {ex.msg}")
+                    continue
+                data = base64.b64decode(body["body"]) if body["base64Encoded"] else body["body"].encode("utf-8")
+                if len(data) <= MAX_BODY_BYTES:
+                    self._bodies[index] = data
+        except WebDriverException as ex:
+            logger.debug(f"기록 중 오류 : {ex.msg}")
+        finally:
+            self._flushing = False
+
+    def save(self) -> str:
+        bodies = os.path.join(self.path, "bodies")
+        os.makedirs(bodies, exist_ok=True)
+        for index, data in self._bodies.items():
+            with open(os.path.join(bodies, str(index)), "wb") as f:
+                f.write(data)
+            self.entries[index]["body"] = f"bodies/{index}"
+
+        manifest = {
+            "id": self.id,
+            "site": self.site,
+            "login": self.login,
+            "recorded_at": self.started.isoformat(),
+            "entries": self.entries,
+            "alerts": self.alerts,
+            "commands": self.commands,
+        }
+        with open(os.path.join(self.path, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+        logger.debug(f"기록 저장 : {self.path} (응답 {len(self.entries)}, 본문 {len(self._bodies)})")
+        return self.path
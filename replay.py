@@ -0,0 +1,317 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, NamedTuple, Self
+from urllib.parse import urlsplit, urlunsplit
+
+from config import Options, Site
+from consts import RECORDING_DIR
+
+if TYPE_CHECKING:
+    from onadaily import Onadaily
+
+logger = logging.getLogger("onadaily.replay")
+
+TEXT_TYPES = ("text/", "javascript", "json", "xml")  # 주소를 바꿔서 보내는 응답
+OFFLINE_RULES = "--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE 127.0.0.1"
+
+
+class Fault(NamedTuple):
+    # url(정규식)과 일치하는 요청에 넣을 장애, times가 0 이면 매번
+    url: str
+    latency: float = 0  # 응답 전 지연(초)
+    drop: bool = False  # 응답 없이 연결 끊기
+    status: int | None = None  # 기록된 응답 대신 보낼 오류 코드 (5xx 등)
+    remove: str | None = None  # HTML에서 지울 요소 (CSS 선택자)
+    alert: str | None = None  # HTML에 넣을 얼럿 문구
+    times: int = 0
+
+    def apply(self, body: bytes) -> bytes:
+        if self.remove is None and self.alert is None:
+            return body
+
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(body, "html.parser")
+        if self.remove is not None:
+            for element in soup.select(self.remove):
+                element.decompose()
+        if self.alert is not None:
+            script = soup.new_tag("script")
+            script.string = f"alert({json.dumps(self.alert)});"
+            (soup.head or soup.body or soup).insert(0, script)
+        return str(soup).encode("utf-8")
+
+
+class Recording(NamedTuple):
+    id: str
+    path: str
+    site: str
+    login: str
+    recorded_at: datetime
+    entries: list[dict[str, Any]]
+    alerts: list[dict[str, Any]]
+    commands: list[dict[str, Any]]
+
+    @classmethod
+    def load(cls, recording_id: str) -> "Recording":
+        path = recording_id if os.path.isdir(recording_id) else os.path.join(RECORDING_DIR, recording_id)
+        with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return cls(
+            id=manifest["id"],
+            path=path,
+            site=manifest["site"],
+            login=manifest["login"],
+            recorded_at=datetime.fromisoformat(manifest["recorded_at"]),
+            entries=manifest["entries"],
+            alerts=manifest["alerts"],
+            commands=manifest["commands"],
+        )
+
+    def body(self, entry: dict[str, Any]) -> bytes:
+        if entry["body"] is None:
+            return b""
+        with open(os.path.join(self.path, entry["body"]), "rb") as f:
+            return f.read()
+
+
+def _origin(url: str) -> str:
+    return urlunsplit(urlsplit(url)[:2] + ("", "", ""))
+
+
+def _target(url: str) -> str:
+    parts = urlsplit(url)
+    return parts.path + ("?" + parts.query if parts.query else "")
+
+
+class ReplayServer(object):
+    # 기록된 출처(origin)마다 로컬 포트를 하나씩 열어 기록된 응답을 순서대로 돌려줌
+    def __init__(self, recording: Recording, faults: list[Fault] | None = None) -> None:
+        self.recording = recording
+        self.faults = faults or []
+        self.injected: list[str] = []
+        self._fault_counts: list[int] = []
+        self.origins: dict[str, str] = {}  # 원래 출처 -> 로컬 주소
+        self._servers: list[ThreadingHTTPServer] = []
+        self._responses: dict[tuple[str, str, str], deque[dict[str, Any]]] = {}
+        self._paths: dict[tuple[str, str, str], deque[dict[str, Any]]] = {}  # 쿼리가 달라진 요청용 (캐시 방지 값 등)
+        self._lock = threading.Lock()
+        self.misses: list[str] = []
+
+        for entry in recording.entries:
+            self.origins.setdefault(_origin(entry["url"]), "")
+        self.rewind()
+
+    def rewind(self) -> None:
+        # 다시 처음 응답부터, 장애 횟수도 처음부터
+        with self._lock:
+            self._fault_counts = [0] * len(self.faults)
+            self.injected.clear()
+            self.misses.clear()
+            self._responses.clear()
+            self._paths.clear()
+            for entry in self.recording.entries:
+                origin = _origin(entry["url"])
+                target = _target(entry["url"])
+                self._responses.setdefault((origin, entry["method"], target), deque()).append(entry)
+                self._paths.setdefault((origin, entry["method"], urlsplit(target).path), deque()).append(entry)
+
+    def start(self) -> Self:
+        for origin in self.origins:
+            server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(self, origin))
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name=f"replay-{origin}", daemon=True).start()
+            self._servers.append(server)
+            self.origins[origin] = f"http://127.0.0.1:{server.server_address[1]}"
+            logger.debug(f"재현 서버 : {origin} -> {self.origins[origin]}")
+        return self
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers.clear()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def local(self, url: str) -> str:
+        origin = _origin(url)
+        if origin not in self.origins:
+            return url
+        return self.origins[origin] + url[len(origin) :]  # noqa: E203
+
+    def rewrite(self, data: bytes) -> bytes:
+        # 응답 안의 절대 주소를 로컬 주소로 (//host 형식 포함)
+        text = data.decode("utf-8", errors="surrogateescape")
+        for origin, local in self.origins.items():
+            host = re.escape(urlsplit(origin).netloc)
+            text = re.sub(rf"(?:https?:)?//{host}(?![\w.-])", local, text)
+        return text.encode("utf-8", errors="surrogateescape")
+
+    def response(self, origin: str, method: str, target: str) -> dict[str, Any] | None:
+        # 같은 요청은 기록된 순서대로, 마지막 응답은 계속 반복
+        with self._lock:
+            for key, table in (
+                ((origin, method, target), self._responses),
+                ((origin, method, urlsplit(target).path), self._paths),
+            ):
+                if (queue := table.get(key)) is not None:
+                    return queue.popleft() if len(queue) > 1 else queue[0]
+            self.misses.append(f"{method} {origin}{target}")
+        return None
+
+    def fault(self, url: str) -> Fault | None:
+        with self._lock:
+            for index, fault in enumerate(self.faults):
+                if not re.search(fault.url, url):
+                    continue
+                if fault.times > 0 and self._fault_counts[index] >= fault.times:
+                    continue
+                self._fault_counts[index] += 1
+                self.injected.append(url)
+                return fault
+        return None
+
+    def localize(self, site: Site) -> None:
+        # 사이트 주소는 로컬 서버로, 아이디와 비밀번호는 가짜 값으로 (키링, 설정 파일을 건드리지 않음)
+        site.main_url = self.local(site.main_url)
+        site.login_url = self.local(site.login_url)
+        site.stamp_url = self.local(site.stamp_url)
+        site.enable = True
+        site.login = self.recording.login
+        if site.login == "default":
+            site.id = "replay"
+            site.password = "replay"
+
+
+def _handler(server: ReplayServer, origin: str) -> type[BaseHTTPRequestHandler]:
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def _reply(self) -> None:
+            if (length := int(self.headers.get("Content-Length") or 0)) > 0:
+                self.rfile.read(length)
+
+            fault = server.fault(origin + self.path)
+            if fault is not None:
+                logger.debug(f"장애 : {fault} / {self.command} {origin}{self.path}")
+                time.sleep(fault.latency)
+                if fault.drop:
+                    self.close_connection = True
+                    return
+                if fault.status is not None:
+                    self.send_error(fault.status)
+                    return
+
+            entry = server.response(origin, self.command, self.path)
+            if entry is None:
+                self.send_error(404)
+                return
+
+            body = server.recording.body(entry)
+            content_type = entry["headers"].get("content-type", "")
+            if any(kind in content_type for kind in TEXT_TYPES):
+                body = server.rewrite(body)
+            if fault is not None and "html" in content_type:
+                body = fault.apply(body)
+
+            self.send_response(entry["status"])
+            for key, value in entry["headers"].items():
+                self.send_header(key, server.local(value) if key == "location" else value)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        do_GET = do_POST = do_HEAD = _reply  # noqa: N815
+
+        def log_message(self, format: str, *args) -> None:
+            logger.debug(f"replay : {format % args}")
+
+    return ReplayHandler
+
+
+def run_replay(options: Options, recording_id: str, repeat: int = 1) -> int:
+    # 기록된 응답만으로 Onadaily.check를 다시 실행하고 걸린 시간, 명령 수를 비교
+    import utils
+    from artifacts import ArtifactWriter
+
+    recording = Recording.load(recording_id)
+    site = next((site for site in options.sites if site.name == recording.site), None)
+    if site is None:
+        print(f"알 수 없는 사이트 : {recording.site}")
+        return 1
+
+    print(f"== {recording.id} 재현 ({recording.site}, 응답 {len(recording.entries)}개) ==")
+    utils.frozen_now = recording.recorded_at  # 출석 달력의 오늘 날짜를 기록한 날짜로
+
+    with ReplayServer(recording) as server:
+        main = replay_onadaily(options, server, site)
+
+        try:
+            exitcode = _replay(main, server, site, repeat)
+        finally:
+            main.outbox.close()
+            ArtifactWriter().close()
+
+        if len(server.misses) > 0:
+            print(f"기록에 없는 요청 {len(server.misses)}개 :")
+            for miss in dict.fromkeys(server.misses):
+                print(f"  {miss}")
+
+    return exitcode
+
+
+def replay_onadaily(options: Options, server: ReplayServer, site: Site) -> "Onadaily":
+    # 기록된 사이트만 로컬 서버로, 다른 사이트와 알림, 대기 시간 기록은 사용하지 않음
+    from onadaily import Onadaily
+
+    server.localize(site)
+    for other in options.sites:
+        if other != site:
+            other.enable = False
+    options.common.prefetch = False
+    options.common.notify = []
+
+    main = Onadaily()
+    main.latency = None  # 기록된 대기 시간으로 바뀌지 않도록 항상 waittime 사용
+    main.ratelimiter.limits = {}  # 로컬 서버에는 요청 제한 없음
+    main.chrome_arguments.append(OFFLINE_RULES)
+    return main
+
+
+def _replay(main: "Onadaily", server: ReplayServer, site: Site, repeat: int) -> int:
+    from utils import save_log_error
+
+    exitcode = 0
+    for index in range(repeat):
+        server.rewind()
+        driver = main.initdriver()
+        commands = driver.command_count
+        started = time.monotonic()
+        try:
+            result = main.check(driver, site)
+        finally:
+            elapsed = time.monotonic() - started
+            commands = driver.command_count - commands
+            driver.quit()
+
+        print(
+            f"[{index + 1}/{repeat}] {result.outcome} / {elapsed:.2f}초 / "
+            f"명령 {commands}개 (기록 {len(server.recording.commands)}개)"
+        )
+        if not result.passed:
+            exitcode = 1
+            if site in main.last_exceptions:
+                print(f"로그 저장됨: {save_log_error(main.last_exceptions.pop(site))}")
+    return exitcode
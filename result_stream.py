@@ -0,0 +1,15 @@
+import json
+import threading
+from typing import Any, TextIO
+
+
+class NdjsonWriter(object):
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def write(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()  # 사이트가 끝날 때마다 바로 전달
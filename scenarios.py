@@ -0,0 +1,130 @@
+import logging
+import time
+from typing import Any, NamedTuple
+
+import yaml
+from prettytable import PrettyTable
+
+from config import Options
+from errors import ConfigError
+from replay import Fault, Recording, ReplayServer, replay_onadaily
+from result_stream import NdjsonWriter
+
+logger = logging.getLogger("onadaily.scenarios")
+
+# 시나리오 파일 예시
+# recording: onami_20261019_093000
+# scenarios:
+#   - name: baseline
+#   - name: slow_login
+#     options: {waittime: 3, retrytime: 2}
+#     faults:
+#       - {url: "/member/login", latency: 4, times: 1}
+#       - {url: "attend", status: 503}
+
+
+class Scenario(NamedTuple):
+    name: str
+    faults: list[Fault]
+    options: dict[str, Any]  # common 옵션 덮어쓰기 (waittime, retrytime, autoretry ...)
+
+
+class ScenarioResult(NamedTuple):
+    name: str
+    passed: bool
+    outcome: str | None
+    elapsed: float  # 전체 소요 시간
+    attempts: int
+    wasted_wait: float  # 시간 초과로 끝난 대기 시간 합계
+    injected: int  # 장애를 넣은 요청 수
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"type": "scenario", **self._asdict()}
+
+
+def load_scenarios(path: str) -> tuple[str, list[Scenario]]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+
+    try:
+        scenarios = [
+            Scenario(
+                name=str(scenario["name"]),
+                faults=[Fault(**fault) for fault in scenario.get("faults") or []],
+                options=dict(scenario.get("options") or {}),
+            )
+            for scenario in data["scenarios"]
+        ]
+        return str(data["recording"]), scenarios
+    except (KeyError, TypeError) as ex:
+        raise ConfigError(f"시나리오 파일 오류 : {ex}") from ex
+
+
+def run_scenario(options: Options, server: ReplayServer, scenario: Scenario) -> ScenarioResult:
+    # Onadaily.stamp_all(재시도 포함)을 그대로 실행하고 시간, 시도 횟수, 버린 대기 시간을 측정
+    from metrics import WASTED_WAIT_SECONDS
+
+    site = next(site for site in options.sites if site.name == server.recording.site)
+    for key, value in scenario.options.items():
+        setattr(options.common, key, value)
+    server.faults = scenario.faults
+    server.rewind()
+
+    main = replay_onadaily(options, server, site)
+    wasted = WASTED_WAIT_SECONDS.total()
+    started = time.monotonic()
+    try:
+        attempts = main.stamp_all()
+    finally:
+        main.outbox.close()
+        for key in scenario.options:
+            delattr(options.common, key)
+
+    result = main.passed[site]
+    return ScenarioResult(
+        name=scenario.name,
+        passed=result.passed,
+        outcome=result.outcome,
+        elapsed=round(time.monotonic() - started, 2),
+        attempts=attempts,
+        wasted_wait=round(WASTED_WAIT_SECONDS.total() - wasted, 2),
+        injected=len(server.injected),
+    )
+
+
+def run_scenarios(options: Options, path: str, resultstream: NdjsonWriter | None = None) -> int:
+    import utils
+    from artifacts import ArtifactWriter
+
+    recording_id, scenarios = load_scenarios(path)
+    recording = Recording.load(recording_id)
+    utils.frozen_now = recording.recorded_at
+
+    results: list[ScenarioResult] = []
+    with ReplayServer(recording) as server:
+        try:
+            for scenario in scenarios:
+                print(f"=== 시나리오 : {scenario.name} ===")
+                result = run_scenario(options, server, scenario)
+                results.append(result)
+                if resultstream is not None:
+                    resultstream.write(result.to_dict())
+        finally:
+            ArtifactWriter().close()
+
+    table = PrettyTable()
+    table.field_names = ["시나리오", "결과", "소요 시간", "시도", "버린 대기 시간", "장애 요청"]
+    for result in results:
+        table.add_row(
+            [
+                result.name,
+                result.outcome,
+                f"{result.elapsed:.1f}초",
+                result.attempts,
+                f"{result.wasted_wait:.1f}초",
+                result.injected,
+            ]
+        )
+    print(table)
+
+    return 0 if all(result.passed for result in results) else 1
@@ -0,0 +1,93 @@
+import logging
+
+from selenium.common.exceptions import WebDriverException
+
+from config import Options, Site
+from errors import SelectorBrokenError
+from result_stream import NdjsonWriter
+from webdriverwrapper import WebDriverWrapper
+
+logger = logging.getLogger("onadaily.selector_probe")
+
+# 선택자 이름 -> (종류, 선택자)
+Selectors = dict[str, tuple[str, str]]
+
+
+def login_page_selectors(site: Site) -> Selectors:
+    if site.login_window is not None:  # 아이디, 비밀번호 입력칸은 로그인 창에 있음
+        return {"login_window": ("xpath", site.login_window)}
+
+    selectors: Selectors = {}
+    if site.login == "default":
+        selectors["input_id"] = ("xpath", site.input_id)
+        selectors["input_pwd"] = ("xpath", site.input_pwd)
+    if site.btn_login is not None:
+        selectors[f"login_buttons.{site.login}"] = ("xpath", site.btn_login)
+    return selectors
+
+
+def stamp_page_selectors(site: Site) -> Selectors:
+    return {"stamp_calendar": ("css", site.stamp_calendar)}
+
+
+def stamp_button_selectors(site: Site) -> Selectors:
+    # 이미 출석한 날은 출첵 버튼이 없을 수 있으므로 이미 출석했는지 확인한 뒤에 확인
+    return {"btn_stamp": ("xpath", site.btn_stamp)}
+
+
+def main_page_selectors(site: Site) -> Selectors:
+    if site.hotdeal_table is None:
+        return {}
+    return {"hotdeal_table": ("css", site.hotdeal_table)}
+
+
+def check_page(driver: WebDriverWrapper, page: str, selectors: Selectors) -> None:
+    # 현재 페이지의 선택자를 한 번에 확인, 페이지를 다 불러왔는데 하나라도 없으면 SelectorBrokenError
+    # 페이지를 다 불러오지 못하면 TimeoutException (재시도 가능한 LoginFailedError, StampFailedError로 처리)
+    if len(selectors) == 0:
+        return
+
+    missing = driver.probe_selectors(selectors, f"probe_{page}")
+    if len(missing) > 0:
+        raise SelectorBrokenError(page, missing)
+
+
+def run_probe(options: Options, resultstream: NdjsonWriter | None = None) -> int:
+    # 로그인 없이 볼 수 있는 페이지(메인, 로그인)의 선택자만 확인
+    from utils import get_chrome_options
+
+    exitcode = 0
+    with WebDriverWrapper(get_chrome_options(options.common.headless), options.common.waittime) as driver:
+        for site in options.common.order:
+            if not site.enable:
+                continue
+
+            print(f"== {site.name} ==")
+            broken: dict[str, list[str]] = {}
+            for page, url, selectors in [
+                ("main_url", site.main_url, main_page_selectors(site)),
+                ("login_url", site.login_url, login_page_selectors(site)),
+            ]:
+                if len(selectors) == 0:
+                    continue
+
+                driver.current_site = site.name
+                try:
+                    driver.get(url)
+                    check_page(driver, page, selectors)
+                except SelectorBrokenError as e:
+                    print(f"❌ {e}")
+                    broken[page] = e.missing
+                except WebDriverException as e:
+                    print(f"❌ {page} 불러오기 실패 : {e.msg}")
+                    broken[page] = []
+
+            if len(broken) == 0:
+                print("✅ 선택자 정상")
+            else:
+                exitcode = 1
+
+            if resultstream is not None:
+                resultstream.write({"type": "probe", "site": site.name, "passed": len(broken) == 0, "missing": broken})
+
+    return exitcode
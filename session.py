@@ -0,0 +1,162 @@
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config import Options, Site
+from consts import SESSION_FILE_NAME
+from errors import LoginFailedError, SelectorBrokenError
+from webdriverwrapper import WebDriverWrapper
+
+logger = logging.getLogger("onadaily.session")
+
+ENROLL_WAIT_SECONDS = 600  # 사용자가 직접 로그인하는 시간
+COOKIE_PARAMS = (  # Network.getAllCookies 결과 중 Network.setCookies에 넘길 항목
+    "name",
+    "value",
+    "domain",
+    "path",
+    "secure",
+    "httpOnly",
+    "sameSite",
+    "expires",
+    "priority",
+    "sourceScheme",
+    "sourcePort",
+)
+
+
+def social_sites(options: Options) -> list[Site]:
+    return [site for site in options.common.order if site.enable and site.login != "default"]
+
+
+def enrolled() -> bool:
+    return os.path.isfile(SESSION_FILE_NAME)
+
+
+def load_session() -> dict[str, Any] | None:
+    try:
+        with open(SESSION_FILE_NAME, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as ex:
+        logger.debug(f"세션 파일 불러오기 실패 : {ex}")
+        return None
+
+
+def export_session(driver: WebDriverWrapper, sites: list[Site]) -> int:
+    # 소셜 로그인 제공자(구글, 카카오, 네이버 ...) 쿠키까지 모두 저장, 비밀번호와 같으므로 본인만 읽을 수 있게
+    cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+    session = load_session() or {"sites": {}}
+    session["created"] = time.time()
+    session["sites"].update({site.name: site.login for site in sites})
+    session["cookies"] = [{key: cookie[key] for key in COOKIE_PARAMS if key in cookie} for cookie in cookies]
+
+    fd = os.open(SESSION_FILE_NAME + ".tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(session, f, ensure_ascii=False)
+    os.replace(SESSION_FILE_NAME + ".tmp", SESSION_FILE_NAME)
+    return len(cookies)
+
+
+def import_session(driver: WebDriverWrapper) -> int:
+    # 프로필에 없는 쿠키만 넣음 (프로필 쪽이 더 최신일 수 있음), 만료된 쿠키는 제외
+    if (session := load_session()) is None:
+        return 0
+
+    now = time.time()
+    try:
+        existing = {
+            (cookie["domain"], cookie["path"], cookie["name"])
+            for cookie in driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        }
+        missing = [
+            cookie
+            for cookie in session["cookies"]
+            if (cookie["domain"], cookie["path"], cookie["name"]) not in existing
+            and (cookie.get("expires", -1) <= 0 or cookie["expires"] > now)
+        ]
+        if len(missing) > 0:
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": missing})
+    except WebDriverException as ex:
+        logger.debug(f"세션 쿠키 넣기 실패 : {ex.msg}")
+        return 0
+
+    logger.debug(f"세션 쿠키 {len(missing)}개 넣음")
+    return len(missing)
+
+
+def _enroll_site(driver: WebDriverWrapper, site: Site) -> bool:
+    from strategies import get_login_strategy
+
+    print(f"== {site.name} ({site.login}) ==")
+    strategy = get_login_strategy(site)
+    try:
+        if strategy.start_login(driver, site):
+            print("✅ 이미 로그인 되어 있습니다.")
+            return True
+    except (LoginFailedError, SelectorBrokenError) as e:
+        print(f"❌ 로그인 페이지 열기 실패 : {e}")
+        return False
+
+    print(f"브라우저에서 {site.login} 로그인을 마쳐 주세요. ({ENROLL_WAIT_SECONDS // 60}분 안에)")
+    try:
+        main_window_handle = strategy.main_window_handle
+        WebDriverWait(driver, ENROLL_WAIT_SECONDS, 1).until(lambda _: _logined(driver, main_window_handle, site))
+    except TimeoutException:
+        print("❌ 로그인 시간 초과")
+        return False
+
+    print("✅ 로그인 확인")
+    return True
+
+
+def _logined(driver: WebDriverWrapper, main_window_handle: str, site: Site) -> bool:
+    # 로그인 창을 사용자가 닫거나 옮겨도 원래 창에서 확인
+    try:
+        if driver.current_window_handle != main_window_handle:
+            driver.switch_to.window(main_window_handle)
+        return driver.check_logined(site)
+    except WebDriverException:
+        return False
+
+
+def enroll(options: Options, names: list[str] | None = None) -> int:
+    # 창을 띄워 소셜 로그인을 한 번 직접 하고, 로그인 정보(프로필, 쿠키)를 저장. 이후에는 headless로 실행 가능
+    from utils import get_chrome_options
+
+    sites = [site for site in social_sites(options) if not names or site.name in names]
+    if len(sites) == 0:
+        print("소셜 로그인을 사용하는 사이트가 없습니다.")
+        return 0
+
+    passed = []
+    with WebDriverWrapper(get_chrome_options(headless=False), options.common.waittime, usedatadir=True) as driver:
+        for site in sites:
+            driver.current_site = site.name
+            if _enroll_site(driver, site):
+                passed.append(site)
+
+        if len(passed) > 0:
+            count = export_session(driver, passed)
+            print(f"로그인 정보 저장됨 : {os.path.abspath(SESSION_FILE_NAME)} (쿠키 {count}개)")
+            print("⚠️ 이 파일이 있으면 누구나 로그인할 수 있습니다. 다른 사람과 공유하지 마세요.")
+
+    return 0 if len(passed) == len(sites) else 1
+
+
+def prompt_enroll(options: Options, sites: list[Site]) -> bool:
+    # 대화형 실행일 때만 창을 띄워 다시 로그인할지 물어봄
+    names = ", ".join(site.name for site in sites)
+    print(f"⚠️ 로그인 정보가 없거나 만료되었습니다 : {names}")
+    if not sys.stdin.isatty():
+        print("`onadaily enroll` 로 다시 로그인하세요.")
+        return False
+
+    if input("지금 브라우저를 열어 로그인하시겠습니까? (y/N) ").strip().lower() != "y":
+        return False
+    return enroll(options, [site.name for site in sites]) == 0
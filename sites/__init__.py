@@ -0,0 +1,12 @@
+from sites import banana, dingdong, domae, onami, showdang
+from sites.spec import SiteSpec
+
+# 사이트 정의는 여기서 한 번만 모음. 사이트를 추가하면 모듈을 만들고 이 목록에 추가
+SITE_SPECS: dict[str, SiteSpec] = {
+    spec.name: spec for spec in [onami.SPEC, showdang.SPEC, banana.SPEC, dingdong.SPEC, domae.SPEC]
+}
+SITE_NAMES = list(SITE_SPECS)
+
+
+def get_spec(name: str) -> SiteSpec:
+    return SITE_SPECS[name]
@@ -0,0 +1,39 @@
+from typing import TYPE_CHECKING
+
+from sites.spec import SiteSpec
+
+if TYPE_CHECKING:
+    from strategies import BaseLoginStrategy
+
+
+def login_strategy() -> "BaseLoginStrategy":
+    from sites.banana_strategies import BananaLoginStrategy
+
+    return BananaLoginStrategy()
+
+
+SPEC = SiteSpec(
+    name="banana",
+    main_url="https://www.bananamall.co.kr/",
+    login_url="https://www.bananamall.co.kr/",
+    stamp_url="https://www.bananamall.co.kr/etc/attendance.php",
+    input_id="//*[@name='id']",
+    input_pwd="//*[@name='passwd']",
+    login_check="//a[@title='로그아웃']",
+    login_buttons={
+        "default": "//a[contains(@onclick, 'loginch')]",
+        "google": "//a[contains(@onclick, 'google_login')]/img",
+        "naver": "//a[contains(@onclick, 'naver_login')]/img",
+        "facebook": "//a[contains(@href, 'facebook_login')]/img",
+        "twitter": "//a[contains(@onclick, 'twitter_login')]/img",
+    },
+    btn_stamp="//a[contains(@href, 'attendance_check')]",
+    stamp_calendar="table.calendar>tbody",
+    stamped_mark="img",
+    login_window="//a[@title='로그인']",
+    stamp_fail_messages={
+        "잠시후 다시 시도해 주세요.": "알 수 없는 이유",
+        "이미 출석체크를 하셨습니다.": "달력 파싱 오류",
+    },
+    login_strategy=login_strategy,
+)
@@ -0,0 +1,28 @@
+import logging
+
+from config import Site
+from errors import LoginFailedError
+from strategies import BaseLoginStrategy, click
+from utils import handle_selenium_error
+from webdriverwrapper import WebDriverWrapper
+
+logger = logging.getLogger("onadaily")
+
+
+class BananaLoginStrategy(BaseLoginStrategy):
+
+    @handle_selenium_error(LoginFailedError, "로그인 준비 중 실패")
+    def _prepare_login(self, driver: WebDriverWrapper, site: Site) -> None:
+        super()._prepare_login(driver, site)
+
+        if site.login_window is None:
+            raise LoginFailedError("로그인 준비 중 실패/로그인 창 버튼이 설정되지 않았습니다.")
+        click(driver, site, site.login_window)
+
+        another_window = driver.wait_new_window(self.known_window_handles)
+        logger.debug(f"로그인 창 핸들 : {another_window}")
+        driver.switch_to.window(another_window)
+
+    def _after_click_login_btn(self, driver: WebDriverWrapper, site: Site) -> None:
+        super()._after_click_login_btn(driver, site)
+        driver.switch_to.window(self.main_window_handle)
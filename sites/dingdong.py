@@ -0,0 +1,22 @@
+from sites.spec import SiteSpec
+
+
+SPEC = SiteSpec(
+    name="dingdong",
+    main_url="https://www.dingdong.co.kr",
+    login_url="https://dingdong.co.kr/member/login.html",
+    stamp_url="https://www.dingdong.co.kr/attend/stamp.html",
+    input_id="//input[@id='member_id']",
+    input_pwd="//input[@id='member_passwd']",
+    login_check="//a[text()='로그아웃']",
+    login_buttons={
+        "default": "//a[contains(@onclick, 'login')]",
+        "google": "//a[contains(@onclick, 'MemberAction') and contains(@onclick,'googleplus')]/img",
+        "kakao": "//a[contains(@onclick, 'MemberAction') and contains(@onclick,'kakaosyncLogin')]/img",
+        "naver": "//a[contains(@onclick, 'MemberAction') and contains(@onclick,'naver')]/img",
+        "facebook": "//a[contains(@onclick, 'MemberAction') and contains(@onclick,'facebook')]/img",
+    },
+    btn_stamp="//a[contains(@onclick, 'attend_send')]",
+    stamp_calendar="table[class^=xans-element-]>tbody",
+    stamped_mark="img[alt='출석']",
+)
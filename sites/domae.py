@@ -0,0 +1,19 @@
+from sites.spec import SiteSpec
+
+
+SPEC = SiteSpec(
+    name="domae",
+    main_url="https://domaedoll.com/",
+    login_url="https://domaedoll.com/member/login.html",
+    stamp_url="https://domaedoll.com/attend/stamp.html",
+    input_id="//input[@id='member_id']",
+    input_pwd="//input[@id='member_passwd']",
+    login_check="//a[text()='로그아웃']",
+    login_buttons={
+        "default": "//a[contains(@onclick, 'MemberAction.login')]",
+        "google": "//a[contains(@onclick, 'googleplus')]",
+    },
+    btn_stamp="//a[contains(@onclick, 'attend_send')]",
+    stamp_calendar="div.xans-attend-calendar>table>tbody",
+    stamped_mark="img[alt='출석']",
+)
@@ -0,0 +1,33 @@
+from typing import TYPE_CHECKING
+
+from sites.spec import SiteSpec
+
+if TYPE_CHECKING:
+    from hotdeal_parser import BaseHotDealStrategy
+
+
+def hotdeal_strategy() -> "BaseHotDealStrategy":
+    from sites.onami_hotdeal import OnamiHotDealStrategy
+
+    return OnamiHotDealStrategy()
+
+
+SPEC = SiteSpec(
+    name="onami",
+    main_url="https://oname.kr/index.html",
+    login_url="https://oname.kr/member/login.html",
+    stamp_url="https://oname.kr/attend/stamp2.html",
+    input_id='//*[@id="member_id"]',
+    input_pwd='//*[@id="member_passwd"]',
+    login_check="//span[contains(@class, 'member-var-name') and string-length(text()) > 0]",
+    login_buttons={
+        "default": "//a[contains(@onclick, 'login')]",
+        "google": "//a[contains(@onclick, 'MemberAction') and contains(@onclick,'googleplus')]",
+    },
+    btn_stamp="//a[contains(@onclick, 'attend_send')]/img",
+    stamp_calendar="table[class^=xans-element-]>tbody",
+    stamped_mark="img[alt='출석']",
+    hotdeal_table=".ms-wrap",
+    stamp_delay=(0.5, 1.0),
+    hotdeal_strategy=hotdeal_strategy,
+)
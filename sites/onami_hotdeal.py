@@ -0,0 +1,26 @@
+from bs4 import Tag
+
+from classes import HotdealInfo
+from errors import HotDealDataNotFoundError
+from hotdeal_parser import BaseHotDealStrategy
+
+
+class OnamiHotDealStrategy(BaseHotDealStrategy):
+    def _get_product_info(self, product: Tag) -> HotdealInfo:
+        price = dc_price = name = "이게 보이면 오류"
+
+        if (dcpricespan := product.select_one("p.price > span")) is None:
+            raise HotDealDataNotFoundError("핫딜 테이블에 상품이 없음")
+        dc_price = dcpricespan.text
+
+        if (pricestrike := product.select_one("strike")) is None:
+            raise HotDealDataNotFoundError("핫딜 테이블에 상품이 없음")
+
+        price = pricestrike.text
+
+        if (namep := product.select_one("p.name")) is None:
+            raise HotDealDataNotFoundError("핫딜 테이블에 상품이 없음")
+
+        name = namep.text
+
+        return HotdealInfo(name, price, dc_price)
@@ -0,0 +1,42 @@
+from typing import TYPE_CHECKING
+
+from sites.spec import SiteSpec
+
+if TYPE_CHECKING:
+    from hotdeal_parser import BaseHotDealStrategy
+    from strategies import BaseLoginStrategy
+
+
+def login_strategy() -> "BaseLoginStrategy":
+    from sites.showdang_strategies import ShowDangLoginStrategy
+
+    return ShowDangLoginStrategy()
+
+
+def hotdeal_strategy() -> "BaseHotDealStrategy":
+    from sites.showdang_hotdeal import ShowDangHotDealStrategy
+
+    return ShowDangHotDealStrategy()
+
+
+SPEC = SiteSpec(
+    name="showdang",
+    main_url="https://showdang.co.kr/",
+    login_url="https://showdang.co.kr/member/login.php",
+    stamp_url="https://showdang.co.kr/event/attend_stamp.php",
+    input_id='//*[@id="loginId"]',
+    input_pwd='//*[@id="loginPwd"]',
+    login_check="//a[text()='LOGOUT']",
+    login_buttons={
+        "default": "//button[contains(@class, 'member_login')]",
+        "google": "//a[contains(@class,'btn_google_login')]",
+        "kakao": "//a[contains(@class, 'btn_kakao_login')]",
+        "naver": "//a[contains(@class, 'btn_naver_login')]",
+    },
+    btn_stamp="//button[contains(@class, 'btn_attend_check')]",
+    stamp_calendar=".calendar_sec > table >tbody",
+    stamped_mark="img[alt='출석']",
+    hotdeal_table="#todaysale",
+    login_strategy=login_strategy,
+    hotdeal_strategy=hotdeal_strategy,
+)
@@ -0,0 +1,24 @@
+from bs4 import Tag
+
+from classes import HotdealInfo
+from errors import HotDealDataNotFoundError
+from hotdeal_parser import BaseHotDealStrategy
+
+
+class ShowDangHotDealStrategy(BaseHotDealStrategy):
+    def _get_product_info(self, product: Tag) -> HotdealInfo:
+        price = dc_price = name = "이게 보이면 오류"
+
+        if (price_span := product.select_one("span.or-price")) is None:
+            raise HotDealDataNotFoundError("핫딜 테이블에 상품이 없음")
+        price = price_span.text
+
+        if (dc_price_span := product.select_one("span.sl-price")) is None:
+            raise HotDealDataNotFoundError("핫딜 테이블에 상품이 없음")
+        dc_price = dc_price_span.text
+
+        if (name_ul := product.select_one("ul.swiper-prd-info-name")) is None:
+            raise HotDealDataNotFoundError("핫딜 테이블에 상품이 없음")
+        name = name_ul.text
+
+        return HotdealInfo(name, price, dc_price)
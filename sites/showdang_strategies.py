@@ -0,0 +1,30 @@
+import logging
+
+from config import Site
+from errors import LoginFailedError
+from strategies import BaseLoginStrategy
+from utils import handle_selenium_error
+from webdriverwrapper import WebDriverWrapper
+
+logger = logging.getLogger("onadaily")
+
+GOOGLE_SELECT_USER_1 = "//*[@data-authuser='0']"
+GOOGLE_LOGIN_CONTINUE = "//span[contains(., '계속')]/parent::button"
+
+
+class ShowDangLoginStrategy(BaseLoginStrategy):
+
+    @handle_selenium_error(LoginFailedError, "로그인 확인 실패")
+    def _after_click_login_btn(self, driver: WebDriverWrapper, site: Site) -> None:
+        super()._after_click_login_btn(driver, site)
+        if site.login == "google":
+            another_window = driver.wait_new_window(self.known_window_handles)
+            logger.debug(f"로그인 창 핸들 : {another_window}")
+            driver.switch_to.window(another_window)
+
+            # 구글 로그인 창은 스크립트 클릭을 막으므로 실제 마우스 이동, 클릭 사용
+            driver.wait_move_click(GOOGLE_SELECT_USER_1)
+
+            driver.wait_move_click(GOOGLE_LOGIN_CONTINUE)
+
+            driver.switch_to.window(self.main_window_handle)
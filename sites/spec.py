@@ -0,0 +1,45 @@
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+if TYPE_CHECKING:
+    from hotdeal_parser import BaseHotDealStrategy
+    from strategies import BaseLoginStrategy, BaseStampStrategy
+
+
+def default_login_strategy() -> "BaseLoginStrategy":
+    from strategies import DefaultLoginStrategy
+
+    return DefaultLoginStrategy()
+
+
+def default_stamp_strategy() -> "BaseStampStrategy":
+    from strategies import DefaultStampStrategy
+
+    return DefaultStampStrategy()
+
+
+class SiteSpec(NamedTuple):
+    # 사이트 하나의 정의. 전략(strategy)은 사이트를 사용할 때만 불러오도록 함수로 둠
+    name: str
+    main_url: str
+    login_url: str
+    stamp_url: str
+
+    input_id: str  # xpath
+    input_pwd: str  # xpath
+    login_check: str  # xpath, 로그인 후에만 보이는 요소
+    login_buttons: dict[str, str]  # 로그인 방식 -> 로그인 버튼 xpath, 없는 방식은 지원하지 않음
+
+    btn_stamp: str  # xpath
+    stamp_calendar: str  # css
+    stamped_mark: str  # css, 달력의 오늘 칸에 이 요소가 있으면 이미 출석함
+
+    hotdeal_table: str | None = None  # css
+    login_window: str | None = None  # xpath, 로그인 창을 여는 버튼 (새 창에서 로그인하는 경우)
+    stamp_delay: tuple[float, float] | None = None  # 출첵 버튼 클릭 전 대기 시간(초) 범위
+    stamp_fail_messages: dict[str, str] = {}  # 출석 얼럿이나 응답에 이 문구가 있으면 실패 (문구: 실패 이유)
+    stamp_request: str | None = None  # 출석 요청 url 정규식, 없으면 같은 사이트의 문서/XHR/fetch POST 중 처음 것
+    real_input: bool = False  # 스크립트 입력, 클릭을 막는 사이트는 True (실제 마우스 이동, 키 입력 사용)
+
+    login_strategy: Callable[[], "BaseLoginStrategy"] = default_login_strategy
+    stamp_strategy: Callable[[], "BaseStampStrategy"] = default_stamp_strategy
+    hotdeal_strategy: Callable[[], "BaseHotDealStrategy"] | None = None
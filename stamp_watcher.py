@@ -0,0 +1,90 @@
+import logging
+import re
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from config import Site
+from webdriverwrapper import WebDriverWrapper
+
+logger = logging.getLogger("onadaily.stamp_watcher")
+
+BODY_TYPES = ("XHR", "Fetch")  # 문서 응답은 스크립트에 실패 문구가 같이 있을 수 있어서 제외
+REQUEST_TYPES = ("Document", "XHR", "Fetch")  # 출석 요청으로 볼 리소스 종류 (sendBeacon 같은 통계 요청은 제외)
+
+
+class StampSignal(NamedTuple):
+    message: str | None  # 얼럿 문구
+    status: int | None  # 출석 요청 응답 코드
+    body: str | None  # 출석 요청 응답 본문 (XHR, fetch)
+
+
+def _site_domain(url: str) -> str:
+    host = urlsplit(url).hostname or ""
+    return host.removeprefix("www.")
+
+
+class StampWatcher(object):
+    # 출석 버튼 클릭 후 성능 로그(CDP 이벤트)로 출석 요청 응답과 얼럿을 확인
+    # 성능 로그는 기록(record), 추적(pagetrace) 중일 때만 켜지고, 꺼져 있으면 얼럿만 기다림
+    # 다른 곳(기록 등)에서 성능 로그를 가져가도 놓치지 않도록 driver.event_listeners로 이벤트를 받음
+    def __init__(self, driver: WebDriverWrapper, site: Site) -> None:
+        self.driver = driver
+        self.domain = _site_domain(site.main_url)
+        self.pattern = re.compile(site.stamp_request) if site.stamp_request is not None else None
+        self.requests: dict[str, str] = {}  # requestId -> 리소스 종류
+        self.message: str | None = None
+        self.status: int | None = None
+        self.body: str | None = None
+        self._finished: str | None = None  # 본문을 가져올 출석 요청
+
+        try:
+            driver.performance_events()  # 클릭 전 이벤트는 버림
+            self.available = True
+        except WebDriverException as ex:
+            logger.debug(f"성능 로그 사용 불가, 얼럿을 기다림 : {ex.msg}")
+            self.available = False
+            return
+        driver.event_listeners.append(self.handle_event)
+
+    def close(self) -> None:
+        if self.handle_event in self.driver.event_listeners:
+            self.driver.event_listeners.remove(self.handle_event)
+
+    def poll(self, driver: WebDriverWrapper) -> StampSignal | None:
+        driver.performance_events()  # 가져온 이벤트는 handle_event로 전달됨
+        if self._finished is not None and self.message is None:  # 같이 받은 이벤트 중에 얼럿이 없을 때만 본문 요청
+            self.body = self.driver.response_body(self._finished)
+            self._finished = None
+
+        if self.message is not None or (self.status is not None and self.status >= 400):
+            return StampSignal(self.message, self.status, self.body)
+        return None
+
+    def handle_event(self, event: dict) -> None:
+        params = event.get("params", {})
+        request_id = params.get("requestId", "")
+        match event["method"]:
+            case "Network.requestWillBeSent":
+                request = params["request"]
+                if len(self.requests) == 0 and self._is_stamp_request(request, params.get("type", "")):
+                    logger.debug(f"출석 요청 : {request['url']}")
+                    self.requests[request_id] = params.get("type", "")
+            case "Network.responseReceived" if request_id in self.requests:
+                self.status = params["response"]["status"]
+                logger.debug(f"출석 요청 응답 : {self.status}")
+            case "Network.loadingFinished" if request_id in self.requests:
+                if self.requests[request_id] in BODY_TYPES:
+                    self._finished = request_id
+            case "Page.javascriptDialogOpening":
+                self.message = params["message"]
+                self.driver.handle_dialog()
+
+    def _is_stamp_request(self, request: dict, kind: str) -> bool:
+        if request["method"] != "POST":
+            return False
+        if self.pattern is not None:
+            return self.pattern.search(request["url"]) is not None
+        host = _site_domain(request["url"])
+        return kind in REQUEST_TYPES and (host == self.domain or host.endswith("." + self.domain))
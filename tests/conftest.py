@@ -0,0 +1,19 @@
+import os
+from typing import Iterator
+
+import pytest
+
+import consts
+from config import Options
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def options(tmp_path, monkeypatch) -> Iterator[Options]:
+    # 임시 폴더에 기본 설정 파일을 복사해서 불러옴
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(consts, "DEFAULT_CONFIG_FILE", os.path.join(REPO_DIR, "onadailyorigin.yaml"))
+    Options.reset()
+    yield Options()
+    Options.reset()
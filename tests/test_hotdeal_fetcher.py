@@ -0,0 +1,97 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from errors import HotDealDataNotFoundError, HotDealTableNotFoundError
+from hotdeal_fetcher import HotdealFetcher, ResponseCache
+from hotdeal_parser import get_hotdeal_strategy
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ETAG = '"v1"'
+
+ONAMI_PAGE = """<html><body>
+<div class="ms-wrap"><div>
+<div class="swiper-slide">
+<div class="item"><p class="name">테스트 상품</p><p class="price"><strike>10,000원</strike> <span>9,000원</span></p></div>
+</div>
+</div></div>
+</body></html>"""
+
+EMPTY_PAGE = '<html><body><div class="ms-wrap"><div></div></div></body></html>'
+LOGIN_PAGE = "<html><body><form id='login'></form></body></html>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests: list[dict[str, str]] = []
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = ONAMI_PAGE.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/index.html"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def onami(options):
+    return next(site for site in options.sites if site.name == "onami")
+
+
+def test_fetch_parses_then_uses_etag(server, onami, tmp_path) -> None:
+    async def scan_twice():
+        fetcher = HotdealFetcher([onami], 5, urls={onami.name: server})
+        fetcher.cache = ResponseCache(str(tmp_path / "cache"))
+        async with fetcher:
+            return (await fetcher.scan())[onami], (await fetcher.scan())[onami]
+
+    first, second = asyncio.run(scan_twice())
+
+    assert not isinstance(first, BaseException) and first is not None
+    assert [(p.name, p.price_value, p.dc_price_value) for p in first.products] == [("테스트 상품", 10000, 9000)]
+
+    assert second is None  # 304, 변경 없음
+    assert "If-None-Match" not in _Handler.requests[0]
+    assert _Handler.requests[1]["If-None-Match"] == ETAG
+
+
+def test_fetcher_imports_without_browser() -> None:
+    code = "import sys, hotdeal_fetcher; assert 'selenium' not in sys.modules and 'strategies' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], cwd=REPO_DIR, check=True)
+
+
+def test_empty_and_missing_table(onami) -> None:
+    strategy = get_hotdeal_strategy(onami)
+
+    with pytest.raises(HotDealDataNotFoundError) as excinfo:
+        strategy.get_hotdeal_info(EMPTY_PAGE, onami)
+    assert not isinstance(excinfo.value, HotDealTableNotFoundError)
+
+    with pytest.raises(HotDealTableNotFoundError):
+        strategy.get_hotdeal_info(LOGIN_PAGE, onami)
@@ -0,0 +1,93 @@
+import pytest
+
+from job_queue import DONE, FAILED, LEASED, LOST, QUEUED, JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    with JobQueue(str(tmp_path / "jobs.sqlite3")) as queue:
+        yield queue
+
+
+def _state(queue: JobQueue, job_id: int) -> str:
+    return queue.conn.execute("SELECT state FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+
+
+def _expire(queue: JobQueue, job_id: int) -> None:
+    queue.conn.execute("UPDATE jobs SET lease_until = 0 WHERE id = ?", (job_id,))
+
+
+def test_lease_and_complete(queue) -> None:
+    job_id = queue.enqueue("b", "a1", "onami", 1)
+
+    job = queue.lease("w1")
+    assert job is not None and job.id == job_id and job.attempts == 1
+    assert _state(queue, job_id) == LEASED
+    assert queue.lease("w2") is None  # 이미 임대됨
+
+    assert queue.complete(job, "w1", {"passed": True}, retry=False) == DONE
+    assert queue.unfinished("b") == 0
+    assert [(j.id, state) for j, state, _ in queue.finished("b")] == [(job_id, DONE)]
+
+
+def test_one_job_per_account(queue) -> None:
+    queue.enqueue("b", "a1", "onami", 1)
+    queue.enqueue("b", "a1", "showdang", 1)
+    queue.enqueue("b", "a2", "onami", 1)
+
+    first = queue.lease("w1")
+    second = queue.lease("w2")
+    assert first is not None and second is not None
+    assert (first.account, second.account) == ("a1", "a2")
+    assert queue.lease("w3") is None  # a1의 두 번째 작업은 첫 번째가 끝나야 가져감
+
+    queue.complete(first, "w1", {"passed": True}, retry=False)
+    third = queue.lease("w3")
+    assert third is not None and (third.account, third.site) == ("a1", "showdang")
+
+
+def test_lease_prefers_current_account(queue) -> None:
+    queue.enqueue("b", "a1", "onami", 1)
+    queue.enqueue("b", "a2", "onami", 1)
+
+    job = queue.lease("w1", prefer_account="a2")
+    assert job is not None and job.account == "a2"
+
+
+def test_expired_lease_is_requeued(queue) -> None:
+    job_id = queue.enqueue("b", "a1", "onami", 2)
+    job = queue.lease("w1")
+    assert job is not None
+
+    _expire(queue, job_id)
+    assert queue.requeue_expired() == 1
+    assert _state(queue, job_id) == QUEUED
+
+    retried = queue.lease("w2")
+    assert retried is not None and retried.id == job_id and retried.attempts == 2
+    assert queue.complete(job, "w1", {"passed": True}, retry=False) == LOST  # 늦게 끝난 작업자의 결과는 버림
+    assert queue.heartbeat("w1", job_id) is False
+    assert queue.heartbeat("w2", job_id) is True
+
+
+def test_expired_lease_fails_after_max_attempts(queue) -> None:
+    job_id = queue.enqueue("b", "a1", "onami", 1)
+    assert queue.lease("w1") is not None
+
+    _expire(queue, job_id)
+    assert queue.lease("w2") is None  # 임대하면서 만료된 작업도 정리함
+    assert _state(queue, job_id) == FAILED
+    [(_, state, result)] = queue.finished("b")
+    assert state == FAILED and result["outcome"] == "worker_lost"
+
+
+def test_retry_until_max_attempts(queue) -> None:
+    queue.enqueue("b", "a1", "onami", 2)
+
+    job = queue.lease("w1")
+    assert job is not None
+    assert queue.complete(job, "w1", {"passed": False}, retry=True) == QUEUED
+
+    job = queue.lease("w1")
+    assert job is not None and job.attempts == 2
+    assert queue.complete(job, "w1", {"passed": False}, retry=True) == FAILED
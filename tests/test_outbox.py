@@ -0,0 +1,55 @@
+import json
+import os
+import time
+import urllib.error
+
+import outbox
+from outbox import Outbox
+
+
+class _Sink(outbox.BaseSink):
+    def __init__(self, config, error: Exception | None) -> None:
+        super().__init__(config)
+        self.error = error
+        self.attempts = 0
+        self.sent: list[dict] = []
+
+    def send(self, messages) -> None:
+        self.attempts += 1
+        if self.error is not None:
+            raise self.error
+        self.sent.extend(messages)
+
+
+def _outbox(tmp_path, monkeypatch, error: Exception | None) -> tuple[Outbox, _Sink]:
+    monkeypatch.setattr(outbox, "OUTBOX_DIR", str(tmp_path))
+    monkeypatch.setattr(outbox, "BATCH_SECONDS", 0)
+    monkeypatch.setattr(outbox, "MAX_BACKOFF", 0.01)
+    sink = _Sink({"type": "file"}, error)
+    monkeypatch.setattr(outbox, "create_sink", lambda config: sink)
+    return Outbox([{}], "test"), sink
+
+
+def test_sends_spooled_messages(tmp_path, monkeypatch) -> None:
+    box, sink = _outbox(tmp_path, monkeypatch, None)
+    box.put("result", "ok")
+    box.close()
+
+    assert [m["text"] for m in sink.sent] == ["ok"]
+    assert os.listdir(os.path.join(tmp_path, sink.name)) == []
+
+
+def test_permanent_error_moves_to_dead_letter(tmp_path, monkeypatch) -> None:
+    error = urllib.error.HTTPError("http://localhost/hook", 404, "Not Found", {}, None)  # type: ignore[arg-type]
+    box, sink = _outbox(tmp_path, monkeypatch, error)
+    box.put("result", "lost")
+    deadletter = os.path.join(tmp_path, f"{sink.name}.dead.jsonl")
+    deadline = time.monotonic() + 5
+    while not os.path.exists(deadletter) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    box.close()
+
+    assert sink.attempts == outbox.DEAD_LETTER_ATTEMPTS
+    with open(deadletter, encoding="utf-8") as f:
+        assert [json.loads(line)["text"] for line in f] == ["lost"]
+    assert os.listdir(os.path.join(tmp_path, sink.name)) == []
@@ -0,0 +1,120 @@
+import http.client
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+import pytest
+
+from replay import Fault, Recording, ReplayServer
+
+ORIGIN = "https://oname.kr"
+
+
+def _entry(path: str, body: str | None, status: int = 200, content_type: str = "text/html") -> dict:
+    headers = {"content-type": content_type}
+    return {"url": ORIGIN + path, "method": "GET", "status": status, "headers": headers, "body": body}
+
+
+@pytest.fixture
+def recording(tmp_path) -> Recording:
+    pages = {
+        "index.html": f'<html><head></head><body><a href="{ORIGIN}/stamp.html">출석</a><p id="ad">광고</p></body></html>',
+        "stamp1.json": '{"count": 1}',
+        "stamp2.json": '{"count": 2}',
+    }
+    for name, text in pages.items():
+        (tmp_path / name).write_text(text, encoding="utf-8")
+
+    return Recording(
+        id="test",
+        path=str(tmp_path),
+        site="onami",
+        login="default",
+        recorded_at=datetime.now(),
+        entries=[
+            _entry("/index.html", "index.html"),
+            _entry("/stamp.json?t=1", "stamp1.json", content_type="application/json"),
+            _entry("/stamp.json?t=2", "stamp2.json", content_type="application/json"),
+        ],
+        alerts=[],
+        commands=[],
+    )
+
+
+def get(url: str) -> tuple[int, str]:
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, response.read().decode("utf-8")
+    except urllib.error.HTTPError as ex:
+        return ex.code, ""
+
+
+def test_serves_recorded_responses_with_local_urls(recording) -> None:
+    with ReplayServer(recording) as server:
+        local = server.origins[ORIGIN]
+        assert server.local(ORIGIN + "/index.html") == local + "/index.html"
+
+        status, body = get(local + "/index.html")
+        assert status == 200
+        assert f'href="{local}/stamp.html"' in body  # 절대 주소는 로컬 서버로
+
+
+def test_same_path_in_recorded_order(recording) -> None:
+    with ReplayServer(recording) as server:
+        local = server.origins[ORIGIN]
+        assert get(local + "/stamp.json?t=1")[1] == '{"count": 1}'
+        assert get(local + "/stamp.json?t=2")[1] == '{"count": 2}'
+        assert get(local + "/stamp.json?t=2")[1] == '{"count": 2}'  # 마지막 응답은 반복
+
+        # 쿼리가 다르면(캐시 방지 값 등) 같은 경로의 응답을 순서대로
+        assert get(local + "/stamp.json?t=9")[1] == '{"count": 1}'
+        assert get(local + "/stamp.json?t=9")[1] == '{"count": 2}'
+
+        server.rewind()
+        assert get(local + "/stamp.json?t=9")[1] == '{"count": 1}'
+
+
+def test_unrecorded_request_is_a_miss(recording) -> None:
+    with ReplayServer(recording) as server:
+        assert get(server.origins[ORIGIN] + "/missing.html")[0] == 404
+        assert server.misses == [f"GET {ORIGIN}/missing.html"]
+
+
+def test_status_fault_only_for_given_times(recording) -> None:
+    with ReplayServer(recording, [Fault(url=r"/index\.html", status=503, times=1)]) as server:
+        local = server.origins[ORIGIN]
+        assert get(local + "/index.html")[0] == 503
+        assert get(local + "/index.html")[0] == 200
+        assert server.injected == [ORIGIN + "/index.html"]
+
+        server.rewind()  # 장애 횟수도 처음부터
+        assert get(local + "/index.html")[0] == 503
+
+
+def test_latency_fault_delays_response(recording) -> None:
+    with ReplayServer(recording, [Fault(url=r"/index\.html", latency=0.3)]) as server:
+        started = time.monotonic()
+        assert get(server.origins[ORIGIN] + "/index.html")[0] == 200
+        assert time.monotonic() - started >= 0.3
+
+
+def test_drop_fault_closes_connection(recording) -> None:
+    with ReplayServer(recording, [Fault(url=r"/stamp\.json", drop=True)]) as server:
+        with pytest.raises((urllib.error.URLError, http.client.RemoteDisconnected, ConnectionError)):
+            get(server.origins[ORIGIN] + "/stamp.json?t=1")
+
+
+def test_html_faults_edit_page(recording) -> None:
+    fault = Fault(url=r"/index\.html", remove="#ad", alert="점검 중입니다")
+    with ReplayServer(recording, [fault]) as server:
+        status, body = get(server.origins[ORIGIN] + "/index.html")
+
+    assert status == 200
+    assert "광고" not in body
+    assert 'alert("\\uc810\\uac80 \\uc911\\uc785\\ub2c8\\ub2e4");' in body
+
+
+def test_fault_apply_leaves_body_without_html_faults() -> None:
+    body = b"<p>unchanged</p>"
+    assert Fault(url=".*", latency=1).apply(body) is body
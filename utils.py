@@ -1,7 +1,6 @@
 import functools
 import logging
 import os
-import sys
 from datetime import datetime
 from math import ceil
 from typing import Any, Callable, Type
@@ -17,16 +16,22 @@ from selenium.common import (
     WebDriverException,
 )
 
+from artifacts import ArtifactWriter
 from classes import LoggingInfo
 from config import Site
+from consts import LOG_DIR, USER_AGENT
 from errors import ParseError
+from profiling import phase
 
 logger = logging.getLogger("onadaily")
 
+frozen_now: datetime | None = None  # 기록 재현 시 출석 달력의 오늘 날짜
+
 
 def check_already_stamp(site: Site, source: str) -> bool:
-    soup = BeautifulSoup(source, "html.parser")
-    tablesoup = soup.select_one(site.stamp_calendar)
+    with phase("parse"):
+        soup = BeautifulSoup(source, "html.parser")
+        tablesoup = soup.select_one(site.stamp_calendar)
 
     if tablesoup is None:
         raise ParseError("오류 : 달력을 찾을 수 없습니다.")
@@ -40,20 +45,15 @@ def check_already_stamp(site: Site, source: str) -> bool:
 
     todaysoup = weeksoup[day - 1]
 
-    if site.name != "banana":
-        if todaysoup.find("img", {"alt": "출석"}) is None:
-            return False
-        else:
-            return True
+    if todaysoup.select_one(site.stamped_mark) is None:
+        return False
     else:
-        if todaysoup.find("img") is None:
-            return False
-        else:
-            return True
+        return True
 
 
 def num_of_month_week() -> tuple[int, int]:
-    date = datetime.now(pytz.timezone("Asia/Seoul"))
+    seoul = pytz.timezone("Asia/Seoul")
+    date = frozen_now.astimezone(seoul) if frozen_now is not None else datetime.now(seoul)
     first_day = date.replace(day=1)
 
     day_of_month = date.day
@@ -69,13 +69,16 @@ def num_of_month_week() -> tuple[int, int]:
     return weeknum, dayofweeknum
 
 
-def get_chrome_options(headless=False) -> uc.ChromeOptions:
+def get_chrome_options(
+    headless=False, arguments: list[str] | None = None, performance_log: bool = False
+) -> uc.ChromeOptions:
     chromeoptions = uc.ChromeOptions()
-    useragent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"  # noqa
-    chromeoptions.add_argument(f"--user-agent={useragent}")
+    chromeoptions.add_argument(f"--user-agent={USER_AGENT}")
     chromeoptions.add_argument("--disable-extensions")
     chromeoptions.add_argument("--log-level=3")
     chromeoptions.add_argument("--disable-popup-blocking")
+    if performance_log:  # 모든 페이지의 CDP 이벤트가 쌓이므로 기록, 추적할 때만 켬
+        chromeoptions.set_capability("goog:loggingPrefs", {"performance": "ALL"})
 
     # chromeoptions.add_argument("--disable-dev-shm-usage")
 
@@ -89,32 +92,22 @@ def get_chrome_options(headless=False) -> uc.ChromeOptions:
         chromeoptions.add_argument("--start-maximized")
         chromeoptions.add_argument("--disable-setuid-sandbox")
 
-    return chromeoptions
-
-
-if getattr(sys, "frozen", False):
-    app_path = os.path.dirname(sys.executable)
-else:
-    app_path = os.path.dirname(os.path.abspath(__file__))
+    for argument in arguments or []:
+        chromeoptions.add_argument(argument)
 
-LOG_DIR = os.path.join(app_path, "logs")
-if not os.path.exists(LOG_DIR):
-    os.makedirs(LOG_DIR)
+    return chromeoptions
 
 
 def save_log_error(logginginfo: LoggingInfo) -> str:
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    filename = f"error_{logginginfo.sitename}_{timestamp}.txt"
     try:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        filename = os.path.join(LOG_DIR, f"error_{logginginfo.sitename}_{timestamp}.txt")
-
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(str(logginginfo))
-
+        return ArtifactWriter().submit(filename, str(logginginfo).encode("utf-8"))  # 저장은 백그라운드에서
     except Exception as ex:
         print(f"로깅 실패 : {ex}")
         print(f"원본 오류 : \n{logginginfo.stacktrace}")
 
-    return filename
+    return os.path.join(LOG_DIR, filename)
 
 
 def handle_selenium_error(wrap_exception: Type[Exception], message_prefix: str):
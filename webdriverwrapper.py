@@ -1,9 +1,16 @@
+import json
 import logging
 import os
-from typing import Self
+import time
+from typing import TYPE_CHECKING, Any, Callable, Self
 from urllib.parse import urlsplit, urlunsplit
 
 import undetected_chromedriver as uc  # type: ignore[import-untyped]
+from selenium.common.exceptions import (
+    NoAlertPresentException,
+    TimeoutException,
+    WebDriverException,
+)
 from selenium.webdriver import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
@@ -12,12 +19,79 @@ from selenium.webdriver.support import expected_conditions as EC  # noqa
 from selenium.webdriver.support.ui import WebDriverWait
 
 from config import Site
+from latency import LatencyHistory
+from metrics import WAIT_SECONDS, WASTED_WAIT_SECONDS
+from processes import ProcessRegistry
+
+if TYPE_CHECKING:
+    from pagetrace import PageTracer
+    from ratelimit import RateLimiter
+    from recorder import Recorder
 
 logger = logging.getLogger("onadaily.webdriverwrapper")
 
+# [[이름, 종류(xpath/css), 선택자], ...] 중 찾지 못한 이름 목록
+PROBE_SCRIPT = """
+return arguments[0].filter(([name, kind, selector]) => {
+    try {
+        if (kind === "xpath") {
+            const result = document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null);
+            return result.singleNodeValue === null;
+        }
+        return document.querySelector(selector) === null;
+    } catch (e) {
+        return true;
+    }
+}).map(([name]) => name);
+"""
+
+# xpath 요소를 찾아 화면 가운데로 스크롤하고 클릭, 찾지 못하면 false
+CLICK_SCRIPT = """
+const element = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)
+    .singleNodeValue;
+if (element === null) {
+    return false;
+}
+element.scrollIntoView({block: "center", inline: "center"});
+element.dispatchEvent(new MouseEvent("mouseover", {bubbles: true}));
+element.click();
+return true;
+"""
+
+# [[xpath, 값], ...] 을 모두 찾은 경우에만 입력하고 (input, change 이벤트 포함) 제출 버튼 클릭, 찾지 못하면 false
+FILL_SCRIPT = """
+const find = (xpath) => document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)
+    .singleNodeValue;
+const fields = arguments[0].map(([xpath, value]) => [find(xpath), value]);
+const submit = arguments[1] === null ? null : find(arguments[1]);
+if (fields.some(([element]) => element === null) || (arguments[1] !== null && submit === null)) {
+    return false;
+}
+for (const [element, value] of fields) {
+    const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(element), "value").set;
+    element.focus();
+    setter.call(element, value);  // 프레임워크가 값 변경을 알 수 있도록 프로토타입의 setter 사용
+    element.dispatchEvent(new Event("input", {bubbles: true}));
+    element.dispatchEvent(new Event("change", {bubbles: true}));
+    element.blur();
+}
+if (submit !== null) {
+    submit.scrollIntoView({block: "center"});
+    submit.click();
+}
+return true;
+"""
+
 
 class WebDriverWrapper(uc.Chrome):
-    def __init__(self, chromeoptions: uc.ChromeOptions, waittime: int, usedatadir: bool = False) -> None:
+    def __init__(
+        self,
+        chromeoptions: uc.ChromeOptions,
+        waittime: int,
+        usedatadir: bool = False,
+        latency: LatencyHistory | None = None,
+        minwaittime: int = 0,
+    ) -> None:
         self._quited = True
         if usedatadir:
             datadir = os.path.abspath("./userdata")
@@ -25,22 +99,116 @@ class WebDriverWrapper(uc.Chrome):
         else:
             datadir = None
 
-        super().__init__(options=chromeoptions, user_data_dir=datadir, debug=True)
-        self.wait = WebDriverWait(self, waittime)
+        self._registry = ProcessRegistry()
+        try:
+            super().__init__(options=chromeoptions, user_data_dir=datadir, debug=True)
+        except Exception:
+            self._registry.register(*self._process_ids())
+            self.kill()
+            raise
+
+        self._registry.register(*self._process_ids())
+        self.waittime = waittime
+        self.minwaittime = minwaittime
+        self.latency = latency
+        self.current_site = ""
+        self._prefetch_target: str | None = None
+        self.event_listeners: list[Callable[[dict[str, Any]], None]] = []  # 성능 로그 이벤트를 같이 받을 함수
+        self.recorder: "Recorder | None" = None
+        self.tracer: "PageTracer | None" = None
+        self.ratelimiter: "RateLimiter | None" = None  # 사이트 도메인별 요청 간격
+        self.command_count = 0  # WebDriver 명령(왕복) 수
         self._quited = False
 
-    def wait_for(self, xpath: str) -> WebElement:
+    def _process_ids(self) -> list[int | None]:
+        service = getattr(self, "service", None)
+        process = getattr(service, "process", None)
+        return [getattr(self, "browser_pid", None), getattr(process, "pid", None)]
+
+    def execute(self, driver_command: str, params: dict | None = None) -> Any:
+        self.command_count += 1
+        if self.recorder is None:
+            return super().execute(driver_command, params)
+
+        started = time.monotonic()
+        error = None
+        try:
+            return super().execute(driver_command, params)
+        except WebDriverException as ex:
+            error = type(ex).__name__
+            raise
+        finally:
+            self.recorder.command(driver_command, time.monotonic() - started, error)
+
+    def wait_until(
+        self, condition: Callable[[Any], Any], step: str, poll_frequency: float = 0.5, flush: bool = True
+    ) -> Any:
+        # flush=False : 조건 안에서 클릭하는 경우, 클릭 뒤에 뜬 얼럿이 기록 중에 닫히지 않도록
+        value = self._wait_until(condition, step, poll_frequency)
+        if flush and self.recorder is not None and step != "alert":  # 얼럿이 떠 있을 때는 기록하지 않음
+            self.recorder.flush(self)
+        return value
+
+    def _wait_until(self, condition: Callable[[Any], Any], step: str, poll_frequency: float) -> Any:
+        timeout: float = self.waittime
+        if self.latency is not None:
+            timeout = self.latency.timeout(self.current_site, step, self.waittime, self.minwaittime)
+            logger.debug(f"timeout: {timeout:.1f}s ({self.current_site} / {step})")
+
+        started = time.monotonic()
+        try:
+            value = WebDriverWait(self, timeout, poll_frequency).until(condition)
+        except TimeoutException:
+            WASTED_WAIT_SECONDS.inc(time.monotonic() - started, site=self.current_site, step=step)
+            if self.latency is not None and timeout < self.waittime:  # 기록보다 느려진 경우, 다음 시도부터는 waittime 사용
+                self.latency.expand(self.current_site, step)
+            raise
+
+        elapsed = time.monotonic() - started
+        if self.latency is not None:
+            self.latency.record(self.current_site, step, elapsed)
+        WAIT_SECONDS.observe(elapsed, site=self.current_site, step=step)
+        return value
+
+    def wait_for(self, xpath: str, step: str | None = None) -> WebElement:
         logger.debug(f"wait_for: {xpath}")
-        return self.wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
+        return self.wait_until(EC.presence_of_element_located((By.XPATH, xpath)), step or xpath)
 
     def wait_for_selector(self, selector: str) -> WebElement:
         logger.debug(f"wait_for_selector: {selector}")
-        return self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+        return self.wait_until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)), selector)
+
+    def probe_selectors(self, selectors: dict[str, tuple[str, str]], step: str) -> list[str]:
+        # 선택자를 페이지 안에서 한 번에 확인, 페이지를 다 불러오고 waittime 이 지나도 찾지 못한 선택자 이름 반환
+        # 페이지를 다 불러오지 못한 경우(느린 네트워크)는 구조 변경이 아니므로 TimeoutException
+        probes = [[name, kind, selector] for name, (kind, selector) in selectors.items()]
+        logger.debug(f"probe_selectors: {list(selectors)}")
+
+        def found(driver: "WebDriverWrapper") -> bool:
+            return len(driver.execute_script(PROBE_SCRIPT, probes)) == 0
+
+        started = time.monotonic()
+        try:
+            self.wait_until(found, step)
+            return []
+        except TimeoutException:
+            pass
+
+        if (remaining := self.waittime - (time.monotonic() - started)) > 0:  # adaptivewait 대기 시간이 짧았을 수 있음
+            try:
+                WebDriverWait(self, remaining, 0.5).until(found)
+                return []
+            except TimeoutException:
+                pass
+
+        if self.execute_script("return document.readyState") != "complete":
+            raise TimeoutException(f"{step} : 페이지를 다 불러오지 못함")
+        return list(self.execute_script(PROBE_SCRIPT, probes))
 
     def wait_login(self, site: Site) -> None:
         chkxpath = site.login_check_xpath
         logger.debug(f"wait_login: {chkxpath}")
-        self.wait_for(chkxpath)
+        self.wait_for(chkxpath, f"login_{site.login}")  # 로그인 방식마다 걸리는 시간이 다름
 
     def check_logined(self, site: Site) -> bool:
         chkxpath = site.login_check_xpath
@@ -62,24 +230,135 @@ class WebDriverWrapper(uc.Chrome):
         self.execute_script("arguments[0].click();", element)
         return element
 
+    def wait_click(self, xpath: str) -> None:
+        # wait_move_click 과 같지만 찾기, 스크롤, 클릭을 스크립트 하나로 (요소가 이미 있으면 명령 1번)
+        logger.debug(f"wait_click: {xpath}")
+        if self.recorder is not None:  # 클릭 전에 기록
+            self.recorder.flush(self)
+        self.wait_until(lambda driver: driver.execute_script(CLICK_SCRIPT, xpath), xpath, flush=False)
+
+    def wait_fill_form(self, fields: dict[str, str], submit: str | None, step: str) -> None:
+        # 입력칸(xpath -> 값)을 한 번에 채우고 submit 버튼까지 클릭, 값은 로그에 남기지 않음
+        logger.debug(f"wait_fill_form: {list(fields)} -> {submit}")
+        values = [[xpath, value] for xpath, value in fields.items()]
+        if self.recorder is not None:  # 제출 전에 기록
+            self.recorder.flush(self)
+        self.wait_until(lambda driver: driver.execute_script(FILL_SCRIPT, values, submit), step, flush=False)
+
+    def wait_new_window(self, known_handles: set[str]) -> str:
+        # 클릭 전에 있던 창을 제외한 새 창 (미리 불러오기 탭과 섞이지 않도록)
+        logger.debug("wait_new_window")
+        new_handles = self.wait_until(lambda driver: set(driver.window_handles) - known_handles, "new_window")
+        return sorted(new_handles)[0]
+
+    def preconnect(self, urls: list[str]) -> None:
+        # 사이트 주소의 DNS, TLS 연결을 미리 맺어둠
+        origins = list(dict.fromkeys(urlunsplit(urlsplit(url)[:2] + ("", "", "")) for url in urls))
+        logger.debug(f"preconnect: {origins}")
+        try:
+            self.execute_script(
+                """
+                for (const origin of arguments[0]) {
+                    for (const rel of ["dns-prefetch", "preconnect"]) {
+                        const link = document.createElement("link");
+                        link.rel = rel;
+                        link.href = origin;
+                        link.crossOrigin = "anonymous";
+                        document.head.appendChild(link);
+                    }
+                }
+                """,
+                origins,
+            )
+        except WebDriverException as ex:
+            logger.debug(f"preconnect 실패 : {ex.msg}")
+
+    def prefetch(self, url: str) -> None:
+        # 다음 사이트 페이지를 백그라운드 탭에서 미리 불러옴. 현재 창은 바뀌지 않음
+        self.close_prefetch()
+        logger.debug(f"prefetch: {url}")
+        self.pace(url)
+        try:
+            target = self.execute_cdp_cmd("Target.createTarget", {"url": url, "background": True})
+        except WebDriverException as ex:
+            logger.debug(f"prefetch 실패 : {ex.msg}")
+            return
+        self._prefetch_target = target["targetId"]
+
+    def close_prefetch(self) -> None:
+        if self._prefetch_target is None:
+            return
+
+        target, self._prefetch_target = self._prefetch_target, None
+        try:
+            self.execute_cdp_cmd("Target.closeTarget", {"targetId": target})
+        except WebDriverException as ex:
+            logger.debug(f"prefetch 탭 닫기 실패 : {ex.msg}")
+
+    def performance_events(self) -> list[dict[str, Any]]:
+        # 성능 로그에 쌓인 CDP 이벤트 (가져온 이벤트는 로그에서 지워지므로 event_listeners에도 전달)
+        events = [json.loads(entry["message"])["message"] for entry in self.get_log("performance")]
+        for listener in self.event_listeners:
+            for event in events:
+                listener(event)
+        return events
+
+    def response_body(self, request_id: str) -> str | None:
+        try:
+            return self.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})["body"]
+        except WebDriverException as ex:  # 그 사이 얼럿이 뜬 경우 등
+            logger.debug(f"응답 본문 가져오기 실패 : {ex.msg}")
+            return None
+
+    def handle_dialog(self, accept: bool = True) -> None:
+        # 얼럿 명령(switch_to.alert)으로 처리, 얼럿이 떠 있을 때 CDP 명령을 보내면 크롬 드라이버가 얼럿을 먼저 닫아버림
+        logger.debug("handle_dialog")
+        try:
+            alert = self.switch_to.alert
+            if accept:
+                alert.accept()
+            else:
+                alert.dismiss()
+        except NoAlertPresentException:  # 이미 닫힌 경우
+            pass
+
     def find_xpath(self, xpath: str) -> list[WebElement]:
         logger.debug(f"find_xpath: {xpath}")
         return self.find_elements(By.XPATH, xpath)
 
     def wait_for_alert(self) -> None:
         logger.debug("wait_for_alert")
-        self.wait.until(EC.alert_is_present())
+        self.wait_until(EC.alert_is_present(), "alert")
 
     def quit(self) -> None:
         if not self._quited:
             self._quited = True
-            super().quit()
+            self._registry.track_children(*self._process_ids())  # 브라우저가 살아 있을 때 자식 프로세스 기록
+            try:
+                super().quit()
+            finally:
+                self._registry.kill(*self._process_ids(), grace=5)  # 정상 종료 후 남은 자식 프로세스 정리
             logger.debug("quited")
 
+    def kill(self) -> None:
+        self._quited = True
+        killed = self._registry.kill(*self._process_ids())
+        logger.debug(f"killed : {killed}")
+
     def get(self, url: str) -> None:
         logger.debug(f"get: {url}")
+        if self.recorder is not None:  # 페이지를 옮기기 전에 현재 페이지 응답 본문을 기록
+            self.recorder.flush(self)
+        if self.tracer is not None:
+            self.tracer.finish_page(self)
+        self.pace(url)
         super().get(url)
 
+    def pace(self, url: str) -> None:
+        # 같은 사이트에 요청이 몰리지 않도록 (다른 드라이버, 다른 프로세스와 함께) 차례를 기다림
+        if self.ratelimiter is not None:
+            self.ratelimiter.wait(url)
+
     @property
     def quited(self) -> bool:
         return self._quited
@@ -0,0 +1,235 @@
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING
+
+from config import Options
+from consts import JOB_QUEUE_FILE, LOG_DIR
+from history import save_run
+from job_queue import DONE, LEASE_SECONDS, Job, JobQueue
+from jsonlog import log_context, setup_json_log
+from metrics import STAMP_RESULTS
+from result_stream import NdjsonWriter
+
+if TYPE_CHECKING:
+    from onadaily import Onadaily
+    from webdriverwrapper import WebDriverWrapper
+
+logger = logging.getLogger("onadaily.workers")
+
+POLL_SECONDS = 1.0
+HEARTBEAT_SECONDS = LEASE_SECONDS / 3
+
+
+def load_account(account: str) -> Options:
+    # 설정 파일, userdata 폴더는 계정 폴더 기준
+    os.chdir(account)
+    Options.reset()
+    return Options()
+
+
+def prepare_account(options: Options) -> bool:
+    # 작업자는 입력을 받을 수 없으므로(stdin 없음) 로그인 정보, 저장된 세션은 여기서 미리 확인
+    if options.session_required():
+        from session import enrolled, prompt_enroll, social_sites
+
+        if not enrolled() and not prompt_enroll(options, social_sites(options)):
+            return False
+
+    for site in options.common.order:
+        if site.enable and site.login == "default":
+            site.id, site.password  # 저장되지 않았으면 지금 물어보고 저장함
+    return True
+
+
+def worker_command() -> list[str]:
+    if getattr(sys, "frozen", False):
+        return [sys.executable]
+    return [sys.executable, os.path.abspath(sys.argv[0])]
+
+
+class _Heartbeat(threading.Thread):
+    def __init__(self, queue_path: str, worker: str) -> None:
+        super().__init__(name="worker-heartbeat", daemon=True)
+        self.queue_path = queue_path
+        self.worker = worker
+        self.job_id: int | None = None
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        with JobQueue(self.queue_path) as queue:  # sqlite 연결은 스레드마다 따로
+            while not self.stopped.wait(HEARTBEAT_SECONDS):
+                if not queue.heartbeat(self.worker, self.job_id):
+                    logger.warning(f"작업 {self.job_id} 임대를 잃었습니다. 결과는 버려집니다.")
+
+
+class Worker(object):
+    # 대기열에서 (계정, 사이트) 작업을 하나씩 가져와 Onadaily.check로 실행
+    def __init__(self, queue_path: str = JOB_QUEUE_FILE) -> None:
+        self.queue_path = queue_path
+        self.name = f"worker-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.queue = JobQueue(queue_path)
+        self.heartbeat = _Heartbeat(queue_path, self.name)
+
+        self.account: str | None = None
+        self.onadaily: "Onadaily | None" = None
+        self.driver: "WebDriverWrapper | None" = None
+        self.jsonlog: logging.Handler | None = None
+
+    def run(self) -> int:
+        self.queue.register_worker(self.name)
+        self.heartbeat.start()
+        try:
+            while True:
+                job = self.queue.lease(self.name, self.account)
+                if job is None:
+                    if self.queue.unfinished() == 0:
+                        return 0
+                    time.sleep(POLL_SECONDS)  # 다른 계정 작업이 끝나길 기다림
+                    continue
+
+                self.heartbeat.job_id = job.id
+                try:
+                    result, retry = self._run_job(job)
+                finally:
+                    self.heartbeat.job_id = None
+
+                state = self.queue.complete(job, self.name, result, retry)
+                print(f"{job.site} ({job.account}) : {state} / {result.get('message')}")
+        finally:
+            from artifacts import ArtifactWriter
+
+            self._close_account()
+            self.heartbeat.stopped.set()
+            self.queue.close()
+            ArtifactWriter().close()  # 남은 로그 파일 저장
+
+    def _run_job(self, job: Job) -> tuple[dict, bool]:
+        from onadaily import Onadaily
+
+        if job.account != self.account:  # 계정이 바뀌면 브라우저도 새로
+            self._close_account()
+            options = load_account(job.account)
+            self.account = job.account
+            self.onadaily = Onadaily()
+        else:
+            options = Options()
+
+        if options.common.jsonlog and self.jsonlog is None:
+            self.jsonlog = setup_json_log(logging.getLogger("onadaily"))
+
+        assert self.onadaily is not None
+        if self.driver is None or self.driver.quited:
+            self.driver = self.onadaily.initdriver()
+
+        site = next(site for site in options.sites if site.name == job.site)
+        with log_context(account=os.path.basename(job.account)):
+            result = self.onadaily.check(self.driver, site)
+        result.attempt = job.attempts
+        return result.to_dict(), self.onadaily.retryable(site)
+
+    def _close_account(self) -> None:
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+        if self.onadaily is not None:
+            self.onadaily.save()
+            self.onadaily.outbox.close()
+            self.onadaily = None
+        self.account = None
+
+
+def run_worker(queue_path: str = JOB_QUEUE_FILE) -> int:
+    from processes import reap_orphans
+
+    reap_orphans()
+    return Worker(queue_path).run()
+
+
+def _spawn_worker(queue_path: str, index: int) -> subprocess.Popen:
+    os.makedirs(LOG_DIR, exist_ok=True)
+    with open(os.path.join(LOG_DIR, f"worker_{index}.log"), "ab") as log:
+        return subprocess.Popen(
+            worker_command() + ["worker", "--queue", queue_path],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+
+
+def run_coordinator(
+    accounts: list[str], workers: int, queue_path: str = JOB_QUEUE_FILE, resultstream: NdjsonWriter | None = None
+) -> int:
+    # 계정 폴더마다 사용하는 사이트를 작업으로 만들고, 작업자 프로세스에 나눠줌
+    batch = uuid.uuid4().hex
+    queue = JobQueue(queue_path)
+    cwd = os.getcwd()
+    try:
+        for account in [os.path.abspath(account) for account in accounts]:
+            options = load_account(account)
+            if not prepare_account(options):
+                print(f"{os.path.basename(account)} : 로그인 정보가 없어 건너뜁니다.")
+                continue
+            max_attempts = options.common.retrytime if options.common.autoretry else 1
+            for site in options.common.order:
+                if site.enable:
+                    queue.enqueue(batch, account, site.name, max_attempts)
+    finally:
+        os.chdir(cwd)
+
+    total = queue.unfinished(batch)
+    print(f"작업 {total}개, 작업자 {workers}개")
+
+    processes = {index: _spawn_worker(queue_path, index) for index in range(workers)}
+    reported: set[int] = set()
+    results: list[dict] = []
+    passed = True
+    try:
+        while True:
+            queue.requeue_expired()
+            unfinished = queue.unfinished(batch)  # 결과 출력 전에 세야 마지막 결과를 빠뜨리지 않음
+
+            for job, state, result in queue.finished(batch):
+                if job.id in reported:
+                    continue
+                reported.add(job.id)
+                passed = passed and state == DONE
+                STAMP_RESULTS.inc(site=job.site, outcome=str(result.get("outcome")))
+                results.append({**result, "account": job.account})
+                print(f"[{len(reported)}/{total}] {os.path.basename(job.account)} {job.site} : {result.get('message')}")
+                if resultstream is not None:
+                    resultstream.write({"type": "result", "account": job.account, **result})
+
+            if unfinished == 0:
+                break
+
+            # 비정상 종료된 작업자만 다시 띄움 (맡은 작업은 임대가 끝나면 다시 대기열로)
+            # 정상 종료(0)는 남은 작업이 없었던 것, 그래도 모두 종료되었는데 작업이 남았으면 하나는 다시 띄움
+            exited = [index for index, process in processes.items() if process.poll() is not None]
+            for index in exited:
+                returncode = processes[index].returncode
+                if returncode != 0 or (len(exited) == len(processes) and index == exited[0]):
+                    logger.debug(f"작업자 {index} 종료됨 : {returncode}, 다시 실행")
+                    processes[index] = _spawn_worker(queue_path, index)
+
+            time.sleep(POLL_SECONDS)
+
+        for process in processes.values():  # 남은 작업이 없으면 작업자는 스스로 종료
+            try:
+                process.wait(timeout=LEASE_SECONDS)
+            except subprocess.TimeoutExpired:
+                pass
+    finally:
+        for process in processes.values():
+            if process.poll() is None:
+                process.kill()
+        queue.close()
+
+    save_run(results)
+    if resultstream is not None:
+        resultstream.write({"type": "summary", "passed": passed, "jobs": total})
+    return 0 if passed else 1